@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+# Copyright 2019 Jake Magers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares axiter with piping async iterables through a channel xform."""
+
+import asyncio
+import time
+import chanpy as c
+from chanpy import transducers as xf
+
+TOTAL_VALUES = 200_000
+
+XFORM = xf.comp(xf.map(lambda x: x + 1), xf.filter(lambda x: x % 2 == 0))
+
+
+async def gen():
+    for i in range(TOTAL_VALUES):
+        yield i
+
+
+async def consume(aiterable):
+    async for _ in aiterable:
+        pass
+
+
+async def chan_piped():
+    src = c.chan(1024)
+    c.onto_chan(src, range(TOTAL_VALUES))
+    await consume(c.pipe(src, c.chan(64, XFORM)))
+
+
+async def chan_axiter():
+    src = c.chan(1024)
+    c.onto_chan(src, range(TOTAL_VALUES))
+    await consume(xf.axiter(XFORM, src))
+
+
+async def gen_piped():
+    ch = c.chan(64, XFORM)
+
+    async def put_all():
+        async for val in gen():
+            await ch.put(val)
+        ch.close()
+
+    c.go(put_all())
+    await consume(ch)
+
+
+async def gen_axiter():
+    await consume(xf.axiter(XFORM, gen()))
+
+
+def main():
+    for name, bench in [('chan piped', chan_piped),
+                        ('chan axiter', chan_axiter),
+                        ('generator piped', gen_piped),
+                        ('generator axiter', gen_axiter)]:
+        start = time.perf_counter()
+        asyncio.run(bench())
+        elapsed = time.perf_counter() - start
+        print(f'{name:>16}: {TOTAL_VALUES / elapsed:>12,.0f} values/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+# Copyright 2019 Jake Magers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares sequential itransduce with fold across thread and process pools."""
+
+import operator
+import os
+import time
+import chanpy as c
+from chanpy import transducers as xf
+
+TOTAL_VALUES = 2_000_000
+N_WORKERS = os.cpu_count()
+
+ADD = xf.multi_arity(lambda: 0, xf.identity, operator.add)
+XFORM = xf.comp(xf.map(lambda x: x * x % 7),
+                xf.filter(lambda x: x > 2))
+
+
+def bench(name, f):
+    start = time.perf_counter()
+    f()
+    elapsed = time.perf_counter() - start
+    print(f'{name:>15}: {TOTAL_VALUES / elapsed:>12,.0f} values/s')
+
+
+def main():
+    data = list(range(TOTAL_VALUES))
+    print(f'{N_WORKERS} workers')
+    bench('itransduce', lambda: xf.itransduce(XFORM, ADD, 0, data))
+    bench('fold thread',
+          lambda: c.fold(N_WORKERS, ADD, XFORM, ADD, data))
+    bench('fold process',
+          lambda: c.fold(N_WORKERS, ADD, XFORM, ADD, data, mode='process'))
+
+
+if __name__ == '__main__':
+    main()
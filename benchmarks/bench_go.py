@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+# Copyright 2019 Jake Magers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures how quickly goroutines can be spawned from and off the loop."""
+
+import asyncio
+import time
+import chanpy as c
+
+TOTAL_GOROUTINES = 100_000
+BURST_SIZE = 1000
+
+
+async def nop():
+    pass
+
+
+async def bench_in_loop():
+    start = time.perf_counter()
+    chs = [c.go(nop()) for _ in range(TOTAL_GOROUTINES)]
+    for ch in chs:
+        await ch.get()
+    return time.perf_counter() - start
+
+
+async def bench_from_thread():
+    done_ch = c.chan(BURST_SIZE)
+
+    async def put_done():
+        await done_ch.put(True)
+
+    def spawn():
+        # Spawns goroutines in bursts, waiting for each burst to finish
+        for _ in range(TOTAL_GOROUTINES // BURST_SIZE):
+            for _ in range(BURST_SIZE):
+                c.go(put_done())
+            for _ in range(BURST_SIZE):
+                done_ch.b_get()
+
+    start = time.perf_counter()
+    await c.thread(spawn).get()
+    return time.perf_counter() - start
+
+
+def main():
+    for name, bench in [('in loop', bench_in_loop),
+                        ('from thread', bench_from_thread)]:
+        elapsed = asyncio.run(bench())
+        print(f'{name:>12}: {TOTAL_GOROUTINES / elapsed:>12,.0f} '
+              f'goroutines/s')
+
+
+if __name__ == '__main__':
+    main()
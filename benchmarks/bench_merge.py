@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+
+# Copyright 2019 Jake Magers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures the throughput of merge with a varying number of sources."""
+
+import asyncio
+import time
+import chanpy as c
+
+TOTAL_VALUES = 200_000
+
+
+async def bench(n_sources):
+    per_source = TOTAL_VALUES // n_sources
+    srcs = [c.chan(64) for _ in range(n_sources)]
+    for src in srcs:
+        c.onto_chan(src, range(per_source))
+
+    start = time.perf_counter()
+    count = 0
+    async for _ in c.merge(srcs, 64):
+        count += 1
+    return count, time.perf_counter() - start
+
+
+def main():
+    for n_sources in [10, 100, 1000]:
+        count, elapsed = asyncio.run(bench(n_sources))
+        print(f'{n_sources:>5} sources: {count / elapsed:>12,.0f} values/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+# Copyright 2019 Jake Magers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares remote channels with plain asyncio streams over local sockets.
+
+The asyncio streams baseline sends each value as its own length-prefixed
+pickle, which is what hand-rolled socket code typically does.
+"""
+
+import asyncio
+import os
+import pickle
+import struct
+import tempfile
+import time
+import chanpy as c
+from chanpy import net
+
+TOTAL_VALUES = 200_000
+_LENGTH = struct.Struct('!I')
+
+
+async def bench_remote_chan(addr):
+    ch = c.chan(1024)
+    c.onto_chan(ch, range(TOTAL_VALUES))
+    server = await net.serve_chan(ch, addr)
+    if not isinstance(addr, str):
+        addr = server.sockets[0].getsockname()[:2]
+
+    start = time.perf_counter()
+    count = 0
+    async for _ in await net.remote_chan(addr, 'get', 256):
+        count += 1
+    elapsed = time.perf_counter() - start
+    server.close()
+    return count, elapsed
+
+
+async def bench_streams(addr):
+    async def on_connect(reader, writer):
+        for val in range(TOTAL_VALUES):
+            data = pickle.dumps(val)
+            writer.write(_LENGTH.pack(len(data)) + data)
+            await writer.drain()
+        writer.close()
+
+    if isinstance(addr, str):
+        server = await asyncio.start_unix_server(on_connect, addr)
+        reader, writer = await asyncio.open_unix_connection(addr)
+    else:
+        server = await asyncio.start_server(on_connect, *addr)
+        reader, writer = await asyncio.open_connection(
+            *server.sockets[0].getsockname()[:2])
+
+    start = time.perf_counter()
+    count = 0
+    while True:
+        try:
+            n, = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+        except asyncio.IncompleteReadError:
+            break
+        pickle.loads(await reader.readexactly(n))
+        count += 1
+    elapsed = time.perf_counter() - start
+    writer.close()
+    server.close()
+    return count, elapsed
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        addrs = [('tcp', ('127.0.0.1', 0)),
+                 ('unix', os.path.join(tmp_dir, 'bench.sock'))]
+        for transport, addr in addrs:
+            for name, bench in [('remote_chan', bench_remote_chan),
+                                ('streams', bench_streams)]:
+                if isinstance(addr, str) and os.path.exists(addr):
+                    os.unlink(addr)
+                count, elapsed = asyncio.run(bench(addr))
+                print(f'{transport:>4} {name:>11}: '
+                      f'{count / elapsed:>12,.0f} values/s')
+
+
+if __name__ == '__main__':
+    main()
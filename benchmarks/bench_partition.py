@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+
+# Copyright 2019 Jake Magers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures partition_all with tuples and with views, and take_last."""
+
+import time
+from chanpy import transducers as xf
+
+TOTAL_VALUES = 200_000
+
+
+def count(result, _):
+    return result + 1
+
+
+def run(name, xform):
+    start = time.perf_counter()
+    xf.itransduce(xform, xf.completing(count), 0, range(TOTAL_VALUES))
+    elapsed = time.perf_counter() - start
+    print(f'{name:>24}: {TOTAL_VALUES / elapsed:>12,.0f} values/s')
+
+
+def main():
+    for n, step in [(3, 3), (100, 100), (10, 1), (100, 1), (1000, 1)]:
+        run(f'partition_all({n}, {step})', xf.partition_all(n, step))
+        run(f'view ({n}, {step})', xf.partition_all(n, step, view=True))
+    run('take_last(1000)', xf.take_last(1000))
+
+
+if __name__ == '__main__':
+    main()
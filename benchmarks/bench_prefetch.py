@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+# Copyright 2019 Jake Magers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares xiter with and without prefetch for slow and fast sources."""
+
+import time
+from chanpy import transducers as xf
+
+SLOW_VALUES = 5_000
+FAST_VALUES = 500_000
+
+# Time spent reading and transforming each value of the slow source
+IO_SECONDS = 0.0002
+CPU_SECONDS = 0.0002
+
+
+def slow_source():
+    for i in range(SLOW_VALUES):
+        time.sleep(IO_SECONDS)
+        yield i
+
+
+def busy(x):
+    deadline = time.perf_counter() + CPU_SECONDS
+    while time.perf_counter() < deadline:
+        pass
+    return x
+
+
+def run(name, xform, coll, n, **kwargs):
+    start = time.perf_counter()
+    for _ in xf.xiter(xform, coll, **kwargs):
+        pass
+    elapsed = time.perf_counter() - start
+    print(f'{name:>16}: {n / elapsed:>12,.0f} values/s')
+
+
+def main():
+    slow_xform = xf.map(busy)
+    run('slow', slow_xform, slow_source(), SLOW_VALUES)
+    run('slow prefetch', slow_xform, slow_source(), SLOW_VALUES,
+        prefetch=64)
+
+    fast_xform = xf.map(lambda x: x + 1)
+    run('fast', fast_xform, range(FAST_VALUES), FAST_VALUES)
+    run('fast prefetch', fast_xform, range(FAST_VALUES), FAST_VALUES,
+        prefetch=64)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+# Copyright 2019 Jake Magers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures into, ireduce, and itransduce on 1e6-element inputs."""
+
+import operator
+import time
+from chanpy import transducers as xf
+
+TOTAL_VALUES = 1_000_000
+
+BENCHES = [
+    ('into identity',
+     lambda data: xf.into([], xf.identity, data)),
+    ('into map',
+     lambda data: xf.into([], xf.map(lambda x: x + 1), data)),
+    ('into map+filter',
+     lambda data: xf.into([], xf.comp(xf.map(lambda x: x + 1),
+                                      xf.filter(lambda x: x % 2 == 0)),
+                          data)),
+    ('into map+drop',
+     lambda data: xf.into([], xf.comp(xf.map(lambda x: x + 1), xf.drop(1)),
+                          data)),
+    ('ireduce add',
+     lambda data: xf.ireduce(operator.add, 0, data)),
+    ('itransduce map add',
+     lambda data: xf.itransduce(xf.map(lambda x: x + 1),
+                                xf.completing(operator.add), 0, data)),
+    ('itransduce take add',
+     lambda data: xf.itransduce(xf.take(TOTAL_VALUES),
+                                xf.completing(operator.add), 0, data)),
+]
+
+
+def main():
+    data = list(range(TOTAL_VALUES))
+    for name, bench in BENCHES:
+        start = time.perf_counter()
+        bench(data)
+        elapsed = time.perf_counter() - start
+        print(f'{name:>19}: {TOTAL_VALUES / elapsed:>14,.0f} values/s')
+
+
+if __name__ == '__main__':
+    main()
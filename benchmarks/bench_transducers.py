@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+# Copyright 2019 Jake Magers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures the throughput of 5-stage transducers in several contexts."""
+
+import time
+import chanpy as c
+from chanpy import transducers as xf
+
+TOTAL_VALUES = 1_000_000
+
+STATELESS = xf.comp(xf.map(lambda x: x + 1),
+                    xf.filter(lambda x: x % 3 != 0),
+                    xf.map(lambda x: x * 2),
+                    xf.remove(lambda x: x % 5 == 0),
+                    xf.take_while(lambda x: x >= 0))
+
+STATEFUL = xf.comp(xf.map_indexed(lambda i, x: i + x),
+                   xf.drop(1),
+                   xf.dedupe,
+                   xf.drop_while(lambda x: x < 10),
+                   xf.take(TOTAL_VALUES))
+
+MIXED = xf.comp(xf.map(lambda x: x + 1),
+                xf.filter(lambda x: x % 3 != 0),
+                xf.map(lambda x: x * 2),
+                xf.partition_all(2),
+                xf.drop(1))
+
+
+def bench_itransduce(xform):
+    return xf.itransduce(xform, xf.append, [], range(TOTAL_VALUES))
+
+
+def bench_xiter(xform):
+    return list(xf.xiter(xform, range(TOTAL_VALUES)))
+
+
+def bench_itransduce_chunked(xform):
+    return xf.itransduce(xform, xf.append, [], range(TOTAL_VALUES),
+                         chunksize=1024)
+
+
+def bench_xiter_chunked(xform):
+    return list(xf.xiter(xform, range(TOTAL_VALUES), chunksize=1024))
+
+
+def bench_chan(xform):
+    ch = c.chan(TOTAL_VALUES, xform)
+    for i in range(TOTAL_VALUES):
+        ch.offer(i)
+    ch.close()
+    return list(ch.to_iter())
+
+
+def main():
+    for xform_name, xform in [('stateless', STATELESS),
+                              ('stateful', STATEFUL),
+                              ('mixed', MIXED)]:
+        for name, bench in [('itransduce', bench_itransduce),
+                            ('itransduce chunked', bench_itransduce_chunked),
+                            ('xiter', bench_xiter),
+                            ('xiter chunked', bench_xiter_chunked),
+                            ('chan', bench_chan)]:
+            start = time.perf_counter()
+            bench(xform)
+            elapsed = time.perf_counter() - start
+            print(f'{xform_name:>9} {name:>18}: '
+                  f'{TOTAL_VALUES / elapsed:>12,.0f} values/s')
+
+
+if __name__ == '__main__':
+    main()
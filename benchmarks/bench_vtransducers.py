@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+# Copyright 2019 Jake Magers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares scalar and NumPy-vectorized transducers on a stream of floats."""
+
+import operator
+import time
+import numpy as np
+from chanpy import transducers as xf
+
+TOTAL_VALUES = 1_000_000
+CHUNKSIZE = 65_536
+
+SCALAR = xf.comp(xf.drop(10),
+                 xf.map(lambda x: x * 1.5 - 0.25),
+                 xf.filter(lambda x: x > 0),
+                 xf.reductions(operator.add, 0.0),
+                 xf.take(TOTAL_VALUES // 2))
+
+VECTORIZED = xf.comp(xf.vdrop(10),
+                     xf.vmap(lambda x: x * 1.5 - 0.25),
+                     xf.vfilter(lambda x: x > 0),
+                     xf.vreductions(np.add, 0.0),
+                     xf.vtake(TOTAL_VALUES // 2))
+
+
+def main():
+    data = np.random.default_rng(0).standard_normal(TOTAL_VALUES)
+    results = []
+    for name, xform, chunksize in [('scalar', SCALAR, None),
+                                   ('scalar chunked', SCALAR, CHUNKSIZE),
+                                   ('vectorized', VECTORIZED, CHUNKSIZE)]:
+        start = time.perf_counter()
+        results.append(xf.into([], xform, data, chunksize=chunksize))
+        elapsed = time.perf_counter() - start
+        print(f'{name:>14}: {TOTAL_VALUES / elapsed:>12,.0f} values/s')
+    assert results[0] == results[2]
+
+
+if __name__ == '__main__':
+    main()
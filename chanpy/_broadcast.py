@@ -0,0 +1,258 @@
+# Copyright 2019 Jake Magers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from collections import deque
+from numbers import Number
+from ._channel import chan, MAX_QUEUE_SIZE, QueueSizeError
+
+
+class broadcast:
+    """A channel that delivers every value put onto it to all of its subscriptions.
+
+    Unlike :class:`mult`, values are not copied into a channel per consumer.
+    All values live in a single ring buffer of capacity `n` and each
+    subscription simply keeps a cursor into it. Publishing a value therefore
+    costs the same regardless of the number of subscriptions.
+
+    Subscriptions are created with :meth:`subscribe` and will receive every
+    value put after they were created. A subscription supports the same get
+    operations as a channel (:meth:`~chan.get`, :meth:`~chan.b_get`,
+    :meth:`~chan.f_get`, :meth:`~chan.poll`, :meth:`~chan.to_iter`,
+    ``async for``, and :func:`alt`) and can be unsubscribed by closing it.
+
+    By default, puts will block once the slowest subscription is `n` values
+    behind. If `overwrite` is True, puts never block. Instead, subscriptions
+    that fall more than `n` values behind skip ahead to the oldest value still
+    in the ring and the number of values they missed is added to their
+    ``missed`` attribute.
+
+    Once closed, future puts will be unsuccessful. Subscriptions will continue
+    to receive the values that were put before closing and will then be
+    exhausted.
+
+    Args:
+        n: A positive int representing the capacity of the ring buffer.
+        overwrite: An optional bool. If True, the oldest values will be
+            overwritten instead of blocking puts.
+    """
+
+    def __init__(self, n, *, overwrite=False):
+        if not isinstance(n, Number) or n != int(n):
+            raise TypeError('n must be a positive int')
+        if n <= 0:
+            raise ValueError('n must be a positive int')
+        self._lock = threading.Lock()
+        self._n = int(n)
+        self._ring = [None] * self._n
+        self._overwrite = overwrite
+        self._head = 0  # Sequence number of the next value to be put
+        self._tail = 0  # Sequence number of the oldest value still needed
+        self._cursors = {}  # seq->number of subscriptions at seq
+        self._subs = set()
+        self._waiting_subs = set()  # Subscriptions with pending gets
+        self._puts = deque()
+        self._is_closed = False
+
+    put = chan.put
+    b_put = chan.b_put
+    f_put = chan.f_put
+    offer = chan.offer
+
+    def subscribe(self):
+        """Returns a new subscription that receives all future values."""
+        sub = _Subscription(self)
+        with self._lock:
+            sub._seq = self._head
+            self._subs.add(sub)
+            if not self._overwrite:
+                self._cursors[self._head] = (
+                    self._cursors.get(self._head, 0) + 1)
+                if len(self._subs) == 1:
+                    self._tail = self._head
+        return sub
+
+    def close(self):
+        """Closes the broadcast."""
+        with self._lock:
+            self._is_closed = True
+            self._exhaust_waiting_subs()
+
+    def _p_put(self, handler, val):
+        """Commits or enqueues a put operation. See :meth:`chan._p_put`."""
+        if val is None:
+            raise TypeError('item cannot be None')
+        with self._lock:
+            self._puts = deque((h, v) for h, v in self._puts if h.is_active)
+
+            if self._is_closed:
+                return chan._fail_op(handler, False)
+
+            if len(self._puts) == 0 and self._has_room():
+                with handler:
+                    if not handler.is_active:
+                        return None
+                    handler.commit()
+                self._publish(val)
+                return True,
+
+            if not handler.is_waitable:
+                return chan._fail_op(handler, False)
+
+            if len(self._puts) >= MAX_QUEUE_SIZE:
+                raise QueueSizeError('broadcast has too many pending puts')
+            self._puts.append((handler, val))
+
+    def _p_get(self, sub, handler):
+        """Commits or enqueues a get operation. See :meth:`chan._p_get`."""
+        with self._lock:
+            sub._takes = deque(h for h in sub._takes if h.is_active)
+
+            if sub not in self._subs:
+                return chan._fail_op(handler, None)
+
+            if sub._seq < self._head:
+                with handler:
+                    if not handler.is_active:
+                        return None
+                    handler.commit()
+                ret = self._read(sub)
+                self._transfer_puts()
+                return ret,
+
+            if ((self._is_closed and len(self._puts) == 0) or
+                    not handler.is_waitable):
+                return chan._fail_op(handler, None)
+
+            if len(sub._takes) >= MAX_QUEUE_SIZE:
+                raise QueueSizeError('subscription has too many pending gets')
+            sub._takes.append(handler)
+            self._waiting_subs.add(sub)
+
+    def _unsubscribe(self, sub):
+        with self._lock:
+            if sub not in self._subs:
+                return
+            self._subs.remove(sub)
+            self._waiting_subs.discard(sub)
+            if not self._overwrite:
+                self._remove_cursor(sub._seq)
+                self._update_tail()
+            elif len(self._subs) == 0:
+                self._ring = [None] * self._n
+            for taker in sub._takes:
+                with taker:
+                    if taker.is_active:
+                        taker.commit()(None)
+            sub._takes.clear()
+            self._transfer_puts()
+
+    def _has_room(self):
+        return self._overwrite or self._head - self._tail < self._n
+
+    def _publish(self, val):
+        if len(self._subs) == 0:
+            # No subscription can read val so there's no need to keep it
+            self._head += 1
+            self._tail = self._head
+            return
+        self._ring[self._head % self._n] = val
+        self._head += 1
+
+        for sub in tuple(self._waiting_subs):
+            while len(sub._takes) > 0 and sub._seq < self._head:
+                taker = sub._takes.popleft()
+                with taker:
+                    if taker.is_active:
+                        taker.commit()(self._read(sub))
+            if len(sub._takes) == 0:
+                self._waiting_subs.discard(sub)
+
+    def _read(self, sub):
+        """Returns the value at the cursor of `sub` and advances it."""
+        if self._overwrite:
+            oldest_seq = self._head - self._n
+            if sub._seq < oldest_seq:
+                sub.missed += oldest_seq - sub._seq
+                sub._seq = oldest_seq
+            val = self._ring[sub._seq % self._n]
+            sub._seq += 1
+            return val
+
+        seq = sub._seq
+        val = self._ring[seq % self._n]
+        self._remove_cursor(seq)
+        sub._seq = seq + 1
+        self._cursors[seq + 1] = self._cursors.get(seq + 1, 0) + 1
+        if seq == self._tail:
+            self._update_tail()
+        return val
+
+    def _remove_cursor(self, seq):
+        count = self._cursors[seq] - 1
+        if count == 0:
+            del self._cursors[seq]
+        else:
+            self._cursors[seq] = count
+
+    def _update_tail(self):
+        """Advances the tail to the slowest cursor, releasing read values."""
+        while self._tail < self._head and self._tail not in self._cursors:
+            self._ring[self._tail % self._n] = None
+            self._tail += 1
+
+    def _transfer_puts(self):
+        while len(self._puts) > 0 and self._has_room():
+            putter, val = self._puts.popleft()
+            with putter:
+                if putter.is_active:
+                    putter.commit()(True)
+                    self._publish(val)
+        if self._is_closed:
+            self._exhaust_waiting_subs()
+
+    def _exhaust_waiting_subs(self):
+        if len(self._puts) > 0:
+            return
+        for sub in self._waiting_subs:
+            for taker in sub._takes:
+                with taker:
+                    if taker.is_active:
+                        taker.commit()(None)
+            sub._takes.clear()
+        self._waiting_subs.clear()
+
+
+class _Subscription:
+    """A cursor into a :class:`broadcast` supporting channel get operations."""
+
+    def __init__(self, bcast):
+        self._bcast = bcast
+        self._seq = 0
+        self._takes = deque()
+        self.missed = 0
+
+    get = chan.get
+    b_get = chan.b_get
+    f_get = chan.f_get
+    poll = chan.poll
+    __aiter__ = chan.__aiter__
+    to_iter = chan.to_iter
+
+    def close(self):
+        """Unsubscribes from the broadcast."""
+        self._bcast._unsubscribe(self)
+
+    def _p_get(self, handler):
+        return self._bcast._p_get(self, handler)
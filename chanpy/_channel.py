@@ -78,7 +78,7 @@ class FlagFuture(asyncio.Future):
         raise AssertionError('cannot call set_exception on a future provided '
                              'by a channel')
 
-    def cancel(self):
+    def cancel(self, *args, **kwargs):
         with self.__flag['lock']:
             if self.__flag['is_active']:
                 self.__flag['is_active'] = False
@@ -87,7 +87,7 @@ class FlagFuture(asyncio.Future):
                 # future hasn't been set because call_soon_threadsafe()
                 # callback hasn't been invoked yet
                 super().set_result(self.__result)
-        return super().cancel()
+        return super().cancel(*args, **kwargs)
 
 
 def future_deliver_fn(future):
@@ -232,14 +232,21 @@ class chan:
         self._buf = (bufs.FixedBuffer(buf_or_n)
                      if isinstance(buf_or_n, Number)
                      else buf_or_n)
-        xform = xf.identity if xform is None else xform
-        ex_handler = nop_ex_handler if ex_handler is None else ex_handler
         self._takes = deque()
         self._puts = deque()
         self._is_closed = False
         self._buf_rf_is_completed = False
         self._lock = threading.Lock()
 
+        if xform is None and ex_handler is None:
+            # Avoids building a reducing function for the common case
+            self._buf_step = self._plain_buf_step
+            self._buf_complete = self._plain_buf_complete
+            return
+
+        xform = xf.identity if xform is None else xform
+        ex_handler = nop_ex_handler if ex_handler is None else ex_handler
+
         @xform
         @xf.completing
         def xrf(_, val):
@@ -247,15 +254,28 @@ class chan:
                 raise AssertionError('xform cannot produce None')
             self._buf.put(val)
 
-        def ex_handler_rf(*args):
+        xrf_step = xf._step_fn(xrf)
+        xrf_complete = xf._complete_fn(xrf)
+
+        def handle_ex(e):
+            val = ex_handler(e)
+            if val is not None:
+                self._buf.put(val)
+
+        def buf_step(_, val):
             try:
-                return xrf(*args)
+                return xrf_step(None, val)
             except Exception as e:
-                val = ex_handler(e)
-                if val is not None:
-                    self._buf.put(val)
+                handle_ex(e)
 
-        self._buf_rf = ex_handler_rf
+        def buf_complete(_):
+            try:
+                return xrf_complete(None)
+            except Exception as e:
+                handle_ex(e)
+
+        self._buf_step = buf_step
+        self._buf_complete = buf_complete
 
     def put(self, val, *, wait=True):
         """Attempts to put `val` onto the channel.
@@ -558,8 +578,15 @@ class chan:
                 return val,
             return None
 
+    def _plain_buf_step(self, _, val):
+        """The buf_step of a channel without an xform or ex_handler."""
+        self._buf.put(val)
+
+    def _plain_buf_complete(self, _):
+        """The buf_complete of a channel without an xform or ex_handler."""
+
     def _buf_put(self, val):
-        if xf.is_reduced(self._buf_rf(None, val)):
+        if xf.is_reduced(self._buf_step(None, val)):
             # If reduced value is returned then no more input is allowed onto
             # buf. To ensure this, remove all pending puts and close ch.
             for putter, _ in self._puts:
@@ -588,7 +615,7 @@ class chan:
                 len(self._puts) == 0 and
                 not self._buf_rf_is_completed):
             self._buf_rf_is_completed = True
-            self._buf_rf(None)
+            self._buf_complete(None)
 
     def _close(self):
         self._is_closed = True
@@ -0,0 +1,346 @@
+# Copyright 2019 Jake Magers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import multiprocessing
+import pickle
+import struct
+import threading
+from collections import deque
+from numbers import Number
+from ._channel import chan, MAX_QUEUE_SIZE, QueueSizeError
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
+# Header: head, tail, version, is_closed
+_HEADER = struct.Struct('<QQQB')
+# Record header: length of payload, tag
+_RECORD = struct.Struct('<IB')
+_WRAP = 0xFFFFFFFF  # Record length marking that the next record is at 0
+_PICKLED, _BYTES = 0, 1
+
+# How often the service thread checks whether it's still needed (in seconds)
+_SERVICE_INTERVAL = 0.1
+
+
+class shm_chan:
+    """A channel that can be used by multiple processes on the same host.
+
+    Values put onto the channel are stored in a ring buffer of `size` bytes
+    that lives in :mod:`multiprocessing.shared_memory`. The channel supports
+    the same operations as a buffered :class:`chan` (:meth:`~chan.put`,
+    :meth:`~chan.get`, :meth:`~chan.b_put`, :meth:`~chan.b_get`,
+    :meth:`~chan.offer`, :meth:`~chan.poll`, :func:`alt`, etc.) from any
+    process it has been passed to.
+
+    An shm_chan can only be passed to other processes through inheritance,
+    such as by being an argument of :class:`multiprocessing.Process`.
+
+    Values are serialized with `serializer`. :class:`bytes` values bypass the
+    serializer entirely. They are still copied twice: once into the ring
+    buffer by the put and once out of it into a new :class:`bytes` by the
+    get, since the space they occupied in the ring buffer is reused as soon
+    as they've been taken.
+
+    Puts block while the ring buffer does not have enough free space for the
+    serialized value. Operations that cannot complete immediately are
+    completed by a background thread in the waiting process once another
+    process makes room or puts a value.
+
+    Once closed, future puts will be unsuccessful and any pending puts will
+    fail. Values already in the ring buffer can still be taken, after which
+    the channel will be exhausted.
+
+    The process that created the channel is responsible for calling
+    :meth:`unlink` once all processes are done with it.
+
+    Args:
+        size: A positive int specifying the capacity of the ring buffer in
+            bytes. Every value takes 5 bytes more than its serialized size.
+        serializer: An optional object with ``dumps(obj) -> bytes`` and
+            ``loads(bytes) -> obj`` functions. Defaults to :mod:`pickle`.
+
+    Raises:
+        ImportError: If :mod:`multiprocessing.shared_memory` is unavailable.
+    """
+
+    def __init__(self, size=1 << 16, *, serializer=pickle):
+        if shared_memory is None:
+            raise ImportError('shm_chan requires Python 3.8+')
+        if not isinstance(size, Number) or size != int(size):
+            raise TypeError('size must be a positive int')
+        if size <= _RECORD.size:
+            raise ValueError(f'size must be greater than {_RECORD.size}')
+        self._size = int(size)
+        self._serializer = serializer
+        self._shm = shared_memory.SharedMemory(create=True,
+                                               size=_HEADER.size + self._size)
+        _HEADER.pack_into(self._shm.buf, 0, 0, 0, 0, False)
+        self._cond = multiprocessing.Condition()
+        self._is_creator = True
+        self._init_local()
+
+    def _init_local(self):
+        self._lock = threading.Lock()
+        self._puts = deque()  # (handler, tag, data)
+        self._takes = deque()
+        self._service_thread = None
+        self._is_unlinked = False
+
+    def __getstate__(self):
+        return self._shm.name, self._size, self._serializer, self._cond
+
+    def __setstate__(self, state):
+        name, self._size, self._serializer, self._cond = state
+        self._shm = shared_memory.SharedMemory(name=name)
+        self._is_creator = False
+        self._init_local()
+
+    put = chan.put
+    get = chan.get
+    b_put = chan.b_put
+    b_get = chan.b_get
+    f_put = chan.f_put
+    f_get = chan.f_get
+    offer = chan.offer
+    poll = chan.poll
+    __aiter__ = chan.__aiter__
+    to_iter = chan.to_iter
+
+    def close(self):
+        """Closes the channel for every process."""
+        with self._lock:
+            with self._cond:
+                head, tail, version, _ = _HEADER.unpack_from(self._shm.buf, 0)
+                _HEADER.pack_into(self._shm.buf, 0,
+                                  head, tail, version + 1, True)
+                self._cond.notify_all()
+            self._service()
+
+    def unlink(self):
+        """Releases the shared memory of the channel.
+
+        Must only be called once no process will use the channel again.
+        """
+        with self._lock:
+            self._is_unlinked = True
+            service_thread = self._service_thread
+        if service_thread is not None:
+            with self._cond:
+                self._cond.notify_all()
+            service_thread.join()
+        self._shm.close()
+        if self._is_creator:
+            self._shm.unlink()
+
+    def _p_put(self, handler, val):
+        """Commits or enqueues a put operation. See :meth:`chan._p_put`."""
+        if val is None:
+            raise TypeError('item cannot be None')
+        if type(val) is bytes:
+            tag, data = _BYTES, val
+        else:
+            tag, data = _PICKLED, self._serializer.dumps(val)
+        if self._record_size(len(data)) > self._size:
+            raise ValueError(f'serialized value of {len(data)} bytes cannot '
+                             f'fit in a buffer of {self._size} bytes')
+
+        with self._lock:
+            self._puts = deque(p for p in self._puts if p[0].is_active)
+            with self._cond:
+                head, tail, version, is_closed = (
+                    _HEADER.unpack_from(self._shm.buf, 0))
+                if is_closed:
+                    return chan._fail_op(handler, False)
+                if (len(self._puts) == 0 and
+                        self._fits(head, tail, len(data))):
+                    with handler:
+                        if not handler.is_active:
+                            return None
+                        handler.commit()
+                    self._write(head, tail, version, tag, data)
+                    return True,
+
+            if not handler.is_waitable:
+                return chan._fail_op(handler, False)
+            if len(self._puts) >= MAX_QUEUE_SIZE:
+                raise QueueSizeError('channel has too many pending puts')
+            self._puts.append((handler, tag, data))
+            self._start_service_thread()
+
+    def _p_get(self, handler):
+        """Commits or enqueues a get operation. See :meth:`chan._p_get`."""
+        with self._lock:
+            self._takes = deque(h for h in self._takes if h.is_active)
+            with self._cond:
+                head, tail, version, is_closed = (
+                    _HEADER.unpack_from(self._shm.buf, 0))
+                if len(self._takes) == 0 and head != tail:
+                    with handler:
+                        if not handler.is_active:
+                            return None
+                        handler.commit()
+                    tag, data = self._read(head, tail, version, is_closed)
+                    return self._deserialize(tag, data),
+                if is_closed:
+                    return chan._fail_op(handler, None)
+
+            if not handler.is_waitable:
+                return chan._fail_op(handler, None)
+            if len(self._takes) >= MAX_QUEUE_SIZE:
+                raise QueueSizeError('channel has too many pending gets')
+            self._takes.append(handler)
+            self._start_service_thread()
+
+    def _deserialize(self, tag, data):
+        return data if tag == _BYTES else self._serializer.loads(data)
+
+    @staticmethod
+    def _record_size(n):
+        return _RECORD.size + n
+
+    def _fits(self, head, tail, n):
+        """Returns True if a payload of `n` bytes can be written at `head`."""
+        free = self._size - (head - tail)
+        end_space = self._size - head % self._size
+        needed = self._record_size(n)
+        if needed > end_space:
+            needed += end_space  # The end of the ring will be skipped
+        return needed <= free
+
+    def _write(self, head, tail, version, tag, data):
+        """Writes a record. Must be called with the condition held."""
+        buf = self._shm.buf
+        pos = head % self._size
+        end_space = self._size - pos
+        if self._record_size(len(data)) > end_space:
+            if end_space >= _RECORD.size:
+                _RECORD.pack_into(buf, _HEADER.size + pos, _WRAP, 0)
+            head += end_space
+            pos = 0
+        offset = _HEADER.size + pos
+        _RECORD.pack_into(buf, offset, len(data), tag)
+        offset += _RECORD.size
+        buf[offset:offset + len(data)] = data
+        head += self._record_size(len(data))
+        _HEADER.pack_into(buf, 0, head, tail, version + 1, False)
+        self._cond.notify_all()
+
+    def _read(self, head, tail, version, is_closed):
+        """Reads a record. Must be called with the condition held."""
+        buf = self._shm.buf
+        pos = tail % self._size
+        end_space = self._size - pos
+        if end_space < _RECORD.size:
+            tail += end_space
+            pos = 0
+        else:
+            n, _ = _RECORD.unpack_from(buf, _HEADER.size + pos)
+            if n == _WRAP:
+                tail += end_space
+                pos = 0
+        offset = _HEADER.size + pos
+        n, tag = _RECORD.unpack_from(buf, offset)
+        offset += _RECORD.size
+        data = bytes(buf[offset:offset + n])
+        tail += self._record_size(n)
+        _HEADER.pack_into(buf, 0, head, tail, version + 1, is_closed)
+        self._cond.notify_all()
+        return tag, data
+
+    def _start_service_thread(self):
+        """Starts the service thread if needed. Must hold the local lock."""
+        if self._service_thread is None:
+            self._service_thread = threading.Thread(target=self._run_service,
+                                                    daemon=True)
+            self._service_thread.start()
+
+    def _run_service(self):
+        """Completes enqueued operations as other processes make progress."""
+        version = None
+        while True:
+            with self._cond:
+                if version is not None:
+                    self._cond.wait_for(
+                        lambda: (self._is_unlinked or
+                                 _HEADER.unpack_from(self._shm.buf, 0)[2] !=
+                                 version),
+                        _SERVICE_INTERVAL)
+                if self._is_unlinked:
+                    return
+                version = _HEADER.unpack_from(self._shm.buf, 0)[2]
+            with self._lock:
+                if self._is_unlinked:
+                    return
+                self._service()
+                if len(self._puts) == 0 and len(self._takes) == 0:
+                    self._service_thread = None
+                    return
+
+    def _service(self):
+        """Completes as many enqueued operations as possible.
+
+        Must be called with the local lock held.
+        """
+        self._puts = deque(p for p in self._puts if p[0].is_active)
+        self._takes = deque(h for h in self._takes if h.is_active)
+        results = []  # (callback, value) to call after releasing the cond
+
+        with self._cond:
+            is_progressing = True
+            while is_progressing:
+                is_progressing = False
+                head, tail, version, is_closed = (
+                    _HEADER.unpack_from(self._shm.buf, 0))
+
+                if is_closed and len(self._puts) > 0:
+                    for putter, _, _ in self._puts:
+                        with putter:
+                            if putter.is_active:
+                                results.append((putter.commit(), False))
+                    self._puts.clear()
+                elif len(self._puts) > 0:
+                    putter, tag, data = self._puts[0]
+                    if self._fits(head, tail, len(data)):
+                        self._puts.popleft()
+                        is_progressing = True
+                        with putter:
+                            if putter.is_active:
+                                results.append((putter.commit(), True))
+                                self._write(head, tail, version, tag, data)
+                                continue
+
+                if len(self._takes) > 0:
+                    if head != tail:
+                        taker = self._takes.popleft()
+                        is_progressing = True
+                        with taker:
+                            if taker.is_active:
+                                tag, data = self._read(head, tail, version,
+                                                       is_closed)
+                                results.append((taker.commit(),
+                                                (tag, data)))
+                    elif is_closed:
+                        for taker in self._takes:
+                            with taker:
+                                if taker.is_active:
+                                    results.append((taker.commit(), None))
+                        self._takes.clear()
+
+        for cb, val in results:
+            if type(val) is tuple:
+                val = self._deserialize(*val)
+            cb(val)
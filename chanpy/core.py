@@ -41,13 +41,21 @@ Note:
 import asyncio as _asyncio
 import contextlib as _contextlib
 import functools as _functools
-import random as _random
+import sys as _sys
 import threading as _threading
+import time as _time
+import weakref as _weakref
+from collections import deque as _deque
+from concurrent.futures import ProcessPoolExecutor as _ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
 from multiprocessing import Pool as _ProcPool
 from multiprocessing.dummy import Pool as _DummyPool
 from . import _buffers as _bufs
+from . import _channel
 from . import transducers as _xf
+from ._broadcast import broadcast
 from ._channel import chan, alt, b_alt, QueueSizeError
+from ._shm import shm_chan
 
 
 class _Undefined:
@@ -114,6 +122,29 @@ def is_chan(ch):
     return isinstance(ch, chan)
 
 
+def _nop(_):
+    pass
+
+
+def _try_put(ch, val):
+    """Attempts to put `val` onto `ch` without waiting.
+
+    Unlike :meth:`chan.offer`, no promise or future gets created.
+
+    Returns:
+        True if `val` was accepted, False if `ch` is closed, or None if `ch`
+        could not accept `val` immediately.
+    """
+    if ch._p_put(_channel.FnHandler(_nop, False), val)[0]:
+        return True
+    return False if ch._is_closed else None
+
+
+def _try_get(ch):
+    """Returns a value from `ch` if one is available immediately else None."""
+    return ch._p_get(_channel.FnHandler(_nop, False))[0]
+
+
 # Thread local data
 _local_data = _threading.local()
 
@@ -178,6 +209,169 @@ def _in_loop(loop):
         return False
 
 
+class _Submitter:
+    """Runs functions submitted from other threads on `loop` in batches.
+
+    Every call to :meth:`loop.call_soon_threadsafe` wakes up `loop`. Functions
+    submitted while a batch is already scheduled join that batch instead, so a
+    burst of submissions costs a single wakeup.
+    """
+
+    def __init__(self, loop):
+        self._loop = loop
+        self._lock = _threading.Lock()
+        self._batch = _deque()
+        self._is_scheduled = False
+
+    def submit(self, f, *args):
+        with self._lock:
+            self._batch.append((f, args))
+            if self._is_scheduled:
+                return
+            self._is_scheduled = True
+        try:
+            self._loop.call_soon_threadsafe(self._run_batch)
+        except RuntimeError:
+            # loop is closed
+            with self._lock:
+                self._batch.clear()
+                self._is_scheduled = False
+            raise
+
+    def _run_batch(self):
+        with self._lock:
+            batch, self._batch = self._batch, _deque()
+            self._is_scheduled = False
+        for f, args in batch:
+            try:
+                f(*args)
+            except Exception as e:
+                self._loop.call_exception_handler({
+                    'message': f'Exception in callback {f!r}',
+                    'exception': e,
+                })
+
+
+_submitters = _weakref.WeakKeyDictionary()  # loop->_Submitter
+_submitters_lock = _threading.Lock()
+
+
+def _call_soon_threadsafe(loop, f, *args):
+    """Schedules ``f(*args)`` on `loop` from a thread not running `loop`."""
+    submitter = _submitters.get(loop, None)
+    if submitter is None:
+        with _submitters_lock:
+            submitter = _submitters.setdefault(loop, _Submitter(loop))
+    submitter.submit(f, *args)
+
+
+_DEFAULT_THREAD_POOL_SIZE = 64
+
+
+def _report_thread_exception():
+    """Reports the exception being handled like an uncaught one in a thread."""
+    excepthook = getattr(_threading, 'excepthook', None)
+    if excepthook is None:  # Python < 3.8
+        _sys.excepthook(*_sys.exc_info())
+        return
+    excepthook(_threading.ExceptHookArgs(
+        [*_sys.exc_info(), _threading.current_thread()]))
+
+
+class _ThreadPool:
+    """The default executor of :func:`thread` along with its statistics."""
+
+    def __init__(self, size):
+        self._lock = _threading.Lock()
+        self._size = size
+        self._executor = None
+        self._submitted = 0
+        self._completed = 0
+        self._wait_time = 0.0
+        self._run_time = 0.0
+
+    def submit(self, f):
+        submit_time = _time.perf_counter()
+
+        def run():
+            start_time = _time.perf_counter()
+            try:
+                f()
+            except BaseException:
+                _report_thread_exception()
+            finally:
+                end_time = _time.perf_counter()
+                with self._lock:
+                    self._completed += 1
+                    self._wait_time += start_time - submit_time
+                    self._run_time += end_time - start_time
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = _ThreadPoolExecutor(
+                    self._size, thread_name_prefix='chanpy-thread')
+            self._submitted += 1
+            self._executor.submit(run)
+
+    def resize(self, size):
+        with self._lock:
+            self._size = size
+            if self._executor is not None:
+                # Running and queued calls will still finish
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def stats(self):
+        with self._lock:
+            return {'size': self._size,
+                    'submitted': self._submitted,
+                    'completed': self._completed,
+                    'pending': self._submitted - self._completed,
+                    'wait_time': self._wait_time,
+                    'run_time': self._run_time}
+
+
+_thread_pool = _ThreadPool(_DEFAULT_THREAD_POOL_SIZE)
+
+
+def set_thread_pool_size(n):
+    """Sets the maximum number of threads used by :func:`thread`.
+
+    Calls already submitted to the previous pool will still run to
+    completion.
+
+    Args:
+        n: A positive int.
+
+    See Also:
+        :func:`thread_pool_stats`
+    """
+    if n < 1 or n != int(n):
+        raise ValueError('n must be a positive int')
+    _thread_pool.resize(int(n))
+
+
+def thread_pool_stats():
+    """Returns statistics about the default thread pool of :func:`thread`.
+
+    Returns:
+        A dict with the following keys:
+
+        * ``'size'``: The maximum number of threads in the pool.
+        * ``'submitted'``: The number of calls submitted to the pool.
+        * ``'completed'``: The number of calls that have finished.
+        * ``'pending'``: The number of calls that are queued or running.
+        * ``'wait_time'``: The total number of seconds that completed calls
+          spent waiting for a thread.
+        * ``'run_time'``: The total number of seconds that completed calls
+          spent running.
+
+    See Also:
+        :func:`set_thread_pool_size`
+    """
+    return _thread_pool.stats()
+
+
 def thread(f, executor=None):
     """Registers current loop to a separate thread and then calls `f` from it.
 
@@ -185,12 +379,22 @@ def thread(f, executor=None):
     The separate thread will have the loop from the calling thread registered
     to it while `f` runs.
 
+    Unless `executor` is given, `f` is called from a bounded pool of threads
+    shared by all calls to :func:`thread`. If every thread in the pool is
+    busy, `f` will wait for one to become available. Functions that block
+    until another :func:`thread` call makes progress can therefore deadlock if
+    more of them run at once than the size of the pool.
+
     Args:
         f: A function accepting no arguments.
         executor: An optional :class:`ThreadPoolExecutor` to submit `f` to.
 
     Returns:
         A channel containing the return value of `f`.
+
+    See Also:
+        :func:`set_thread_pool_size`
+        :func:`thread_pool_stats`
     """
     loop = get_loop()
     ch = chan(1)
@@ -203,12 +407,112 @@ def thread(f, executor=None):
             ch.close()
 
     if executor is None:
-        _threading.Thread(target=wrapper).start()
+        _thread_pool.submit(wrapper)
     else:
         executor.submit(wrapper)
     return ch
 
 
+_process_pool = None
+_process_pool_lock = _threading.Lock()
+
+
+def _get_process_pool():
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = _ProcessPoolExecutor()
+        return _process_pool
+
+
+def process(f, *args, executor=None):
+    """Calls ``f(*args)`` in a separate process.
+
+    Returns immediately to the calling thread. Unless `executor` is given, `f`
+    is called from a persistent pool of processes shared by all calls to
+    :func:`process`, so no process is started per call. The result is put onto
+    the returned channel as soon as it's available without any thread having
+    to wait on it.
+
+    If ``f(*args)`` raises an exception, then it will be passed to the
+    exception handler of the current event loop and the returned channel will
+    never close.
+
+    Args:
+        f: A picklable function.
+        *args: Picklable arguments to call `f` with.
+        executor: An optional :class:`ProcessPoolExecutor` to submit `f` to.
+
+    Returns:
+        A channel containing the return value of `f`.
+
+    See Also:
+        :func:`thread`
+    """
+    loop = get_loop()
+    ch = chan(1)
+
+    def put_result_to_ch(future):
+        # Called from a thread managing the pool
+        if future.cancelled():
+            return
+        ex = future.exception()
+        if ex is not None:
+            _call_soon_threadsafe(loop, loop.call_exception_handler, {
+                'message': 'Exception in process',
+                'exception': ex,
+                'future': future,
+            })
+            return
+        ret = future.result()
+        if ret is not None:
+            _try_put(ch, ret)
+        ch.close()
+
+    if executor is None:
+        executor = _get_process_pool()
+    executor.submit(f, *args).add_done_callback(put_result_to_ch)
+    return ch
+
+
+def _go(coro):
+    """Adds `coro` as a task to the current event loop, discarding its result.
+
+    A cheaper :func:`go` for when the returned channel would never be used.
+    """
+    loop = get_loop()
+    if _in_loop(loop):
+        loop.create_task(coro)
+    else:
+        _call_soon_threadsafe(loop, loop.create_task, coro)
+
+
+def _put_result_to_ch(ch, task):
+    """A task done callback that puts the result of `task` onto `ch`."""
+    if task.cancelled():
+        return
+    ex = task.exception()
+    if ex is not None:
+        task.get_loop().call_exception_handler({
+            'message': 'Exception in goroutine',
+            'exception': ex,
+            'task': task,
+        })
+        return
+    ret = task.result()
+    if ret is not None:
+        _try_put(ch, ret)
+    ch.close()
+
+
+def _start_goroutine(loop, coro, ch, *done_callbacks):
+    """Creates a task for `coro` from the thread running `loop`."""
+    task = loop.create_task(coro)
+    task.add_done_callback(_functools.partial(_put_result_to_ch, ch))
+    for cb in done_callbacks:
+        task.add_done_callback(cb)
+
+
 def go(coro):
     """Adds a coroutine object as a task to the current event loop.
 
@@ -220,31 +524,150 @@ def go(coro):
 
     Returns:
         A channel containing the return value of `coro`.
+
+    See Also:
+        :meth:`runtime.go`
     """
     loop = get_loop()
     ch = chan(1)
+    if _in_loop(loop):
+        _start_goroutine(loop, coro, ch)
+    else:
+        _call_soon_threadsafe(loop, _start_goroutine, loop, coro, ch)
+    return ch
 
-    def create_tasks():
-        # Note: coro and put_result_to_ch coroutines need to be added
-        # separately or else a 'coroutine never awaited' RuntimeWarning could
-        # get raised when call_soon_threadsafe is used
 
-        coro_task = loop.create_task(coro)
+class runtime:
+    """Runs goroutines across `n` event loops, each in its own thread.
 
-        async def put_result_to_ch():
-            ret = await coro_task
-            if ret is not None:
-                await ch.put(ret)
-            ch.close()
+    A single event loop can only make use of a single core. A runtime starts
+    `n` event loops in `n` daemon threads and spreads goroutines across them
+    with :meth:`go`. Since channels can be used across threads, goroutines on
+    different loops can freely communicate through them. Each loop is
+    registered to its thread (see :func:`set_loop`), so any function called
+    from a goroutine will use the loop that goroutine runs on.
 
-        loop.create_task(put_result_to_ch())
+    A runtime can be used as a context manager, closing it on exit.
 
-    if _in_loop(loop):
-        create_tasks()
-    else:
-        loop.call_soon_threadsafe(create_tasks)
+    Args:
+        n: A positive int specifying the number of event loops.
+    """
 
-    return ch
+    def __init__(self, n):
+        if n < 1 or n != int(n):
+            raise ValueError('n must be a positive int')
+        self._lock = _threading.Lock()
+        self._loops = tuple(_asyncio.new_event_loop() for _ in range(int(n)))
+        self._spawned = [0] * len(self._loops)
+        self._completed = [0] * len(self._loops)
+        self._next_index = 0
+        self._is_closed = False
+        self._threads = [_threading.Thread(target=self._run_loop,
+                                           args=[loop],
+                                           name=f'chanpy-runtime-{i}',
+                                           daemon=True)
+                         for i, loop in enumerate(self._loops)]
+        for t in self._threads:
+            t.start()
+
+    @property
+    def loops(self):
+        """A tuple of the event loops of the runtime."""
+        return self._loops
+
+    def go(self, coro, key=None):
+        """Adds a coroutine object as a task to one of the runtime's loops.
+
+        Args:
+            coro: A coroutine object.
+            key: An optional hashable affinity key. If provided, all
+                goroutines with an equal key will run on the same loop.
+                Otherwise, loops are chosen in round-robin order.
+
+        Returns:
+            A channel containing the return value of `coro`.
+
+        Raises:
+            RuntimeError: If the runtime is closed.
+
+        See Also:
+            :func:`go`
+        """
+        with self._lock:
+            if self._is_closed:
+                coro.close()
+                raise RuntimeError('runtime is closed')
+            if key is None:
+                i = self._next_index
+                self._next_index = (i + 1) % len(self._loops)
+            else:
+                i = hash(key) % len(self._loops)
+            self._spawned[i] += 1
+
+        loop = self._loops[i]
+        ch = chan(1)
+        on_done = _functools.partial(self._on_done, i)
+        if _in_loop(loop):
+            _start_goroutine(loop, coro, ch, on_done)
+        else:
+            _call_soon_threadsafe(loop, _start_goroutine,
+                                  loop, coro, ch, on_done)
+        return ch
+
+    def metrics(self):
+        """Returns a list containing a dict of metrics for each loop.
+
+        Each dict has the following keys:
+
+        * ``'spawned'``: The number of goroutines added to the loop.
+        * ``'completed'``: The number of those goroutines that have finished.
+        * ``'active'``: The number of those goroutines that haven't finished.
+        """
+        with self._lock:
+            return [{'spawned': spawned,
+                     'completed': completed,
+                     'active': spawned - completed}
+                    for spawned, completed in zip(self._spawned,
+                                                  self._completed)]
+
+    def close(self):
+        """Stops all of the loops and waits for their threads to finish.
+
+        Goroutines that haven't finished will be cancelled.
+        """
+        with self._lock:
+            if self._is_closed:
+                return
+            self._is_closed = True
+        for loop in self._loops:
+            loop.call_soon_threadsafe(loop.stop)
+        for t in self._threads:
+            if t is not _threading.current_thread():
+                t.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _on_done(self, i, _):
+        with self._lock:
+            self._completed[i] += 1
+
+    @staticmethod
+    def _run_loop(loop):
+        _asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+            tasks = _asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(
+                _asyncio.gather(*tasks, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
 
 
 def _goroutine(coro):
@@ -426,7 +849,7 @@ def pipe(from_ch, to_ch, *, close=True):
         if close:
             to_ch.close()
 
-    go(proc())
+    _go(proc())
     return to_ch
 
 
@@ -517,6 +940,181 @@ def pipeline(n, to_ch, xform, from_ch, *,
     return complete_ch
 
 
+def fold(n, combinef, xform, rf, coll, *, mode='thread', chunksize=None):
+    """Reduces `coll` with a transformation in parallel.
+
+    `coll` is split into chunks of consecutive values, each of which is
+    reduced independently in a pool of threads or processes, like with
+    :func:`~chanpy.transducers.itransduce` except for the completion arity.
+    Each reduction starts with the return value of ``combinef()``. The results
+    of the chunks are then combined in order by calling
+    ``combinef(left, right)``, and the completion arity of ``xform(rf)`` is
+    called once on the combined result.
+
+    Because chunks are transformed independently, only stateless transducers,
+    such as those returned by :func:`~chanpy.transducers.map`,
+    :func:`~chanpy.transducers.filter`, :func:`~chanpy.transducers.remove`,
+    :func:`~chanpy.transducers.keep`, :func:`~chanpy.transducers.replace`,
+    :func:`~chanpy.transducers.vmap`, :func:`~chanpy.transducers.vfilter`,
+    and their compositions, are supported. A :any:`reduced` value returned by
+    `rf` only terminates the reduction of its own chunk.
+
+    Each chunk is transformed with :any:`chunked execution <transducers>`, so
+    vectorized transducers operate on a whole chunk at once. This function
+    blocks until the result is available.
+
+    Args:
+        n: A positive int specifying the maximum number of chunks to reduce
+            in parallel.
+        combinef: A function accepting 0 arguments, which returns the initial
+            value of each chunk's reduction, and 2 arguments, which combines
+            the results of two chunks.
+        xform: A stateless :any:`transducer`.
+        rf: A :any:`reducing function` accepting both 1 and 2 arguments.
+        coll: A sequence, array, or other finite iterable. Iterables that
+            can't be sliced are copied into a list first.
+        mode: Either ``'thread'`` or ``'process'``. Specifies whether to use a
+            thread or process pool to parallelize work.
+        chunksize: An optional positive int specifying the number of values
+            in each chunk. Defaults to splitting `coll` into `n` chunks of
+            roughly equal size.
+
+    Returns:
+        The combined result of the reductions. If `coll` is empty, then the
+        completion arity is called with ``combinef()``.
+
+    Raises:
+        ValueError: If `xform` isn't stateless.
+
+    Note:
+        If CPython is being used with ``mode='thread'``, then `xform` and `rf`
+        must release the GIL at some point in order to achieve any
+        parallelism, as vectorized NumPy transducers do.
+
+    See Also:
+        :func:`pipeline`
+    """
+    if n < 1 or n != int(n):
+        raise ValueError('n must be a positive int')
+    if chunksize is not None and (chunksize < 1 or
+                                  chunksize != int(chunksize)):
+        raise ValueError('chunksize must be a positive int')
+    if not _xf._is_foldable(xform):
+        raise ValueError('fold only supports stateless transducers such as '
+                         'map, filter, remove, keep, and replace')
+    if mode not in ('thread', 'process'):
+        raise ValueError('mode argument needs to be either "thread" or '
+                         '"process"')
+
+    if not _xf._is_sliceable(coll):
+        coll = list(coll)
+    if chunksize is None:
+        chunksize = max(1, -(-len(coll) // n))
+    chunks = [coll[i:i + chunksize] for i in range(0, len(coll), chunksize)]
+
+    def reduce_chunk(chunk):
+        _, result = _xf._itransduce_steps(xform, rf, combinef(), chunk,
+                                          len(chunk))
+        return result
+
+    results = []
+    if len(chunks) > 0:
+        if mode == 'thread':
+            pool = _DummyPool(min(n, len(chunks)))
+            reduce_func = reduce_chunk
+        else:
+            pool = _ProcPool(min(n, len(chunks)), _pipeline_initializer,
+                             [reduce_chunk])
+            reduce_func = _pipeline_transform_wrapper
+        try:
+            results = pool.map(reduce_func, chunks)
+        finally:
+            pool.terminate()
+
+    combined = (_xf.ireduce(combinef, results[0], results[1:])
+                if len(results) > 0
+                else combinef())
+    return _xf._complete_fn(xform(rf))(combined)
+
+
+def pipeline_by_key(n, to_ch, xform, from_ch, key_fn, *,
+                    close=True, ex_handler=None):
+    """Transforms values from `from_ch` to `to_ch` in parallel by key.
+
+    Values from `from_ch` will be hash partitioned by key across `n` worker
+    threads (see :func:`route`), so values with equal keys are always
+    transformed by the same worker. Unlike :func:`pipeline`, each worker has
+    its own instance of `xform` that is applied across all of the values it
+    receives, so `xform` may be stateful (e.g. aggregating per key). Values
+    with equal keys will be put onto `to_ch` in order relative to the inputs.
+    No ordering is guaranteed between values with different keys. If `to_ch`
+    closes, then `from_ch` will no longer be consumed from.
+
+    Args:
+        n: A positive int specifying the number of workers.
+        to_ch: A channel to put the transformed values onto.
+        xform: A :any:`transducer` that will be applied across the values
+            of each worker.
+        from_ch: A channel to get values from.
+        key_fn: A function accepting a value from `from_ch` and returning its
+            key.
+        close: An optional bool. If True, `to_ch` will be closed after transfer
+            finishes.
+        ex_handler: An optional exception handler. See :class:`chan`.
+
+    Returns:
+        A channel that closes after the transfer finishes.
+
+    Note:
+        If CPython is being used, then `xform` must release the GIL at some
+        point in order to achieve any parallelism.
+
+    See Also:
+        :func:`pipeline`
+    """
+    if n < 1 or n != int(n):
+        raise ValueError('n must be a positive int')
+    partition_chs = route(key_fn, from_ch, int(n), lambda _: 1)
+    result_chs = [chan(1) for _ in range(int(n))]
+
+    def work(partition_ch, result_ch):
+        # xform_ch is only used by this thread so the event loop will never
+        # wait on xform
+        xform_ch = chan(1, xform, ex_handler)
+
+        def transfer():
+            val = xform_ch.poll()
+            while val is not None:
+                if not result_ch.b_put(val):
+                    return False
+                val = xform_ch.poll()
+            return True
+
+        for val in partition_ch.to_iter():
+            xform_ch.b_put(val)
+            if not transfer():
+                partition_ch.close()
+                break
+        xform_ch.close()
+        transfer()
+        result_ch.close()
+
+    for partition_ch, result_ch in zip(partition_chs, result_chs):
+        _threading.Thread(target=work,
+                          args=[partition_ch, result_ch]).start()
+
+    async def collect_results():
+        async for val in merge(result_chs):
+            if not await to_ch.put(val):
+                for ch in partition_chs + result_chs:
+                    ch.close()
+                break
+        if close:
+            to_ch.close()
+
+    return go(collect_results())
+
+
 def pipeline_async(n, to_ch, af, from_ch, *, close=True):
     """Transforms values from `from_ch` to `to_ch` in parallel using an async function.
 
@@ -572,16 +1170,146 @@ def pipeline_async(n, to_ch, af, from_ch, *, close=True):
         if close:
             to_ch.close()
 
-    go(distribute_input())
+    _go(distribute_input())
     return go(collect_results())
 
 
+def _call_soon(loop, f, *args):
+    """Schedules ``f(*args)`` on `loop` from any thread."""
+    if _in_loop(loop):
+        loop.call_soon(f, *args)
+    else:
+        _call_soon_threadsafe(loop, f, *args)
+
+
+class _FanIn:
+    """Transfers values from many source channels onto `to_ch` via callbacks.
+
+    Each source has at most one pending get and `to_ch` has at most one
+    pending put at any time. Values are put onto `to_ch` in the order they were
+    received, so sources are served fairly in the order they become ready.
+    Whether a value is muted is decided at the moment it's taken from its
+    source. No task, alt, or future is created per value.
+
+    Channel callbacks can be invoked while a channel's lock is held, so they
+    only ever schedule work on `loop`. Every other method must be called from
+    the thread running `loop`.
+
+    Args:
+        loop: The event loop to run on.
+        to_ch: A channel to put values onto.
+        is_muted: A function, ``is_muted(ch) -> bool``. Values from muted
+            sources are discarded.
+        is_active: A function, ``is_active(ch) -> bool``. Only active sources
+            are consumed from.
+        on_exhausted: A function that will be called with a source once it's
+            exhausted.
+        stop_on_close: A bool. If True, stops consuming from all sources once
+            `to_ch` is closed.
+    """
+
+    def __init__(self, loop, to_ch, *, is_muted, is_active, on_exhausted,
+                 stop_on_close):
+        self._loop = loop
+        self._to_ch = to_ch
+        self._is_muted = is_muted
+        self._is_active = is_active
+        self._on_exhausted = on_exhausted
+        self._stop_on_close = stop_on_close
+        self._flags = {}  # ch->flag of its pending get
+        self._ready = _deque()  # (val, ch, is_muted)
+        self._is_putting = False
+        self._is_running = False
+        self._is_stopped = False
+
+    def add(self, ch):
+        """Starts consuming from `ch` if it isn't already being consumed."""
+        if not self._is_stopped and ch not in self._flags:
+            self._arm(ch)
+            self._run()
+
+    def remove(self, ch):
+        """Cancels the pending get on `ch` (if any)."""
+        flag = self._flags.pop(ch, None)
+        if flag is not None:
+            with flag['lock']:
+                flag['is_active'] = False
+
+    def stop(self):
+        self._is_stopped = True
+        for ch in tuple(self._flags):
+            self.remove(ch)
+        self._ready.clear()
+
+    def _arm(self, ch):
+        flag = _channel.create_flag()
+        handler = _channel.FlagHandler(
+            flag, _functools.partial(self._on_get, ch, flag))
+        ret = ch._p_get(handler)
+        if ret is None:
+            self._flags[ch] = flag
+        else:
+            self._ready.append((ret[0], ch, self._is_muted(ch)))
+
+    def _on_get(self, ch, flag, val):
+        _call_soon(self._loop, self._deliver,
+                   ch, flag, val, self._is_muted(ch))
+
+    def _deliver(self, ch, flag, val, is_muted):
+        if self._flags.get(ch, None) is flag:
+            del self._flags[ch]
+        if not self._is_stopped:
+            self._ready.append((val, ch, is_muted))
+            self._run()
+
+    def _on_put(self, ch, is_put):
+        _call_soon(self._loop, self._put_done, ch, is_put)
+
+    def _put_done(self, ch, is_put):
+        self._is_putting = False
+        self._after_put(ch, is_put)
+        self._run()
+
+    def _after_put(self, ch, is_put):
+        if not is_put and self._stop_on_close:
+            self.stop()
+        elif not self._is_stopped and self._is_active(ch):
+            self.add(ch)
+
+    def _run(self):
+        if self._is_running:
+            return
+        self._is_running = True
+        try:
+            while len(self._ready) > 0 and not self._is_putting:
+                val, ch, is_muted = self._ready.popleft()
+                if val is None:
+                    self._on_exhausted(ch)
+                elif is_muted:
+                    if ch not in self._flags and self._is_active(ch):
+                        self._arm(ch)
+                else:
+                    handler = _channel.FnHandler(
+                        _functools.partial(self._on_put, ch))
+                    ret = self._to_ch._p_put(handler, val)
+                    if ret is None:
+                        self._is_putting = True
+                    else:
+                        self._after_put(ch, ret[0])
+        finally:
+            self._is_running = False
+
+
 def merge(chs, buf_or_n=None):
     """Returns a channel that emits values from the provided source channels.
 
     Transfers all values from `chs` onto the returned channel. The returned
     channel closes after the transfer finishes.
 
+    Each source has a single pending get that puts straight onto the returned
+    channel when it completes, so the cost per value does not depend on the
+    number of sources.
+
     Args:
         chs: An iterable of source channels.
         buf_or_n: An optional buffer to use with the returned channel.
@@ -590,57 +1318,87 @@ def merge(chs, buf_or_n=None):
     See Also:
         :class:`mix`
     """
+    loop = get_loop()
     to_ch = chan(buf_or_n)
+    chs = set(chs)
+    remaining = len(chs)
 
-    async def proc():
-        ports = set(chs)
-        while len(ports) > 0:
-            val, ch = await alt(*ports)
-            if val is None:
-                ports.remove(ch)
-            else:
-                await to_ch.put(val)
+    if remaining == 0:
         to_ch.close()
+        return to_ch
 
-    go(proc())
+    def on_exhausted(_):
+        nonlocal remaining
+        remaining -= 1
+        if remaining == 0:
+            to_ch.close()
+
+    fan_in = _FanIn(loop, to_ch,
+                    is_muted=lambda _: False,
+                    is_active=lambda _: True,
+                    on_exhausted=on_exhausted,
+                    stop_on_close=False)
+
+    def start():
+        for ch in chs:
+            fan_in.add(ch)
+
+    _call_soon(loop, start)
     return to_ch
 
 
-def _every(ops):
-    """Returns a channel containing a tuple of the operation results.
+class _Lockstep:
+    """Repeatedly takes one value from each source channel at once.
+
+    The handlers and the list of results are created once and reused for
+    every round. When a round cannot complete immediately, `on_round` will be
+    called from `loop` with the results once the final value arrives, costing
+    a single wakeup per round.
 
     Args:
-        ops: An iterable of channel operations. See :func:`alt`.
-    """
-    ops = tuple(ops)
-    lock = _threading.Lock()
-    results = [None] * len(ops)
-    remaining_results = len(ops)
-    to_ch = chan(1)
-
-    def setting_result(index):
-        def set_result(result):
-            nonlocal remaining_results
-            with lock:
-                results[index] = result
-                remaining_results -= 1
-                if remaining_results == 0:
-                    to_ch.b_put(tuple(results))
-                    to_ch.close()
-        return set_result
-
-    for i, op in enumerate(ops):
-        try:
-            ch, val = op
-        except TypeError:
-            op.f_get(setting_result(i))
-        else:
-            ch.f_put(val, setting_result(i))
+        loop: The event loop to call `on_round` from.
+        chs: A tuple of source channels.
+        on_round: A function accepting the list of results of a round.
+    """
 
-    return to_ch
+    def __init__(self, loop, chs, on_round):
+        self._loop = loop
+        self._chs = chs
+        self._on_round = on_round
+        self._lock = _threading.Lock()
+        self._results = [None] * len(chs)
+        self._remaining = 0
+        self._handlers = tuple(
+            _channel.FnHandler(_functools.partial(self._on_get, i))
+            for i in range(len(chs)))
+
+    def start_round(self):
+        """Starts taking the next value from each source channel.
+
+        Returns:
+            The list of results if the round completes immediately else None.
+            The returned list is only valid until the next round is started.
+        """
+        self._remaining = len(self._chs)
+        for i, ch in enumerate(self._chs):
+            ret = ch._p_get(self._handlers[i])
+            if ret is not None and self._set_result(i, ret[0]):
+                return self._results
+        return None
+
+    def _set_result(self, i, val):
+        """Returns True if `val` was the last result of the round."""
+        with self._lock:
+            self._results[i] = val
+            self._remaining -= 1
+            return self._remaining == 0
+
+    def _on_get(self, i, val):
+        if self._set_result(i, val):
+            _call_soon(self._loop, self._on_round, self._results)
 
 
-def map(f, chs, buf_or_n=None):
+def map(f, chs, buf_or_n=None, *, batch_size=1):
     """Repeatedly takes a value from each channel and applies `f`.
 
     Asynchronously takes one value per source channel and passes the resulting
@@ -653,23 +1411,141 @@ def map(f, chs, buf_or_n=None):
         chs: An iterable of source channels.
         buf_or_n: An optional buffer to use with the returned channel.
             Can also be represented as a positive number. See :class:`chan`.
+        batch_size: An optional positive int specifying the maximum number of
+            rounds to zip at once. Rounds after the first are only zipped if
+            a value is already available from every source channel.
 
     Returns:
         A channel containing the return values of `f`.
     """
+    if batch_size < 1 or batch_size != int(batch_size):
+        raise ValueError('batch_size must be a positive int')
+    loop = get_loop()
     chs = tuple(chs)
     to_ch = chan(buf_or_n)
 
-    async def proc():
-        while True:
-            args = await _every(chs).get()
+    def run(args=None):
+        for _ in range(batch_size):
+            if args is None:
+                args = lockstep.start_round()
+                if args is None:
+                    return  # lockstep will resume
             if None in args:
                 to_ch.close()
+                return
+            if to_ch._p_put(put_handler, f(*args)) is None:
+                return  # put_handler will resume
+            args = None
+        _call_soon(loop, run)
+
+    lockstep = _Lockstep(loop, chs, run)
+    put_handler = _channel.FnHandler(lambda _: _call_soon(loop, run))
+    _call_soon(loop, run)
+    return to_ch
+
+
+_TAP_POLICIES = ('block', 'drop', 'sliding')
+
+
+class _Batch(list):
+    """Values from a :class:`pub` to be delivered by a topic's mult in order."""
+
+
+def _slide(ch, item):
+    """Puts `item` onto `ch` after evicting the oldest value from its buffer.
+
+    Returns:
+        True if `item` was put, False if `ch` is closed, or None if `item` was
+        dropped. `item` is dropped if `ch` cannot accept it immediately and its
+        buffer is not full, or if another producer's pending put refills the
+        freed slot first.
+    """
+    if ch._buf is None or not ch._buf.is_full():
+        return None
+    _try_get(ch)
+    return _try_put(ch, item)
+
+
+async def _put_all(ch, items):
+    """Puts each of `items` onto `ch` in order. Returns False if `ch` closed."""
+    for item in items:
+        is_put = _try_put(ch, item)
+        if is_put is None:
+            is_put = await ch.put(item)
+        if not is_put:
+            return False
+    return True
+
+
+async def _put_batches(batches):
+    """Puts each list of values onto its channel in order.
+
+    Values are put synchronously where possible. The remaining values are
+    then put with all of their channels being waited on at once.
+
+    Args:
+        batches: A dict of the form ``{ch: [value, ...], ...}``.
+
+    Returns:
+        A list of the channels that were found to be closed.
+    """
+    closed_chs, blocked_chs, blocked_items = [], [], []
+
+    for ch, items in batches.items():
+        for i, item in enumerate(items):
+            is_put = _try_put(ch, item)
+            if is_put is None:
+                blocked_chs.append(ch)
+                blocked_items.append(items[i:])
+                break
+            if is_put is False:
+                closed_chs.append(ch)
                 break
-            await to_ch.put(f(*args))
 
-    go(proc())
-    return to_ch
+    if len(blocked_chs) > 0:
+        results = await _asyncio.gather(
+            *(_put_all(ch, rest)
+              for ch, rest in zip(blocked_chs, blocked_items)))
+        closed_chs.extend(ch
+                          for ch, is_open in zip(blocked_chs, results)
+                          if not is_open)
+
+    return closed_chs
+
+
+async def _distribute(items, taps):
+    """Puts `items` onto each tap in accordance with the tap's policy.
+
+    Each tap is offered every item synchronously in a single pass. Items that
+    a tap with a ``'block'`` policy cannot accept immediately are put onto it
+    afterwards, with all such taps being waited on at once. Items are always
+    received by a tap in order.
+
+    Args:
+        items: A sequence of non-None values.
+        taps: An iterable of the form ``[(ch, policy), ...]``.
+
+    Returns:
+        A list of the tap channels that were found to be closed.
+    """
+    closed_chs, blocked = [], {}  # blocked is ch->remaining items
+
+    for ch, policy in taps:
+        for i, item in enumerate(items):
+            is_put = _try_put(ch, item)
+            if is_put is None:
+                if policy == 'block':
+                    blocked[ch] = items[i:]
+                    break
+                if policy == 'sliding':
+                    is_put = _slide(ch, item)
+            if is_put is False:
+                closed_chs.append(ch)
+                break
+
+    if len(blocked) > 0:
+        closed_chs.extend(await _put_batches(blocked))
+    return closed_chs
 
 
 class mult:
@@ -679,9 +1555,12 @@ class mult:
     receive copies of the values from `ch`. Taps can later be unsubscribed
     using :meth:`untap` or :meth:`untap_all`.
 
-    No tap will receive the next value from `ch` until all taps have accepted
-    the current value. If no tap exists, values will still be consumed from
-    `ch` but will be discarded.
+    Each tap has a policy that decides what happens when it cannot accept a
+    value immediately. No tap will receive the next value from `ch` until all
+    taps with a ``'block'`` policy (the default) have accepted the current
+    value. Taps with a ``'drop'`` or ``'sliding'`` policy never hold up the
+    mult. If no tap exists, values will still be consumed from `ch` but will be
+    discarded.
 
     Args:
         ch: A channel to get values from.
@@ -690,50 +1569,198 @@ class mult:
     def __init__(self, ch):
         self._lock = _threading.Lock()
         self._from_ch = ch
-        self._taps = {}  # ch->close
+        self._taps = {}  # ch->(close, policy)
+        self._tap_policies = None  # Cached tuple of (ch, policy)
         self._is_closed = False
-        go(self._proc())
+        _go(self._proc())
 
-    def tap(self, ch, *, close=True):
+    def tap(self, ch, *, close=True, policy='block'):
         """Subscribes a channel as a consumer of the mult.
 
         Args:
             ch: A channel to receive values from the mult's source channel.
             close: An optional bool. If True, `ch` will be closed after the
                 source channel becomes exhausted.
+            policy: An optional str specifying what to do when `ch` cannot
+                accept a value immediately. ``'block'`` waits for `ch` before
+                the mult moves on to the next value, ``'drop'`` discards the
+                value for `ch`, and ``'sliding'`` evicts the oldest value
+                in the buffer of `ch` to make room for the new one. A value
+                is still dropped by ``'sliding'`` if a pending put from
+                another producer takes the freed slot.
+
+        Raises:
+            ValueError: If `policy` is invalid or is ``'sliding'`` and `ch` is
+                unbuffered.
         """
+        if policy not in _TAP_POLICIES:
+            raise ValueError(f'policy is invalid: {policy}')
+        if policy == 'sliding' and ch._buf is None:
+            raise ValueError("'sliding' policy requires a buffered channel")
+
         with self._lock:
             if self._is_closed and close:
                 ch.close()
-            self._taps[ch] = close
+            self._taps[ch] = (close, policy)
+            self._tap_policies = None
 
     def untap(self, ch):
         """Unsubscribes a channel from the mult."""
         with self._lock:
             self._taps.pop(ch, None)
+            self._tap_policies = None
 
     def untap_all(self):
         """Unsubscribes all taps from the mult."""
         with self._lock:
             self._taps.clear()
+            self._tap_policies = None
 
     async def _proc(self):
-        async for item in self._from_ch:
-            with self._lock:
-                chs = tuple(self._taps)
-            results = await _asyncio.gather(*(ch.put(item) for ch in chs))
+        async for val in self._from_ch:
             with self._lock:
-                for ch, is_open in zip(chs, results):
-                    if not is_open:
+                if self._tap_policies is None:
+                    self._tap_policies = tuple(
+                        (ch, policy)
+                        for ch, (_, policy) in self._taps.items())
+                taps = self._tap_policies
+            closed_chs = await _distribute(
+                val if type(val) is _Batch else (val,), taps)
+            if len(closed_chs) > 0:
+                with self._lock:
+                    for ch in closed_chs:
                         self._taps.pop(ch, None)
+                    self._tap_policies = None
 
         with self._lock:
             self._is_closed = True
-            for ch, close in self._taps.items():
+            for ch, (close, _) in self._taps.items():
                 if close:
                     ch.close()
 
 
+class _TopicNode:
+    __slots__ = ('children', 'subs', 'rest_subs')
+
+    def __init__(self):
+        self.children = {}  # segment->_TopicNode
+        self.subs = {}  # ch->close
+        self.rest_subs = {}  # ch->close, for patterns ending in '#'
+
+
+class _TopicIndex:
+    """A trie of topic patterns used to route topics to subscribed channels.
+
+    Patterns are split into segments by `sep`. A ``'*'`` segment matches
+    exactly one segment of a topic and a final ``'#'`` segment matches zero or
+    more trailing segments.
+    """
+
+    _MAX_CACHED_ROUTES = 4096
+
+    def __init__(self, sep):
+        self._sep = sep
+        self._root = _TopicNode()
+        self._patterns = {}  # pattern->_TopicNode
+        self._ch_patterns = {}  # ch->set of patterns
+        self._routes = {}  # topic->tuple of matching chs
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def add(self, pattern, ch, close):
+        segments = pattern.split(self._sep)
+        if '#' in segments[:-1]:
+            raise ValueError(f"'#' may only be the last segment of a pattern: "
+                             f"{pattern}")
+        node = self._root
+        for segment in segments[:-1]:
+            node = node.children.setdefault(segment, _TopicNode())
+        if segments[-1] == '#':
+            node.rest_subs[ch] = close
+        else:
+            node = node.children.setdefault(segments[-1], _TopicNode())
+            node.subs[ch] = close
+        self._patterns[pattern] = node
+        self._ch_patterns.setdefault(ch, set()).add(pattern)
+        self._routes.clear()
+
+    def remove(self, pattern, ch):
+        patterns = self._ch_patterns.get(ch, None)
+        if patterns is None or pattern not in patterns:
+            return
+        patterns.remove(pattern)
+        if len(patterns) == 0:
+            del self._ch_patterns[ch]
+
+        segments = pattern.split(self._sep)
+        path = [self._root]
+        for segment in segments[:-1]:
+            path.append(path[-1].children[segment])
+        if segments[-1] == '#':
+            subs = path[-1].rest_subs
+        else:
+            path.append(path[-1].children[segments[-1]])
+            subs = path[-1].subs
+        del subs[ch]
+        if len(subs) == 0:
+            del self._patterns[pattern]
+
+        # Prune nodes that no longer lead to any subscription
+        for i in range(len(path) - 1, 0, -1):
+            node = path[i]
+            if len(node.children) > 0 or len(node.subs) > 0 or (
+                    len(node.rest_subs) > 0):
+                break
+            del path[i - 1].children[segments[i - 1]]
+        self._routes.clear()
+
+    def remove_ch(self, ch):
+        for pattern in tuple(self._ch_patterns.get(ch, ())):
+            self.remove(pattern, ch)
+
+    def clear(self):
+        self._root = _TopicNode()
+        self._patterns.clear()
+        self._ch_patterns.clear()
+        self._routes.clear()
+
+    def subs(self):
+        """Returns a dict of every subscribed channel to its close flag."""
+        chs = {}
+        for node in self._patterns.values():
+            chs.update(node.subs)
+            chs.update(node.rest_subs)
+        return chs
+
+    def match(self, topic):
+        """Returns a tuple of each channel subscribed to a matching pattern."""
+        route = self._routes.get(topic, None)
+        if route is not None:
+            return route
+
+        chs = {}
+        if isinstance(topic, str):
+            nodes = [self._root]
+            for segment in topic.split(self._sep):
+                next_nodes = []
+                for node in nodes:
+                    chs.update(node.rest_subs)
+                    for key in (segment, '*'):
+                        child = node.children.get(key, None)
+                        if child is not None:
+                            next_nodes.append(child)
+                nodes = next_nodes
+            for node in nodes:
+                chs.update(node.rest_subs)
+                chs.update(node.subs)
+
+        if len(self._routes) >= self._MAX_CACHED_ROUTES:
+            self._routes.clear()
+        route = self._routes[topic] = tuple(chs)
+        return route
+
+
 class pub:
     """A pub(lication) of the source channel divided into topics.
 
@@ -742,6 +1769,22 @@ class pub:
     to. Channels can be subscribed to a given topic with :meth:`sub` and
     unsubscribed with :meth:`unsub` or :meth:`unsub_all`.
 
+    Channels can also subscribe to a pattern of string topics with
+    :meth:`psub`. Topics and patterns are divided into segments by `sep`, for
+    example ``'orders.eu.fr'``. Within a pattern, a ``'*'`` segment matches any
+    single segment and a final ``'#'`` segment matches any number of remaining
+    segments, so both ``'orders.*.fr'`` and ``'orders.#'`` match
+    ``'orders.eu.fr'``. Patterns are kept in an index so that routing cost
+    does not grow with the number of subscribed patterns. A channel receives
+    each value at most once, no matter how many of its subscriptions match.
+
+    If `batch_size` is greater than 1, then up to `batch_size` values that are
+    immediately available from `ch` will be taken at once. Consecutive values
+    with the same topic are handed to that topic's :class:`mult` in a single
+    put. The pub never waits for a batch to fill, so `batch_size` only bounds
+    how much work is done before the first value of a batch is delivered.
+    Values are dispatched in the order they were taken from `ch`.
+
     Args:
         ch: A channel to get values from.
         topic_fn: A function that given a value from `ch` returns a topic
@@ -749,17 +1792,27 @@ class pub:
         buf_fn: An optional function that given a topic returns a buffer to be
             used with that topic's :class:`mult` channel. If not provided,
             channels will be unbuffered.
+        sep: An optional str used to separate the segments of topics and
+            patterns.
+        batch_size: An optional positive int specifying the maximum number of
+            values to dispatch at once. Buffers returned from `buf_fn` will
+            hold batches rather than single values if greater than 1.
 
     See Also:
         :class:`mult`
     """
-    def __init__(self, ch, topic_fn, buf_fn=None):
+    def __init__(self, ch, topic_fn, buf_fn=None, *, sep='.', batch_size=1):
+        if batch_size < 1 or batch_size != int(batch_size):
+            raise ValueError('batch_size must be a positive int')
         self._lock = _threading.Lock()
         self._from_ch = ch
         self._topic_fn = topic_fn
         self._buf_fn = (lambda _: None) if buf_fn is None else buf_fn
         self._mults = {}  # topic->mult
-        go(self._proc())
+        self._index = _TopicIndex(sep)
+        self._batch_size = batch_size
+        self._is_closed = False
+        _go(self._proc())
 
     def sub(self, topic, ch, *, close=True):
         """Subscribes a channel to the given `topic`.
@@ -775,6 +1828,28 @@ class pub:
                 self._mults[topic] = mult(chan(self._buf_fn(topic)))
             self._mults[topic].tap(ch, close=close)
 
+    def psub(self, pattern, ch, *, close=True):
+        """Subscribes a channel to every topic matching `pattern`.
+
+        Pattern subscribers are delivered to directly by the pub and are not
+        affected by `buf_fn`.
+
+        Args:
+            pattern: A str pattern. See :class:`pub` for its syntax.
+            ch: A channel to subscribe.
+            close: An optional bool. If True, `ch` will be closed when the
+                source channel is exhausted.
+
+        Raises:
+            ValueError: If ``'#'`` is used anywhere but the last segment.
+        """
+        with self._lock:
+            if self._is_closed:
+                if close:
+                    ch.close()
+                return
+            self._index.add(pattern, ch, close)
+
     def unsub(self, topic, ch):
         """Unsubscribes a channel from the given `topic`."""
         with self._lock:
@@ -785,12 +1860,20 @@ class pub:
                     m._from_ch.close()
                     self._mults.pop(topic)
 
+    def punsub(self, pattern, ch):
+        """Unsubscribes a channel from the given `pattern`."""
+        with self._lock:
+            self._index.remove(pattern, ch)
+
     def unsub_all(self, topic=_Undefined):
         """
         unsub_all(topic=Undefined)
 
-        Unsubscribes all subs from a `topic` or all topics if not provided."""
+        Unsubscribes all subs from a `topic` or all topics and patterns if not
+        provided."""
         with self._lock:
+            if topic is _Undefined:
+                self._index.clear()
             topics = tuple(self._mults) if topic is _Undefined else [topic]
             for t in topics:
                 m = self._mults.get(t, None)
@@ -799,17 +1882,60 @@ class pub:
                     m._from_ch.close()
                     self._mults.pop(t)
 
+    def _take_batch(self, item):
+        """Returns a list of (topic, values) taken from the source channel.
+
+        Each entry is a run of consecutive values with the same topic.
+        """
+        topic = self._topic_fn(item)
+        runs = [(topic, [item])]
+        for _ in range(self._batch_size - 1):
+            item = _try_get(self._from_ch)
+            if item is None:
+                break
+            topic = self._topic_fn(item)
+            if topic == runs[-1][0]:
+                runs[-1][1].append(item)
+            else:
+                runs.append((topic, [item]))
+        return runs
+
     async def _proc(self):
         async for item in self._from_ch:
-            with self._lock:
-                m = self._mults.get(self._topic_fn(item), None)
-            if m is not None:
-                await m._from_ch.put(item)
+            for topic, items in self._take_batch(item):
+                with self._lock:
+                    m = self._mults.get(topic, None)
+                    pattern_chs = (self._index.match(topic)
+                                   if len(self._index) > 0
+                                   else ())
+                    if m is not None and len(pattern_chs) > 0:
+                        # Exact subscribers already receive items through m
+                        with m._lock:
+                            pattern_chs = tuple(ch for ch in pattern_chs
+                                                if ch not in m._taps)
+                if m is not None:
+                    await m._from_ch.put(items[0]
+                                         if len(items) == 1
+                                         else _Batch(items))
+                if len(pattern_chs) > 0:
+                    await self._distribute_to_patterns(items, pattern_chs)
 
         with self._lock:
+            self._is_closed = True
             for m in self._mults.values():
                 m._from_ch.close()
             self._mults.clear()
+            for ch, close in self._index.subs().items():
+                if close:
+                    ch.close()
+            self._index.clear()
+
+    async def _distribute_to_patterns(self, items, chs):
+        closed_chs = await _distribute(items, [(ch, 'block') for ch in chs])
+        if len(closed_chs) > 0:
+            with self._lock:
+                for ch in closed_chs:
+                    self._index.remove_ch(ch)
 
 
 class mix:
@@ -831,6 +1957,10 @@ class mix:
     :meth:`solo_mode` (defaults to ``'mute'`` if :meth:`solo_mode` hasn't been
     invoked).
 
+    Source channels are served in the order their values become available.
+    The cost of moving a value does not depend on the number of source
+    channels.
+
     Args:
         ch: A channel to put values onto.
 
@@ -839,11 +1969,17 @@ class mix:
     """
     def __init__(self, ch):
         self._lock = _threading.Lock()
+        self._loop = get_loop()
         self._to_ch = ch
-        self._state_ch = chan(sliding_buffer(1))
         self._state_map = {}  # ch->state
+        self._modes = {}  # ch->'live', 'mute', or 'pause'
+        self._solo_count = 0
         self._solo_mode = 'mute'
-        go(self._proc())
+        self._fan_in = _FanIn(self._loop, ch,
+                              is_muted=self._is_muted,
+                              is_active=self._is_active,
+                              on_exhausted=self._on_exhausted,
+                              stop_on_close=True)
 
     def toggle(self, state_map):
         """Merges `state_map` with the current state of the mix.
@@ -872,12 +2008,15 @@ class mix:
                                  f'{state}')
 
         with self._lock:
+            prev_solo_count = self._solo_count
             for ch, new_state in state_map.items():
                 original_state = self._state_map.get(ch, {'solo': False,
                                                           'pause': False,
                                                           'mute': False})
-                self._state_map[ch] = {**original_state, **new_state}
-            self._sync_state()
+                state = self._state_map[ch] = {**original_state, **new_state}
+                self._solo_count += state['solo'] - original_state['solo']
+            changed_chs = self._update_modes(state_map, prev_solo_count)
+        self._sync(changed_chs)
 
     def admix(self, ch):
         """Adds `ch` as a source channel of the mix."""
@@ -886,14 +2025,18 @@ class mix:
     def unmix(self, ch):
         """Removes `ch` from the set of source channels."""
         with self._lock:
-            self._state_map.pop(ch, None)
-            self._sync_state()
+            changed_chs = self._remove(ch)
+        self._sync(changed_chs)
 
     def unmix_all(self):
         """Removes all source channels from the mix."""
         with self._lock:
+            prev_solo_count = self._solo_count
+            chs = tuple(self._state_map)
             self._state_map.clear()
-            self._sync_state()
+            self._solo_count = 0
+            changed_chs = self._update_modes(chs, prev_solo_count)
+        self._sync(changed_chs)
 
     def solo_mode(self, mode):
         """Sets the `mode` for non-soloed source channels.
@@ -911,48 +2054,68 @@ class mix:
 
         with self._lock:
             self._solo_mode = mode
-            self._sync_state()
-
-    def _sync_state(self):
-        """Syncs state_map contents with _proc."""
-        soloed_chs, muted_chs, live_chs = set(), set(), set()
-
-        for ch, state in self._state_map.items():
-            if state['solo']:
-                soloed_chs.add(ch)
+            changed_chs = (self._update_modes(self._state_map, 0)
+                           if self._solo_count > 0
+                           else [])
+        self._sync(changed_chs)
+
+    def _remove(self, ch):
+        state = self._state_map.pop(ch, None)
+        if state is None:
+            return []
+        prev_solo_count = self._solo_count
+        self._solo_count -= state['solo']
+        return self._update_modes([ch], prev_solo_count)
+
+    def _update_modes(self, chs, prev_solo_count):
+        """Recomputes the modes of `chs` and returns the affected channels.
+
+        Every source channel is affected if soloing started or stopped.
+        """
+        if (prev_solo_count > 0) != (self._solo_count > 0):
+            chs = set(chs).union(self._state_map)
+
+        changed_chs = []
+        for ch in chs:
+            state = self._state_map.get(ch, None)
+            if state is None:
+                self._modes.pop(ch, None)
+            elif self._solo_count > 0:
+                self._modes[ch] = 'live' if state['solo'] else self._solo_mode
             elif state['pause']:
-                continue
+                self._modes[ch] = 'pause'
             elif state['mute']:
-                muted_chs.add(ch)
+                self._modes[ch] = 'mute'
             else:
-                live_chs.add(ch)
+                self._modes[ch] = 'live'
+            changed_chs.append(ch)
+        return changed_chs
 
-        if len(soloed_chs) == 0:
-            self._state_ch.b_put({'live_chs': live_chs,
-                                  'muted_chs': muted_chs})
-        elif self._solo_mode == 'pause':
-            self._state_ch.b_put({'live_chs': soloed_chs, 'muted_chs': set()})
-        elif self._solo_mode == 'mute':
-            self._state_ch.b_put({'live_chs': soloed_chs,
-                                  'muted_chs': muted_chs.union(live_chs)})
+    def _sync(self, chs):
+        """Starts or stops consuming from `chs` based on their modes.
 
-    async def _proc(self):
-        live_chs, muted_chs = set(), set()
-        while True:
-            data_chs = list(live_chs.union(muted_chs))
-            _random.shuffle(data_chs)
-            val, ch = await alt(self._state_ch, *data_chs, priority=True)
-            if ch is self._state_ch:
-                live_chs, muted_chs = val['live_chs'], val['muted_chs']
-            elif val is None:
-                with self._lock:
-                    self._state_map.pop(ch, None)
-                live_chs.discard(ch)
-                muted_chs.discard(ch)
-            elif ch in muted_chs:
-                pass
-            elif not await self._to_ch.put(val):
-                break
+        Must be called without holding the lock since it may acquire the
+        locks of the source channels.
+        """
+        if not _in_loop(self._loop):
+            _call_soon_threadsafe(self._loop, self._sync, chs)
+            return
+        for ch in chs:
+            if self._is_active(ch):
+                self._fan_in.add(ch)
+            else:
+                self._fan_in.remove(ch)
+
+    def _is_active(self, ch):
+        return self._modes.get(ch, 'pause') != 'pause'
+
+    def _is_muted(self, ch):
+        return self._modes.get(ch, None) == 'mute'
+
+    def _on_exhausted(self, ch):
+        with self._lock:
+            changed_chs = self._remove(ch)
+        self._sync(changed_chs)
 
 
 def split(pred, ch, true_buf=None, false_buf=None):
@@ -983,5 +2146,91 @@ def split(pred, ch, true_buf=None, false_buf=None):
         true_ch.close()
         false_ch.close()
 
-    go(proc())
+    _go(proc())
     return true_ch, false_ch
+
+
+def route(key_fn, ch, n_or_keys, buf_fn=None, *, batch_size=1):
+    """Routes each value of a channel to one of several channels by its key.
+
+    If `n_or_keys` is an int, values are hash partitioned across a list of that
+    many channels, where a value with key ``k`` is put onto the channel at index
+    ``hash(k) % n``. Values with equal keys will therefore always be routed to
+    the same channel. Otherwise, `n_or_keys` must be an iterable of keys and a
+    dict of key->channel is returned. Values whose key is not one of the given
+    keys will be discarded.
+
+    Values are put onto their channel in the order they were taken from `ch`.
+    No value will be taken from `ch` until the previous values have been
+    accepted by their channels. If all of the returned channels close, `ch`
+    will no longer be consumed. The returned channels will close once `ch` is
+    exhausted.
+
+    Args:
+        key_fn: A function accepting a value from `ch` and returning its key.
+        ch: A channel to get values from.
+        n_or_keys: A positive int or an iterable of hashable keys.
+        buf_fn: An optional function accepting the index (or key) of a
+            returned channel and returning the buffer that channel should use.
+            See :class:`chan`.
+        batch_size: An optional positive int specifying the maximum number of
+            values to take from `ch` at once. Values after the first are only
+            taken if they are available immediately.
+
+    Returns:
+        A list of `n_or_keys` channels if it's an int else a dict of
+        key->channel.
+    """
+    if batch_size < 1 or batch_size != int(batch_size):
+        raise ValueError('batch_size must be a positive int')
+    buf_fn = (lambda _: None) if buf_fn is None else buf_fn
+
+    if isinstance(n_or_keys, int):
+        if n_or_keys < 1:
+            raise ValueError('n_or_keys must be a positive int or an iterable')
+        n = n_or_keys
+        outputs = [chan(buf_fn(i)) for i in range(n)]
+        to_chs = outputs
+
+        def select(key):
+            return outputs[hash(key) % n]
+    else:
+        outputs = {key: chan(buf_fn(key)) for key in n_or_keys}
+        to_chs = list(outputs.values())
+        select = outputs.get
+
+    async def proc():
+        open_chs = set(to_chs)
+
+        async for x in ch:
+            if batch_size == 1:
+                to_ch = select(key_fn(x))
+                if to_ch not in open_chs:
+                    continue
+                is_put = _try_put(to_ch, x)
+                if is_put is None:
+                    is_put = await to_ch.put(x)
+                if not is_put:
+                    open_chs.remove(to_ch)
+            else:
+                xs = [x]
+                while len(xs) < batch_size:
+                    x = _try_get(ch)
+                    if x is None:
+                        break
+                    xs.append(x)
+                batches = {}  # to_ch->values
+                for x in xs:
+                    to_ch = select(key_fn(x))
+                    if to_ch in open_chs:
+                        batches.setdefault(to_ch, []).append(x)
+                open_chs.difference_update(await _put_batches(batches))
+
+            if len(open_chs) == 0:
+                break
+
+        for to_ch in to_chs:
+            to_ch.close()
+
+    _go(proc())
+    return outputs
@@ -0,0 +1,390 @@
+# Copyright 2019 Jake Magers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Channels over TCP and Unix domain sockets.
+
+:func:`serve_chan` exposes a channel on a socket address and
+:func:`remote_chan` connects to it, returning a local channel that is bridged
+to the remote one. A remote channel is either used to get values from the
+served channel (``mode='get'``) or to put values onto it (``mode='put'``).
+
+Values are sent in batches of length-prefixed frames. Flow control is based
+on credits: a sender may only have as many values in flight as the receiver
+has granted it, and the receiver grants more only after it has put the
+values it received onto its channel. Backpressure from a slow consumer is
+therefore carried across the connection instead of values piling up in
+socket buffers.
+
+An address is either a ``(host, port)`` tuple for TCP or a str path for a Unix
+domain socket.
+
+Frames larger than 64 MiB are refused by the receiver, which ends the
+connection, so a single serialized value must be smaller than that. Batches
+of values are split across frames as needed.
+"""
+
+import asyncio as _asyncio
+import pickle as _pickle
+import struct as _struct
+from . import core as _core
+from ._channel import chan as _chan
+
+# Frame header: length of payload, frame type
+_FRAME = _struct.Struct('!IB')
+_HELLO, _DATA, _CREDIT, _CLOSE = range(4)
+_MAX_FRAME_SIZE = 1 << 26
+# HELLO payload: mode, initial credit
+_HELLO_BODY = _struct.Struct('!BI')
+# Value header within a DATA frame: length of value, tag
+_VALUE = _struct.Struct('!IB')
+_PICKLED, _BYTES = 0, 1
+_COUNT = _struct.Struct('!I')
+_MODES = {'get': 0, 'put': 1}
+
+
+# The event loop only keeps weak references to tasks
+_running_tasks = set()
+
+
+def _spawn(coro):
+    task = _core.get_loop().create_task(coro)
+    _running_tasks.add(task)
+    task.add_done_callback(_running_tasks.discard)
+
+
+def _encode_values(vals, serializer):
+    """Returns DATA frames for `vals`, split to fit within _MAX_FRAME_SIZE."""
+    frames = []
+    parts = []
+    size = 0
+
+    def flush():
+        payload = b''.join(parts)
+        frames.append(_FRAME.pack(len(payload), _DATA) + payload)
+        parts.clear()
+
+    for val in vals:
+        if type(val) is bytes:
+            tag, data = _BYTES, val
+        else:
+            tag, data = _PICKLED, serializer.dumps(val)
+        n = _VALUE.size + len(data)
+        if len(parts) > 0 and size + n > _MAX_FRAME_SIZE:
+            flush()
+            size = 0
+        parts.append(_VALUE.pack(len(data), tag))
+        parts.append(data)
+        size += n
+    flush()
+    return b''.join(frames)
+
+
+def _decode_values(payload, serializer):
+    """Returns the values of a DATA frame or None if it's malformed."""
+    vals = []
+    offset = 0
+    while offset < len(payload):
+        if offset + _VALUE.size > len(payload):
+            return None
+        n, tag = _VALUE.unpack_from(payload, offset)
+        offset += _VALUE.size
+        if offset + n > len(payload) or tag not in (_PICKLED, _BYTES):
+            return None
+        data = payload[offset:offset + n]
+        offset += n
+        vals.append(data if tag == _BYTES else serializer.loads(data))
+    return vals
+
+
+def _encode_count(frame_type, n):
+    return _FRAME.pack(_COUNT.size, frame_type) + _COUNT.pack(n)
+
+
+async def _read_frame(reader):
+    """Returns ``(frame_type, payload)`` or None if the connection ended.
+
+    A frame larger than _MAX_FRAME_SIZE is treated as the connection ending.
+    """
+    try:
+        header = await reader.readexactly(_FRAME.size)
+        n, frame_type = _FRAME.unpack(header)
+        if n > _MAX_FRAME_SIZE:
+            return None
+        payload = await reader.readexactly(n)
+    except (_asyncio.IncompleteReadError, ConnectionError):
+        return None
+    return frame_type, payload
+
+
+async def _open_connection(addr):
+    if isinstance(addr, str):
+        return await _asyncio.open_unix_connection(addr)
+    host, port = addr
+    return await _asyncio.open_connection(host, port)
+
+
+async def _start_server(client_connected_cb, addr):
+    if isinstance(addr, str):
+        return await _asyncio.start_unix_server(client_connected_cb, addr)
+    host, port = addr
+    return await _asyncio.start_server(client_connected_cb, host, port)
+
+
+class _Credits:
+    """The number of values a sender is allowed to send."""
+
+    def __init__(self, n):
+        self._n = n
+        self._is_available = _asyncio.Event()
+        if n > 0:
+            self._is_available.set()
+
+    def add(self, n):
+        self._n += n
+        self._is_available.set()
+
+    def take(self, n):
+        self._n -= n
+        if self._n == 0:
+            self._is_available.clear()
+
+    async def wait(self):
+        """Waits for and returns the number of available credits."""
+        await self._is_available.wait()
+        return self._n
+
+
+async def _send_values(from_ch, writer, credits, batch_size, serializer):
+    """Sends values from `from_ch`, as credits allow, until it's exhausted.
+
+    Returns:
+        True once `from_ch` is exhausted.
+    """
+    while True:
+        n = await credits.wait()
+        val = await from_ch.get()
+        if val is None:
+            return True
+        batch = [val]
+        while len(batch) < min(n, batch_size):
+            val = _core._try_get(from_ch)
+            if val is None:
+                break
+            batch.append(val)
+        credits.take(len(batch))
+        writer.write(_encode_values(batch, serializer))
+        await writer.drain()
+
+
+async def _receive_credits(reader, credits):
+    """Adds granted credits until a CLOSE frame or the connection ends.
+
+    Returns:
+        True if a CLOSE frame was received.
+    """
+    while True:
+        frame = await _read_frame(reader)
+        if frame is None:
+            return False
+        frame_type, payload = frame
+        if frame_type == _CLOSE:
+            return True
+        if frame_type == _CREDIT:
+            if len(payload) != _COUNT.size:
+                return False
+            credits.add(_COUNT.unpack(payload)[0])
+
+
+async def _receive_values(reader, writer, to_ch, serializer):
+    """Puts received values onto `to_ch`, granting a credit for each.
+
+    Returns:
+        True if a CLOSE frame was received, False if `to_ch` closed, or None if
+        the connection ended.
+    """
+    while True:
+        frame = await _read_frame(reader)
+        if frame is None:
+            return None
+        frame_type, payload = frame
+        if frame_type == _CLOSE:
+            return True
+        if frame_type != _DATA:
+            continue
+        vals = _decode_values(payload, serializer)
+        if vals is None:
+            return None
+        for val in vals:
+            is_put = _core._try_put(to_ch, val)
+            if is_put is None:
+                is_put = await to_ch.put(val)
+            if not is_put:
+                return False
+        writer.write(_encode_count(_CREDIT, len(vals)))
+        await writer.drain()
+
+
+async def _close_writer(writer, send_close):
+    try:
+        if send_close:
+            writer.write(_FRAME.pack(0, _CLOSE))
+        writer.close()
+        await writer.wait_closed()
+    except ConnectionError:
+        pass
+
+
+async def _send_until_done(from_ch, reader, writer, credits, batch_size,
+                           serializer):
+    """Sends values from `from_ch` until it's exhausted or the peer is done.
+
+    Returns:
+        True if `from_ch` was exhausted or False if the peer closed.
+    """
+    send_task = _asyncio.ensure_future(
+        _send_values(from_ch, writer, credits, batch_size, serializer))
+    receive_task = _asyncio.ensure_future(_receive_credits(reader, credits))
+    try:
+        await _asyncio.wait([send_task, receive_task],
+                            return_when=_asyncio.FIRST_COMPLETED)
+    finally:
+        receive_task.cancel()
+        if not send_task.done():
+            send_task.cancel()
+            return False
+    return send_task.result()
+
+
+async def serve_chan(ch, addr, *, window=64, batch_size=64,
+                     serializer=_pickle):
+    """Exposes a channel on a socket address.
+
+    Any number of :func:`remote_chan` clients can connect to the server. Those
+    with ``mode='get'`` will receive values taken from `ch` and those with
+    ``mode='put'`` will put values onto `ch`. Once `ch` is exhausted or closed,
+    connected clients will be notified and their local channels closed. `ch`
+    is never closed by the server.
+
+    Args:
+        ch: A channel to expose.
+        addr: A ``(host, port)`` tuple for TCP or a str path for a Unix
+            domain socket.
+        window: An optional positive int specifying the maximum number of
+            values a ``'put'`` client may send before they've been put onto
+            `ch`.
+        batch_size: An optional positive int specifying the maximum number of
+            values to send to a ``'get'`` client in a single frame.
+        serializer: An optional object with ``dumps(obj) -> bytes`` and
+            ``loads(bytes) -> obj`` functions. :class:`bytes` values are sent
+            without serialization. Defaults to :mod:`pickle`.
+
+    Returns:
+        An :class:`asyncio.Server`.
+
+    Note:
+        A value taken from `ch` for a client whose connection is lost will be
+        discarded.
+    """
+    if window < 1 or batch_size < 1:
+        raise ValueError('window and batch_size must be positive ints')
+
+    async def serve_client(reader, writer):
+        frame = await _read_frame(reader)
+        if (frame is None or frame[0] != _HELLO or
+                len(frame[1]) != _HELLO_BODY.size):
+            writer.close()
+            return
+        mode, credit = _HELLO_BODY.unpack(frame[1])
+        if mode not in _MODES.values():
+            writer.close()
+            return
+
+        if mode == _MODES['get']:
+            is_exhausted = await _send_until_done(ch, reader, writer,
+                                                  _Credits(credit),
+                                                  batch_size, serializer)
+            await _close_writer(writer, is_exhausted)
+        else:
+            writer.write(_encode_count(_CREDIT, window))
+            is_closed = await _receive_values(reader, writer, ch, serializer)
+            await _close_writer(writer, is_closed is False)
+
+    async def on_connect(reader, writer):
+        try:
+            await serve_client(reader, writer)
+        except _asyncio.CancelledError:
+            # The event loop is shutting down
+            writer.close()
+
+    return await _start_server(on_connect, addr)
+
+
+async def remote_chan(addr, mode='get', buf_or_n=64, *, batch_size=64,
+                      serializer=_pickle):
+    """Connects to a channel exposed with :func:`serve_chan`.
+
+    If ``mode='get'``, the returned channel will receive the values taken from
+    the remote channel and will close once the remote channel is exhausted or
+    the connection ends. Closing it ends the connection once the next value
+    arrives. The server will never have more values in flight than the size of
+    the buffer of the returned channel.
+
+    If ``mode='put'``, values put onto the returned channel will be put onto
+    the remote channel. Closing the returned channel ends the connection once
+    its values have been sent. The returned channel will close if the remote
+    channel closes or the connection ends.
+
+    Args:
+        addr: A ``(host, port)`` tuple for TCP or a str path for a Unix
+            domain socket.
+        mode: Either ``'get'`` or ``'put'``.
+        buf_or_n: An optional buffer to use with the returned channel. Can
+            also be represented as a positive number. See :class:`chan`. If
+            ``mode='get'``, then it must be a positive int.
+        batch_size: An optional positive int specifying the maximum number of
+            values to send in a single frame when ``mode='put'``.
+        serializer: An optional object with ``dumps(obj) -> bytes`` and
+            ``loads(bytes) -> obj`` functions. :class:`bytes` values are sent
+            without serialization. Defaults to :mod:`pickle`.
+
+    Returns:
+        A channel bridged to the remote channel.
+    """
+    if mode not in _MODES:
+        raise ValueError(f'mode must be either "get" or "put": {mode}')
+    if mode == 'get' and (not isinstance(buf_or_n, int) or buf_or_n < 1):
+        raise ValueError('buf_or_n must be a positive int if mode is "get"')
+    if batch_size < 1:
+        raise ValueError('batch_size must be a positive int')
+
+    ch = _chan(buf_or_n)
+    reader, writer = await _open_connection(addr)
+    credit = buf_or_n if mode == 'get' else 0
+    writer.write(_FRAME.pack(_HELLO_BODY.size, _HELLO) +
+                 _HELLO_BODY.pack(_MODES[mode], credit))
+
+    async def get_proc():
+        is_closed = await _receive_values(reader, writer, ch, serializer)
+        ch.close()
+        await _close_writer(writer, is_closed is False)
+
+    async def put_proc():
+        is_exhausted = await _send_until_done(ch, reader, writer,
+                                              _Credits(0), batch_size,
+                                              serializer)
+        ch.close()
+        await _close_writer(writer, is_exhausted)
+
+    _spawn(get_proc() if mode == 'get' else put_proc())
+    return ch
@@ -26,14 +26,46 @@ Creating transducers:
     are simply functions that accept a reducing function as input and return a
     new reducing function as output.
 
+Chunked execution:
+    :func:`itransduce`, :func:`into`, and :func:`xiter` accept a `chunksize`
+    argument. When provided, the input is read in chunks and the leading
+    stateless transformations of the transducer, such as
+    :func:`~chanpy.transducers.map`, :func:`filter`, :func:`remove`,
+    :func:`keep`, :func:`take_while`, and :func:`replace`, are applied to each
+    chunk as a whole in a single loop. The remaining transformations then
+    process the values one at a time. The results are the same as without
+    `chunksize` although the stateless transformations may be applied to up
+    to `chunksize` - 1 more values than necessary before a later
+    transformation terminates the reduction early. Sequences and arrays are
+    sliced rather than copied into lists.
+
+    The vectorized transducers, :func:`vmap`, :func:`vfilter`, :func:`vtake`,
+    :func:`vdrop`, :func:`vpartition`, and :func:`vreductions`, require NumPy.
+    They transform each chunk as a NumPy array and produce the same results
+    as their scalar counterparts, provided the values fit in the dtype of the
+    array. Without `chunksize`, including when used with a channel, they
+    transform one value at a time.
+
 See `clojure.org <https://clojure.org/reference/transducers>`_ for more
 information about transducers.
 """
 
 import functools as _functools
 import itertools as _itertools
+import operator as _operator
+import queue as _queue
 import random as _random
+import threading as _threading
+from array import array as _array
 from collections import deque as _deque
+from collections.abc import Sequence as _Sequence
+
+try:
+    import numpy as _np
+    from numpy.lib.stride_tricks import (
+        sliding_window_view as _sliding_window_view)
+except ImportError:
+    _np = None
 
 
 class _Undefined:
@@ -51,10 +83,149 @@ def comp(*xforms):
     The returned transducer passes values through the given transformations
     from left to right.
 
+    Consecutive stateless transducers, such as those returned by
+    :func:`~chanpy.transducers.map`, :func:`filter`, :func:`remove`,
+    :func:`keep`, :func:`take_while`, and :func:`replace`, are fused into a
+    single step function rather than being nested.
+
     Args:
         xforms: Transducers.
     """
-    return _functools.reduce(lambda f, g: lambda x: f(g(x)), xforms, identity)
+    fused = []
+    for xform in _flatten_xforms(xforms):
+        if (type(xform) is _Stateless and len(fused) > 0 and
+                type(fused[-1]) is _Stateless):
+            fused[-1] = _Stateless(fused[-1]._stages + xform._stages)
+        else:
+            fused.append(xform)
+    if len(fused) == 0:
+        return identity
+    if len(fused) == 1:
+        return fused[0]
+    return _Composition(tuple(fused))
+
+
+def _flatten_xforms(xforms):
+    for xform in xforms:
+        if type(xform) is _Composition:
+            yield from xform._xforms
+        elif xform is not identity:
+            yield xform
+
+
+class _Composition:
+    """A :any:`transducer` returned by :func:`comp`.
+
+    Args:
+        xforms: A tuple of at least 2 transducers ordered from left to right.
+    """
+    __slots__ = ('_xforms',)
+
+    def __init__(self, xforms):
+        self._xforms = xforms
+
+    def __call__(self, rf):
+        for xform in reversed(self._xforms):
+            rf = xform(rf)
+        return rf
+
+
+# The source of each kind of stateless stage within a fused function where
+# {skip} drops the current value and {stop} ends the reduction
+_STAGE_SOURCES = {
+    'map': ['val = {f}(val)'],
+    'filter': ['if not {f}(val):', '    {skip}'],
+    'remove': ['if {f}(val):', '    {skip}'],
+    'keep': ['val = {f}(val)', 'if val is None:', '    {skip}'],
+    'take_while': ['if not {f}(val):', '    {stop}'],
+    'replace': ['val = {f}.get(val, val)'],
+}
+
+_makers = {}  # (name, kinds)->function returning a fused function
+
+
+def _fused_maker(name, kinds):
+    """Returns a function that creates a fused function for `kinds`.
+
+    If `name` is ``'step'``, the fused function is a step function that passes
+    each output to `rf`. If `name` is ``'chunk'``, the fused function accepts
+    an iterable of inputs and a list, appends the outputs to the list, and
+    returns an ``(outputs, is_reduced)`` tuple.
+    """
+    try:
+        return _makers[name, kinds]
+    except KeyError:
+        pass
+    fs = [f'f{i}' for i in range(len(kinds))]
+    if name == 'step':
+        lines = ['def make(rf, reduced, {fs}):',
+                 '    def step(result, val):']
+        skip, stop = 'return result', 'return reduced(result)'
+        output = 'return rf(result, val)'
+        end = []
+    else:
+        lines = ['def make(rf, reduced, {fs}):',
+                 '    def chunk(vals, out):',
+                 '        append = out.append',
+                 '        for val in vals:']
+        skip, stop = 'continue', 'return out, True'
+        output = 'append(val)'
+        end = ['        return out, False']
+    lines[0] = lines[0].format(fs=', '.join(fs))
+    indent = ' ' * (len(lines[-1]) - len(lines[-1].lstrip()) + 4)
+    for kind, f in zip(kinds, fs):
+        lines.extend(indent + line.format(f=f, skip=skip, stop=stop)
+                     for line in _STAGE_SOURCES[kind])
+    lines.append(indent + output)
+    lines.extend(end)
+    lines.append(f'    return {name}')
+    namespace = {}
+    exec('\n'.join(lines), namespace)
+    maker = _makers[name, kinds] = namespace['make']
+    return maker
+
+
+class _Stateless:
+    """A :any:`transducer` made of stages that :func:`comp` can fuse.
+
+    Args:
+        stages: A tuple of ``(kind, f)`` pairs where `kind` is a key of
+            ``_STAGE_SOURCES``.
+    """
+    __slots__ = ('_stages',)
+
+    def __init__(self, stages):
+        self._stages = stages
+
+    def __call__(self, rf):
+        kinds = tuple(kind for kind, _ in self._stages)
+        fs = (f for _, f in self._stages)
+        step = _fused_maker('step', kinds)(_step_fn(rf), reduced, *fs)
+        xrf = multi_arity(rf, rf, step)
+        xrf._never_reduced = ('take_while' not in kinds and
+                              _never_reduced(rf))
+        return xrf
+
+    def _chunk_fn(self):
+        """Returns a function that transforms a whole chunk of inputs.
+
+        The returned function accepts an iterable of inputs and returns an
+        ``(outputs, is_reduced)`` tuple where `outputs` is a sequence and
+        `is_reduced` is True if no more input should be transformed.
+        """
+        extend = self._extend_fn()
+        return lambda vals: extend(vals, [])
+
+    def _extend_fn(self):
+        """Returns a function that appends transformed inputs to a list.
+
+        The returned function accepts an iterable of inputs and a list to
+        append the outputs to. It returns an ``(outputs, is_reduced)`` tuple
+        where `outputs` is the list.
+        """
+        kinds = tuple(kind for kind, _ in self._stages)
+        fs = (f for _, f in self._stages)
+        return _fused_maker('chunk', kinds)(None, reduced, *fs)
 
 
 def multi_arity(*funcs):
@@ -65,20 +236,69 @@ def multi_arity(*funcs):
     arguments it will dispatch to the first function in `funcs`, if called with
     one argument it will dispatch to the second function in `funcs`, etc.
 
+    The first three functions are also available as the ``init``,
+    ``complete``, and ``step`` attributes of the returned function, which
+    allows it to be used as a :any:`reducing function` whose arities are
+    called directly.
+
     Args:
         funcs: Functions to dispatch to. Each function represents a different
             arity for the returned function. None values may be used to
             represent arities that don't exist.
     """
-    def dispatch(*args):
+    return _MultiArity(funcs)
+
+
+class _MultiArity:
+    """See :func:`multi_arity`."""
+    __slots__ = ('_funcs', 'init', 'complete', 'step', '_never_reduced')
+
+    def __init__(self, funcs):
+        self._funcs = funcs
+        self.init, self.complete, self.step = (tuple(funcs) + (None,) * 3)[:3]
+        self._never_reduced = False
+
+    def __call__(self, *args):
         try:
-            func = funcs[len(args)]
+            func = self._funcs[len(args)]
             if func is None:
                 raise IndexError
         except IndexError:
             raise TypeError(f'wrong number of arguments, got {len(args)}')
         return func(*args)
-    return dispatch
+
+
+def _step_fn(rf):
+    """Returns the function to call for the step arity of `rf`."""
+    step = getattr(rf, 'step', None)
+    return rf if step is None else step
+
+
+def _complete_fn(rf):
+    """Returns the function to call for the completion arity of `rf`."""
+    complete = getattr(rf, 'complete', None)
+    return rf if complete is None else complete
+
+
+# Builtin reducing functions that never return a reduced value
+_NEVER_REDUCED_RFS = (_operator.add, _operator.mul, _operator.and_,
+                      _operator.or_, _operator.xor, max, min)
+
+
+def _never_reduced(rf):
+    """Returns True if `rf` is known to never return a reduced value."""
+    return (getattr(rf, '_never_reduced', False) or
+            any(rf is f for f in _NEVER_REDUCED_RFS))
+
+
+def _forwarding_rf(rf, complete, step):
+    """Returns ``multi_arity(rf, complete, step)`` for a transducer.
+
+    `step` must only return reduced values that were returned by `rf`.
+    """
+    xrf = multi_arity(rf, complete, step)
+    xrf._never_reduced = _never_reduced(rf)
+    return xrf
 
 
 class reduced:
@@ -128,13 +348,21 @@ def completing(rf, cf=identity):
         if len(args) == 1:
             return cf(*args)
         return rf(*args)
+
+    wrapper.init = rf
+    wrapper.complete = cf
+    wrapper.step = _step_fn(rf)
+    wrapper._never_reduced = _never_reduced(rf)
     return wrapper
 
 
 def _ireduce(rf, init, coll):
+    step = _step_fn(rf)
+    if _never_reduced(rf):
+        return _functools.reduce(step, coll, init)
     result = init
     for x in coll:
-        result = rf(result, x)
+        result = step(result, x)
         if is_reduced(result):
             return unreduced(result)
     return result
@@ -169,12 +397,115 @@ def ireduce(rf, init, coll=_Undefined):
     return _ireduce(rf, init, coll)
 
 
-def _itransduce(xform, rf, init, coll):
+def _check_chunksize(chunksize):
+    if chunksize is not None and (chunksize != int(chunksize) or
+                                  chunksize < 1):
+        raise ValueError('chunksize must be a positive int')
+
+
+def _is_sliceable(coll):
+    """Returns True if `coll` is a sequence or an array."""
+    return isinstance(coll, (_Sequence, _array)) or hasattr(coll, '__array__')
+
+
+def _chunks(coll, chunksize):
+    """Returns an iterator over consecutive chunks of `coll`.
+
+    Sequences and arrays are sliced so that each chunk has the same type as
+    `coll`. Any other iterable is split into lists.
+    """
+    if _is_sliceable(coll):
+        return (coll[i:i + chunksize] for i in range(0, len(coll), chunksize))
+    it = iter(coll)
+    return iter(lambda: list(_itertools.islice(it, chunksize)), [])
+
+
+def _split_chunked(xform):
+    """Splits `xform` into chunk functions and a per-element transducer.
+
+    Returns:
+        A ``(chunk_fns, xform)`` tuple where `chunk_fns` is a list of
+        ``(chunk_fn, is_vectorized)`` pairs that transform the leading stages
+        of `xform` a chunk at a time and `xform` is the remainder of it.
+    """
+    xforms = xform._xforms if type(xform) is _Composition else (xform,)
+    chunk_fns = []
+    for x in xforms:
+        chunk_fn = getattr(x, '_chunk_fn', None)
+        if chunk_fn is None:
+            break
+        chunk_fns.append((chunk_fn(), type(x) is _Vectorized))
+    return chunk_fns, comp(*xforms[len(chunk_fns):])
+
+
+def _transformed_chunks(chunk_fns, coll, chunksize):
+    """Yields the chunks of `coll` after transforming them with `chunk_fns`.
+
+    A final empty chunk is passed through `chunk_fns` once `coll` is exhausted
+    so that stages may output values at the end of input.
+    """
+    for chunk in _itertools.chain(_chunks(coll, chunksize), [[]]):
+        is_done = False
+        for chunk_fn, is_vectorized in chunk_fns:
+            if not is_vectorized:
+                chunk = _from_array(chunk)
+            chunk, is_stage_done = chunk_fn(chunk)
+            is_done = is_done or is_stage_done
+        yield _from_array(chunk)
+        if is_done:
+            return
+
+
+def _ireduce_chunks(rf, init, chunks):
+    step = _step_fn(rf)
+    if _never_reduced(rf):
+        result = init
+        for chunk in chunks:
+            result = _functools.reduce(step, chunk, result)
+        return result
+    result = init
+    for chunk in chunks:
+        for x in chunk:
+            result = step(result, x)
+            if is_reduced(result):
+                return unreduced(result)
+    return result
+
+
+def _itransduce_steps(xform, rf, init, coll, chunksize=None):
+    """Returns ``(xrf, result)`` without calling the completion arity."""
+    if chunksize is None:
+        xrf = xform(rf)
+        return xrf, _ireduce(xrf, init, coll)
+    chunk_fns, xform = _split_chunked(xform)
     xrf = xform(rf)
-    return xrf(ireduce(xrf, init, coll))
+    chunks = _transformed_chunks(chunk_fns, coll, chunksize)
+    return xrf, _ireduce_chunks(xrf, init, chunks)
+
+
+def _itransduce(xform, rf, init, coll, chunksize=None):
+    xrf, result = _itransduce_steps(xform, rf, init, coll, chunksize)
+    return _complete_fn(xrf)(result)
+
 
+def _is_foldable(xform):
+    """Returns True if `xform` can transform parts of a collection independently.
 
-def itransduce(xform, rf, init, coll=_Undefined):
+    Only transducers without state across values and without early
+    termination are foldable.
+    """
+    if xform is identity:
+        return True
+    if type(xform) is _Composition:
+        return all(_is_foldable(x) for x in xform._xforms)
+    if type(xform) is _Stateless:
+        return all(kind != 'take_while' for kind, _ in xform._stages)
+    if type(xform) is _Vectorized:
+        return _is_foldable(xform._xform)
+    return False
+
+
+def itransduce(xform, rf, init, coll=_Undefined, *, chunksize=None):
     """
     itransduce(xform, rf, init, coll) -> reduction result
     *itransduce(xform, rf, coll) -> reduction result*
@@ -193,13 +524,18 @@ def itransduce(xform, rf, init, coll=_Undefined):
             as `init` when called with 0 arguments.
         init: An optional initial value.
         coll: An iterable.
+        chunksize: An optional positive int. If provided, `coll` will be
+            transformed in chunks of up to `chunksize` values. See
+            :any:`transducers` for more information about chunked
+            execution.
 
     See Also:
         :func:`ireduce`
     """
+    _check_chunksize(chunksize)
     if coll is _Undefined:
-        return _itransduce(xform, rf, rf(), init)
-    return _itransduce(xform, rf, init, coll)
+        return _itransduce(xform, rf, rf(), init, chunksize)
+    return _itransduce(xform, rf, init, coll, chunksize)
 
 
 def append(appendable=_Undefined, val=_Undefined):
@@ -218,15 +554,34 @@ def append(appendable=_Undefined, val=_Undefined):
     return appendable
 
 
-def into(appendable, xform, coll):
+def _append_step(appendable, val):
+    appendable.append(val)
+    return appendable
+
+
+append.init = list
+append.complete = identity
+append.step = _append_step
+append._never_reduced = True
+
+
+def into(appendable, xform, coll, *, chunksize=None):
     """Transfers all values from `coll` into `appendable` with a transformation.
 
-    Same as :func:`itransduce(xform, append, appendable, coll) <itransduce>`.
+    Same as :func:`itransduce(xform, append, appendable, coll,
+    chunksize=chunksize) <itransduce>`.
     """
-    return itransduce(xform, append, appendable, coll)
+    if type(appendable) is list and chunksize is None:
+        # Build the list directly when there's no per-element state
+        if xform is identity:
+            appendable.extend(coll)
+            return appendable
+        if type(xform) is _Stateless:
+            return xform._extend_fn()(coll, appendable)[0]
+    return itransduce(xform, append, appendable, coll, chunksize=chunksize)
 
 
-def xiter(xform, coll):
+def xiter(xform, coll, *, chunksize=None, prefetch=None):
     """Returns an iterator over the transformed elements in `coll`.
 
     Useful for when you want to transform an iterable into another iterable
@@ -235,7 +590,89 @@ def xiter(xform, coll):
     Args:
         xform: A :any:`transducer`.
         coll: A potentially infinite iterable.
+        chunksize: An optional positive int. If provided, `coll` will be
+            transformed in chunks of up to `chunksize` values, meaning values
+            will be read from `coll` up to `chunksize` values ahead of the
+            iterator. See :any:`transducers` for more information about
+            chunked execution.
+        prefetch: An optional positive int. If provided, `coll` will be read
+            by a background thread up to `prefetch` values ahead of the
+            transformation so that slow reads, such as file or network I/O,
+            overlap with `xform`. Exceptions raised by `coll` are raised by
+            the returned iterator. The thread stops once the returned
+            iterator is exhausted or closed, after finishing any read in
+            progress. Since every value is handed from one thread to
+            another, this only pays off when reading from `coll` is slow.
     """
+    _check_chunksize(chunksize)
+    if prefetch is not None:
+        if not isinstance(prefetch, int) or prefetch < 1:
+            raise ValueError('prefetch must be a positive int')
+        return _prefetching_xiter(xform, coll, chunksize, prefetch)
+    if chunksize is not None:
+        chunk_fns, xform = _split_chunked(xform)
+        coll = _itertools.chain.from_iterable(
+            _transformed_chunks(chunk_fns, coll, chunksize))
+    return _xiter(xform, coll)
+
+
+def _prefetching_xiter(xform, coll, chunksize, prefetch):
+    vals = _prefetched(coll, prefetch)
+    try:
+        yield from xiter(xform, vals, chunksize=chunksize)
+    finally:
+        vals.close()
+
+
+class _PrefetchEnd:
+    """Marks the end of a prefetched iterable."""
+
+    def __init__(self, ex=None):
+        self.ex = ex
+
+
+def _prefetched(coll, n):
+    """Yields the values of `coll` as read by a background thread.
+
+    The thread reads at most `n` values ahead. Closing the generator stops the
+    thread once any read in progress completes.
+    """
+    vals = _queue.Queue(n)
+    is_stopped = _threading.Event()
+
+    def read():
+        # At most one put can happen after is_stopped is set
+        try:
+            for val in coll:
+                if is_stopped.is_set():
+                    return
+                vals.put(val)
+            end = _PrefetchEnd()
+        except BaseException as ex:
+            end = _PrefetchEnd(ex)
+        if not is_stopped.is_set():
+            vals.put(end)
+
+    _threading.Thread(target=read, daemon=True).start()
+    try:
+        while True:
+            val = vals.get()
+            if type(val) is _PrefetchEnd:
+                if val.ex is not None:
+                    raise val.ex
+                return
+            yield val
+    finally:
+        is_stopped.set()
+        # Unblock a pending put so the thread can observe is_stopped
+        try:
+            while True:
+                vals.get_nowait()
+        except _queue.Empty:
+            pass
+
+
+def _xiter(xform, coll):
     buffer = _deque()
 
     def flush_buffer(buf):
@@ -244,8 +681,9 @@ def xiter(xform, coll):
             yield buf.popleft()
 
     xrf = xform(append)
+    step = _step_fn(xrf)
     for x in coll:
-        ret = xrf(buffer, x)
+        ret = step(buffer, x)
         yield from flush_buffer(unreduced(ret))
         if is_reduced(ret):
             break
@@ -253,6 +691,77 @@ def xiter(xform, coll):
     yield from flush_buffer(xrf(buffer))
 
 
+def _nop(_):
+    pass
+
+
+async def _avalues(aiterable, batch_size):
+    """Yields the values of an async iterable.
+
+    After each value that was waited for, up to `batch_size` - 1 values that
+    are immediately available from a channel are taken without waiting. Each
+    value is only taken once the previous one has been consumed.
+    """
+    if hasattr(aiterable, '_p_get'):
+        from . import _channel  # Imported here since it depends on this module
+        handler = _channel.FnHandler(_nop, False)
+        while True:
+            val = await aiterable.get()
+            if val is None:
+                return
+            yield val
+            for _ in range(batch_size - 1):
+                val = aiterable._p_get(handler)[0]
+                if val is None:
+                    break
+                yield val
+    else:
+        async for val in aiterable:
+            yield val
+
+
+async def axiter(xform, aiterable, *, batch_size=64):
+    """Returns an async iterator over the transformed elements in `aiterable`.
+
+    The asynchronous counterpart of :func:`xiter`. Useful for transforming
+    channels, async generators, or any other async iterable in a lazy fashion
+    without piping them through a channel with an xform.
+
+    If `aiterable` is a channel, then each time a value has been waited for,
+    up to `batch_size` - 1 more values that are immediately available will be
+    taken without waiting. Values are taken one at a time as the transformation
+    needs them, so no value is taken from the channel after the transformation
+    terminates early.
+
+    Args:
+        xform: A :any:`transducer`.
+        aiterable: A potentially infinite async iterable.
+        batch_size: An optional positive int specifying the maximum number of
+            values to take from a channel without waiting.
+    """
+    if batch_size < 1 or batch_size != int(batch_size):
+        raise ValueError('batch_size must be a positive int')
+    buffer = _deque()
+    xrf = xform(append)
+    step = _step_fn(xrf)
+    vals = _avalues(aiterable, batch_size)
+    try:
+        async for x in vals:
+            ret = step(buffer, x)
+            assert unreduced(ret) is buffer, 'xform returned invalid value'
+            while len(buffer) > 0:
+                yield buffer.popleft()
+            if is_reduced(ret):
+                break
+    finally:
+        await vals.aclose()
+
+    ret = _complete_fn(xrf)(buffer)
+    assert ret is buffer, 'xform returned invalid value'
+    while len(buffer) > 0:
+        yield buffer.popleft()
+
+
 def _step_safety(step):
     """A decorator for step functions to help with debugging reduced cases.
 
@@ -286,7 +795,7 @@ def map(f):
     See Also:
         :func:`map_indexed`
      """
-    return lambda rf: multi_arity(rf, rf, lambda result, val: rf(result, f(val)))
+    return _Stateless((('map', f),))
 
 
 def map_indexed(f):
@@ -303,14 +812,15 @@ def map_indexed(f):
         :func:`chanpy.transducers.map`
     """
     def xform(rf):
+        rf_step = _step_fn(rf)
         i = -1
 
         def step(result, val):
             nonlocal i
             i += 1
-            return rf(result, f(i, val))
+            return rf_step(result, f(i, val))
 
-        return multi_arity(rf, rf, step)
+        return _forwarding_rf(rf, rf, step)
     return xform
 
 
@@ -324,10 +834,7 @@ def filter(pred):
         :func:`filter_indexed`
         :func:`remove`
     """
-    return lambda rf: multi_arity(rf, rf,
-                                  lambda result, val: (rf(result, val)
-                                                       if pred(val)
-                                                       else result))
+    return _Stateless((('filter', pred),))
 
 
 def filter_indexed(f):
@@ -359,7 +866,7 @@ def remove(pred):
         :func:`filter`
         :func:`remove_indexed`
     """
-    return filter(lambda x: not pred(x))
+    return _Stateless((('remove', pred),))
 
 
 def remove_indexed(f):
@@ -386,7 +893,7 @@ def keep(f):
     See Also:
         :func:`keep_indexed`
     """
-    return comp(map(f), filter(lambda x: x is not None))
+    return _Stateless((('keep', f),))
 
 
 def keep_indexed(f):
@@ -414,8 +921,10 @@ def cat(rf):
     See Also:
         :func:`mapcat`
     """
+    rf_step = _step_fn(rf)
+
     def double_reduced_rf(result, val):
-        ret = rf(result, val)
+        ret = rf_step(result, val)
         return reduced(ret) if is_reduced(ret) else ret
 
     return multi_arity(rf, rf, _functools.partial(ireduce, double_reduced_rf))
@@ -436,12 +945,13 @@ def take(n):
         n: A number.
     """
     def xform(rf):
+        rf_step = _step_fn(rf)
         remaining = n
 
         @_step_safety
         def step(result, val):
             nonlocal remaining
-            new_result = rf(result, val) if remaining > 0 else result
+            new_result = rf_step(result, val) if remaining > 0 else result
             remaining -= 1
             return ensure_reduced(new_result) if remaining <= 0 else new_result
 
@@ -462,23 +972,22 @@ def take_last(n):
         n: A number.
     """
     def xform(rf):
-        buffer = _deque()
+        rf_step = _step_fn(rf)
+        buffer = _deque(maxlen=max(0, int(n)))
 
         def step(result, val):
             buffer.append(val)
-            if len(buffer) > n:
-                buffer.popleft()
             return result
 
         def complete(result):
             new_result = result
             while len(buffer) > 0:
-                new_result = rf(new_result, buffer.popleft())
+                new_result = rf_step(new_result, buffer.popleft())
                 if is_reduced(new_result):
                     buffer.clear()
             return rf(unreduced(new_result))
 
-        return multi_arity(rf, complete, step)
+        return _forwarding_rf(rf, complete, step)
     return xform
 
 
@@ -499,12 +1008,7 @@ def take_while(pred):
     Args:
         pred: A predicate function, ``f(value) -> bool``.
     """
-    def xform(rf):
-        @_step_safety
-        def step(result, val):
-            return rf(result, val) if pred(val) else reduced(result)
-        return multi_arity(rf, rf, step)
-    return xform
+    return _Stateless((('take_while', pred),))
 
 
 def drop(n):
@@ -517,14 +1021,15 @@ def drop(n):
         n: A number.
     """
     def xform(rf):
+        rf_step = _step_fn(rf)
         remaining = n
 
         def step(result, val):
             nonlocal remaining
             remaining -= 1
-            return result if remaining > -1 else rf(result, val)
+            return result if remaining > -1 else rf_step(result, val)
 
-        return multi_arity(rf, rf, step)
+        return _forwarding_rf(rf, rf, step)
     return xform
 
 
@@ -542,19 +1047,20 @@ def drop_last(n):
 
     """
     def xform(rf):
+        rf_step = _step_fn(rf)
         buffer = _deque()
 
         def step(result, val):
             buffer.append(val)
             if len(buffer) > n:
-                return rf(result, buffer.popleft())
+                return rf_step(result, buffer.popleft())
             return result
 
         def complete(result):
             buffer.clear()
             return rf(result)
 
-        return multi_arity(rf, complete, step)
+        return _forwarding_rf(rf, complete, step)
     return xform
 
 
@@ -565,6 +1071,7 @@ def drop_while(pred):
         pred: A predicate function, ``pred(input) -> bool``.
     """
     def xform(rf):
+        rf_step = _step_fn(rf)
         has_taken = False
 
         def step(result, val):
@@ -574,31 +1081,33 @@ def drop_while(pred):
                 return result
 
             has_taken = True
-            return rf(result, val)
+            return rf_step(result, val)
 
-        return multi_arity(rf, rf, step)
+        return _forwarding_rf(rf, rf, step)
     return xform
 
 
 def distinct(rf):
     """A :any:`transducer` that drops duplicate values."""
+    rf_step = _step_fn(rf)
     prev_vals = set()
 
     def step(result, val):
         if val in prev_vals:
             return result
         prev_vals.add(val)
-        return rf(result, val)
+        return rf_step(result, val)
 
     def complete(result):
         prev_vals.clear()
         return rf(result)
 
-    return multi_arity(rf, complete, step)
+    return _forwarding_rf(rf, complete, step)
 
 
 def dedupe(rf):
     """A :any:`transducer` that drops consecutive duplicate values."""
+    rf_step = _step_fn(rf)
     prev_val = _Undefined
 
     def step(result, val):
@@ -606,12 +1115,42 @@ def dedupe(rf):
         if val == prev_val:
             return result
         prev_val = val
-        return rf(result, val)
+        return rf_step(result, val)
+
+    return _forwarding_rf(rf, rf, step)
+
+
+class _Window(_Sequence):
+    """A read-only view of consecutive values in a list."""
+
+    __slots__ = ('_values', '_start', '_len')
+
+    def __init__(self, values, start, length):
+        self._values = values
+        self._start = start
+        self._len = length
+
+    def __len__(self):
+        return self._len
 
-    return multi_arity(rf, rf, step)
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return tuple(self)[i]
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError('window index out of range')
+        return self._values[self._start + i]
 
+    def __iter__(self):
+        return _itertools.islice(self._values, self._start,
+                                 self._start + self._len)
 
-def partition_all(n, step=None):
+    def __repr__(self):
+        return f'_Window({tuple(self)!r})'
+
+
+def partition_all(n, step=None, *, view=False):
     """Returns a :any:`transducer` that partitions all values.
 
     The returned transducer partitions values into tuples of size `n` that are
@@ -626,6 +1165,16 @@ def partition_all(n, step=None):
             (may be less for partitions at the end).
         step: An optional positive int used as the offset between partitions.
             Defaults to `n`.
+        view: An optional bool. If True, partitions are outputted as read-only
+            sequences over the internal buffer of the transducer instead of
+            tuples, which avoids copying `n` values per partition. A view
+            is only valid until the transducer steps its next value, so it
+            must be consumed right away, such as by a later transformation
+            like ``map(sum)`` or by iterating :func:`xiter` or
+            :func:`axiter`. Views must not be used with a channel, whose
+            buffer holds values until they're taken, nor collected with
+            :func:`into` or :func:`append`. Use ``tuple(view)`` to keep a
+            partition.
 
     See Also:
         :func:`partition`
@@ -636,37 +1185,54 @@ def partition_all(n, step=None):
         raise ValueError('n must be a positive integer')
     if step < 1 or step != int(step):
         raise ValueError('step must be a positive integer')
+    n, step = int(n), int(step)
+    advance = min(n, step)  # Values removed from the buffer per partition
+    drops = max(0, step - n)
 
     def xform(rf):
+        rf_step = _step_fn(rf)
         buffer = []
+        # Number of values at the start of buffer that are no longer needed.
+        # With views, they're removed on the next step rather than right
+        # away so that the outputted view remains valid until then.
+        trim = 0
         remaining_drops = 0
 
         def step_f(result, val):
-            nonlocal buffer, remaining_drops
+            nonlocal trim, remaining_drops
 
             if remaining_drops > 0:
                 remaining_drops -= 1
                 return result
 
+            if trim > 0:
+                del buffer[:trim]
+                trim = 0
             buffer.append(val)
             if len(buffer) < n:
                 return result
 
-            ret = rf(result, tuple(buffer))
-            remaining_drops = max(0, step - n)
-            buffer = [] if is_reduced(ret) else buffer[step:]
+            remaining_drops = drops
+            if view:
+                ret = rf_step(result, _Window(buffer, 0, n))
+                trim = n if is_reduced(ret) else advance
+                return ret
+            ret = rf_step(result, tuple(buffer))
+            if is_reduced(ret):
+                buffer.clear()
+            else:
+                del buffer[:advance]
             return ret
 
         def complete(result):
-            nonlocal buffer
             new_result = result
 
-            while len(buffer) > 0:
-                buf = tuple(buffer)
-                buffer = buffer[step:]
-                new_result = rf(new_result, buf)
+            for start in range(trim, len(buffer), step):
+                part = (_Window(buffer, start, len(buffer) - start) if view
+                        else tuple(buffer[start:]))
+                new_result = rf_step(new_result, part)
                 if is_reduced(new_result):
-                    buffer.clear()
+                    break
 
             return rf(unreduced(new_result))
 
@@ -674,7 +1240,7 @@ def partition_all(n, step=None):
     return xform
 
 
-def partition(n, step=None, pad=None):
+def partition(n, step=None, pad=None, *, view=False):
     """Returns a :any:`transducer` that partitions values into tuples of size `n`.
 
     The returned transducer partitions the values into tuples of size `n` that
@@ -697,21 +1263,25 @@ def partition(n, step=None, pad=None):
         step: An optional positive int used as the offset between partitions.
         pad: An optional iterable of any size. If the last partition size is
             greater than 0 and less than `n`, then `pad` will be applied to it.
+        view: An optional bool. If True, partitions other than a padded one
+            are outputted as read-only views that are only valid until the
+            next value is stepped. See :func:`partition_all`.
 
     See Also:
         :func:`partition_all`
     """
     def pad_xform(rf):
+        rf_step = _step_fn(rf)
         def step_f(result, part):
             if len(part) == n:
-                return rf(result, part)
+                return rf_step(result, part)
             if pad is None:
                 return reduced(result)
             padding = tuple(_itertools.islice(pad, n - len(part)))
-            return ensure_reduced(rf(result, part + tuple(padding)))
+            return ensure_reduced(rf_step(result, tuple(part) + padding))
 
         return multi_arity(rf, rf, step_f)
-    return comp(partition_all(n, step), pad_xform)
+    return comp(partition_all(n, step, view=view), pad_xform)
 
 
 def partition_by(f):
@@ -726,6 +1296,7 @@ def partition_by(f):
         f: A function, ``f(item) -> any``.
     """
     def xform(rf):
+        rf_step = _step_fn(rf)
         prev_f_ret = _Undefined
         buffer = []
 
@@ -739,18 +1310,18 @@ def partition_by(f):
                 return result
 
             prev_f_ret = f_ret
-            rf_ret = rf(result, tuple(buffer))
+            rf_ret = rf_step(result, tuple(buffer))
             buffer = [] if is_reduced(rf_ret) else [val]
             return rf_ret
 
         def complete(result):
             if len(buffer) == 0:
                 return rf(result)
-            flushed_result = unreduced(rf(result, tuple(buffer)))
+            flushed_result = unreduced(rf_step(result, tuple(buffer)))
             buffer.clear()
             return rf(flushed_result)
 
-        return multi_arity(rf, complete, step)
+        return _forwarding_rf(rf, complete, step)
     return xform
 
 
@@ -776,8 +1347,10 @@ def reductions(rf, init=_Undefined):
     """
     if init is _Undefined:
         init = rf()
+    rf_step = _step_fn(rf)
 
     def xform(xrf):
+        xrf_step = _step_fn(xrf)
         prev_state = _Undefined
 
         def step(result, val):
@@ -785,19 +1358,19 @@ def reductions(rf, init=_Undefined):
 
             if prev_state is _Undefined:
                 prev_state = init
-                result = xrf(result, init)
+                result = xrf_step(result, init)
                 if is_reduced(result):
                     return result
 
-            prev_state = rf(prev_state, val)
-            new_result = xrf(result, unreduced(prev_state))
+            prev_state = rf_step(prev_state, val)
+            new_result = xrf_step(result, unreduced(prev_state))
             return (ensure_reduced(new_result)
                     if is_reduced(prev_state)
                     else new_result)
 
         def complete(result):
             if prev_state is _Undefined:
-                tmp_result = unreduced(xrf(result, init))
+                tmp_result = unreduced(xrf_step(result, init))
             else:
                 tmp_result = result
             return xrf(tmp_result)
@@ -809,17 +1382,20 @@ def reductions(rf, init=_Undefined):
 def interpose(sep):
     """Returns a :any:`transducer` that outputs each input separated by `sep`."""
     def xform(rf):
+        rf_step = _step_fn(rf)
         is_initial = True
 
         def step(result, val):
             nonlocal is_initial
             if is_initial:
                 is_initial = False
-                return rf(result, val)
-            sep_result = rf(result, sep)
-            return sep_result if is_reduced(sep_result) else rf(sep_result, val)
+                return rf_step(result, val)
+            sep_result = rf_step(result, sep)
+            if is_reduced(sep_result):
+                return sep_result
+            return rf_step(sep_result, val)
 
-        return multi_arity(rf, rf, step)
+        return _forwarding_rf(rf, rf, step)
     return xform
 
 
@@ -833,12 +1409,7 @@ def replace(smap):
     Args:
         smap: A dictionary that maps values to their replacements.
     """
-    def xform(rf):
-        def step(result, val):
-            return rf(result, smap.get(val, val))
-
-        return multi_arity(rf, rf, step)
-    return xform
+    return _Stateless((('replace', smap),))
 
 
 def random_sample(prob):
@@ -848,3 +1419,285 @@ def random_sample(prob):
         prob: A number between 0 and 1.
     """
     return filter(lambda _: _random.random() < prob)
+
+
+def _require_numpy():
+    if _np is None:
+        raise ImportError('vectorized transducers require numpy')
+
+
+def _from_array(chunk):
+    """Returns the values of a 1-dimensional array as Python objects."""
+    if _np is not None and type(chunk) is _np.ndarray and chunk.ndim == 1:
+        return chunk.tolist()
+    return chunk
+
+
+def _item(x):
+    """Returns `x` as a Python object if it's a NumPy scalar."""
+    return x.item() if isinstance(x, _np.generic) else x
+
+
+# Python types whose values are unchanged by being put into a NumPy array of
+# their own kind and converted back with tolist()
+_ARRAY_SCALAR_TYPES = frozenset({bool, int, float, complex, str, bytes})
+
+
+def _as_array(vals):
+    """Returns `vals` as a NumPy array or None if that could change its values.
+
+    A sequence of Python values is only converted if all of them have the same
+    scalar type. Otherwise NumPy would convert them to a common dtype, such as
+    ``[True, 2]`` to ``[1, 2]``.
+    """
+    if type(vals) is _np.ndarray:
+        return vals
+    types = {type(val) for val in vals}
+    if len(types) != 1 or not types <= _ARRAY_SCALAR_TYPES:
+        return None
+    return _np.asarray(vals)
+
+
+class _Vectorized:
+    """A :any:`transducer` that transforms NumPy arrays when chunked.
+
+    Args:
+        xform: The transducer to use when transforming one value at a time.
+        chunk_fn: A function that returns a new function for transforming
+            chunks. See :meth:`_Stateless._chunk_fn`.
+    """
+    __slots__ = ('_xform', '_chunk_fn')
+
+    def __init__(self, xform, chunk_fn):
+        self._xform = xform
+        self._chunk_fn = chunk_fn
+
+    def __call__(self, rf):
+        return self._xform(rf)
+
+
+def vmap(f):
+    """Returns a vectorized :any:`transducer` that applies `f` to each input.
+
+    Same as :func:`~chanpy.transducers.map` except that when used with
+    `chunksize`, `f` is applied to a whole chunk of inputs at once as a NumPy
+    array. `f` must therefore be vectorized, such as a NumPy ufunc or a
+    function composed of them, and produce the same result for an array as it
+    would for each of its elements. NumPy scalar results are converted to
+    Python objects. Chunks of Python values that don't all have the same type
+    are transformed one value at a time so that their types are preserved.
+
+    Args:
+        f: A vectorized function, ``f(input) -> any``.
+
+    Raises:
+        ImportError: If NumPy isn't installed.
+
+    See Also:
+        :func:`itransduce`
+    """
+    _require_numpy()
+
+    def chunk_fn():
+        def transform(vals):
+            arr = _as_array(vals)
+            if arr is None:
+                return [_item(f(x)) for x in vals], False
+            return f(arr), False
+        return transform
+
+    return _Vectorized(map(lambda x: _item(f(x))), chunk_fn)
+
+
+def vfilter(pred):
+    """Returns a vectorized :any:`transducer` that outputs values for which predicate returns True.
+
+    Same as :func:`filter` except that when used with `chunksize`, `pred` is
+    applied to a whole chunk of inputs at once as a NumPy array and must
+    return a boolean mask. The mask selects from the original inputs, so
+    their types are preserved. Chunks of Python values that don't all have the
+    same type are filtered one value at a time.
+
+    Args:
+        pred: A vectorized predicate function, ``pred(value) -> bool``.
+
+    Raises:
+        ImportError: If NumPy isn't installed.
+    """
+    _require_numpy()
+
+    def chunk_fn():
+        def transform(vals):
+            arr = _as_array(vals)
+            if arr is None:
+                return [x for x in vals if pred(x)], False
+            mask = pred(arr)
+            if arr is vals:
+                return arr[mask], False
+            return list(_itertools.compress(vals, mask.tolist())), False
+        return transform
+
+    return _Vectorized(filter(pred), chunk_fn)
+
+
+def vtake(n):
+    """Returns a vectorized :any:`transducer` that outputs the first `n` inputs.
+
+    Same as :func:`take` except that when used with `chunksize`, chunks are
+    sliced instead of being processed one value at a time.
+
+    Args:
+        n: An int.
+
+    Raises:
+        ImportError: If NumPy isn't installed.
+    """
+    _require_numpy()
+
+    def chunk_fn():
+        remaining = n
+
+        def transform(vals):
+            nonlocal remaining
+            taken = vals[:max(remaining, 0)]
+            remaining -= len(taken)
+            return taken, remaining <= 0
+        return transform
+
+    return _Vectorized(take(n), chunk_fn)
+
+
+def vdrop(n):
+    """Returns a vectorized :any:`transducer` that drops the first `n` inputs.
+
+    Same as :func:`drop` except that when used with `chunksize`, chunks are
+    sliced instead of being processed one value at a time.
+
+    Args:
+        n: An int.
+
+    Raises:
+        ImportError: If NumPy isn't installed.
+    """
+    _require_numpy()
+
+    def chunk_fn():
+        remaining = max(n, 0)
+
+        def transform(vals):
+            nonlocal remaining
+            dropped = min(remaining, len(vals))
+            remaining -= dropped
+            return vals[dropped:], False
+        return transform
+
+    return _Vectorized(drop(n), chunk_fn)
+
+
+def vpartition(n, step=None):
+    """Returns a vectorized :any:`transducer` that partitions values into tuples of size `n`.
+
+    Same as :func:`partition` without `pad` except that when used with
+    `chunksize`, the partitions within a chunk are found with a sliding
+    window view of it rather than one value at a time.
+
+    Args:
+        n: A positive int representing the length of each partition.
+        step: An optional positive int used as the offset between partitions.
+            Defaults to `n`.
+
+    Raises:
+        ImportError: If NumPy isn't installed.
+    """
+    _require_numpy()
+    step = n if step is None else step
+    xform = partition(n, step)
+
+    def chunk_fn():
+        carry = None  # Values of the previous chunk needed for a partition
+        offset = 0  # Index within carry + chunk of the next partition
+
+        def transform(vals):
+            nonlocal carry, offset
+            if len(vals) == 0:
+                return [], False
+            if type(vals) is _np.ndarray and (carry is None or
+                                              type(carry) is _np.ndarray):
+                vals = vals if carry is None else _np.concatenate((carry, vals))
+            else:
+                # Original values are kept so that their types are preserved
+                vals = [*_from_array(carry if carry is not None else []),
+                        *_from_array(vals)]
+            if len(vals) < n:
+                carry = vals
+                return [], False
+            starts = range(offset, len(vals) - n + 1, step)
+            arr = _as_array(vals)
+            if arr is None:
+                parts = [tuple(vals[i:i + n]) for i in starts]
+            else:
+                windows = _sliding_window_view(arr, n)[offset::step]
+                parts = [tuple(w) for w in windows.tolist()]
+            next_offset = offset + len(starts) * step
+            carry = vals[next_offset:] if next_offset < len(vals) else None
+            offset = max(next_offset - len(vals), 0)
+            return parts, False
+        return transform
+
+    return _Vectorized(xform, chunk_fn)
+
+
+def vreductions(ufunc, init=_Undefined):
+    """
+    vreductions(ufunc, init=Undefined)
+
+    Returns a vectorized :any:`transducer` that outputs each intermediate result from a reduction.
+
+    Same as :func:`reductions` except that when used with `chunksize`, the
+    intermediate results of a whole chunk are computed at once with
+    ``ufunc.accumulate``. For example, ``vreductions(numpy.add)`` outputs
+    a cumulative sum.
+
+    Args:
+        ufunc: A binary NumPy ufunc such as :data:`numpy.add`.
+        init: An optional initial value. Defaults to ``ufunc.identity``.
+
+    Raises:
+        ImportError: If NumPy isn't installed.
+        ValueError: If `init` isn't provided and `ufunc` has no identity.
+    """
+    _require_numpy()
+    if init is _Undefined:
+        if ufunc.identity is None:
+            raise ValueError('init must be provided if ufunc has no identity')
+        init = ufunc.identity
+    xform = reductions(lambda x, y: _item(ufunc(x, y)), init)
+
+    def chunk_fn():
+        prev = None  # The last output, or None if init hasn't been outputted
+
+        def transform(vals):
+            nonlocal prev
+            if len(vals) == 0:
+                if prev is not None:
+                    return [], False
+                prev = init
+                return [init], False
+            start = init if prev is None else prev
+            arr = _as_array(vals)
+            if arr is None:
+                results = []
+                for val in vals:
+                    start = _item(ufunc(start, val))
+                    results.append(start)
+            else:
+                results = ufunc.accumulate(
+                    _np.concatenate((_np.asarray([start]), arr)))[1:]
+            if prev is None:
+                # init is outputted as is rather than converted to the dtype
+                results = [init, *_from_array(results)]
+            prev = results[-1]
+            return results, False
+        return transform
+
+    return _Vectorized(xform, chunk_fn)
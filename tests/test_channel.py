@@ -87,6 +87,59 @@ class TestAsync(unittest.TestCase):
 
         asyncio.run(main())
 
+    def test_go_none_return_value(self):
+        async def coro():
+            pass
+
+        async def main():
+            self.assertIsNone(await c.go(coro()).get())
+
+        asyncio.run(main())
+
+    def test_go_exception_is_reported(self):
+        async def coro():
+            raise ValueError('failure')
+
+        async def main():
+            contexts = []
+            asyncio.get_running_loop().set_exception_handler(
+                lambda _, context: contexts.append(context))
+            c.go(coro())
+            await asyncio.sleep(0.05)
+            self.assertEqual(len(contexts), 1)
+            self.assertIsInstance(contexts[0]['exception'], ValueError)
+
+        asyncio.run(main())
+
+    def test_go_from_thread_is_batched(self):
+        async def coro(i):
+            return i
+
+        def thread(barrier_ch):
+            chs = [c.go(coro(i)) for i in range(1000)]
+            barrier_ch.b_put(True)
+            return [ch.b_get() for ch in chs]
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            wakeups = []
+            call_soon_threadsafe = loop.call_soon_threadsafe
+
+            def counting_call_soon_threadsafe(*args):
+                wakeups.append(args)
+                return call_soon_threadsafe(*args)
+
+            loop.call_soon_threadsafe = counting_call_soon_threadsafe
+            barrier_ch = chan()
+            result_ch = c.thread(lambda: thread(barrier_ch))
+            # Don't let the loop run until every goroutine has been submitted
+            time.sleep(0.1)
+            self.assertIs(await barrier_ch.get(), True)
+            self.assertEqual(await result_ch.get(), list(range(1000)))
+            self.assertLess(len(wakeups), 10)
+
+        asyncio.run(main())
+
     def test_go_coroutine_never_awaited(self):
         """ Test that no 'coroutine was not awaited' warning is raised
 
@@ -15,19 +15,32 @@
 # limitations under the License.
 
 import asyncio
+import json
+import multiprocessing
+import os
 import threading
 import time
 import unittest
+import weakref
 import chanpy as c
+from chanpy import core
 from chanpy import chan
 from chanpy import transducers as xf
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest import mock
 
 
 async def a_list(ch):
     return await c.to_list(ch).get()
 
 
+def b_put_all(ch, vals, close=True):
+    for val in vals:
+        ch.b_put(val)
+    if close:
+        ch.close()
+
+
 class TestThreadCall(unittest.TestCase):
     def setUp(self):
         c.set_loop(asyncio.new_event_loop())
@@ -61,6 +74,297 @@ class TestThreadCall(unittest.TestCase):
         thread_name = c.thread(thread, executor).b_get()
         self.assertTrue(thread_name.startswith('executor'))
 
+    def test_default_pool_reuses_threads(self):
+        def thread():
+            return threading.current_thread()
+
+        threads = {c.thread(thread).b_get() for _ in range(10)}
+        self.assertLess(len(threads), 10)
+        self.assertTrue(all(t.name.startswith('chanpy-thread')
+                            for t in threads))
+
+    def test_loop_is_registered(self):
+        loop = c.get_loop()
+        self.assertIs(c.thread(c.get_loop).b_get(), loop)
+
+    @unittest.skipUnless(hasattr(threading, 'excepthook'),
+                         'requires threading.excepthook')
+    def test_exception_is_reported_to_threading_excepthook(self):
+        hook_args = []
+        is_reported = threading.Event()
+
+        def excepthook(args):
+            hook_args.append(args)
+            is_reported.set()
+
+        def thread():
+            raise ValueError('fail')
+
+        with mock.patch.object(threading, 'excepthook', excepthook):
+            c.thread(thread)
+            self.assertTrue(is_reported.wait(1))
+        self.assertIs(hook_args[0].exc_type, ValueError)
+        self.assertEqual(str(hook_args[0].exc_value), 'fail')
+        self.assertTrue(hook_args[0].thread.name.startswith('chanpy-thread'))
+
+    def test_set_thread_pool_size(self):
+        with self.assertRaises(ValueError):
+            c.set_thread_pool_size(0)
+
+        def thread():
+            time.sleep(0.1)
+            return threading.current_thread()
+
+        try:
+            c.set_thread_pool_size(1)
+            chs = [c.thread(thread) for _ in range(3)]
+            self.assertEqual(len({ch.b_get() for ch in chs}), 1)
+            self.assertEqual(c.thread_pool_stats()['size'], 1)
+        finally:
+            c.set_thread_pool_size(core._DEFAULT_THREAD_POOL_SIZE)
+
+    def test_thread_pool_stats(self):
+        stats = c.thread_pool_stats()
+        c.thread(lambda: time.sleep(0.1)).b_get()
+        time.sleep(0.05)  # The stats are updated after the channel closes
+        new_stats = c.thread_pool_stats()
+        self.assertEqual(new_stats['submitted'], stats['submitted'] + 1)
+        self.assertEqual(new_stats['completed'], stats['completed'] + 1)
+        self.assertEqual(new_stats['pending'], 0)
+        self.assertGreaterEqual(new_stats['run_time'] - stats['run_time'],
+                                0.1)
+        self.assertGreaterEqual(new_stats['wait_time'], stats['wait_time'])
+
+
+class TestProcess(unittest.TestCase):
+    def test_runs_in_another_process(self):
+        async def main():
+            self.assertNotEqual(await c.process(os.getpid).get(), os.getpid())
+
+        asyncio.run(main())
+
+    def test_args(self):
+        async def main():
+            self.assertEqual(await c.process(pow, 2, 10).get(), 1024)
+
+        asyncio.run(main())
+
+    def test_none_return_value(self):
+        async def main():
+            ch = c.process(time.sleep, 0)
+            self.assertIsNone(await ch.get())
+
+        asyncio.run(main())
+
+    def test_executor(self):
+        async def main():
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                pids = [await c.process(os.getpid, executor=executor).get()
+                        for _ in range(3)]
+            self.assertEqual(len(set(pids)), 1)
+
+        asyncio.run(main())
+
+    def test_exception_is_reported(self):
+        async def main():
+            contexts = []
+            asyncio.get_running_loop().set_exception_handler(
+                lambda _, context: contexts.append(context))
+            ch = c.process(int, 'not an int')
+            for _ in range(100):
+                if len(contexts) > 0:
+                    break
+                await asyncio.sleep(0.02)
+            self.assertIsInstance(contexts[0]['exception'], ValueError)
+            self.assertIsNone(ch.poll())
+
+        asyncio.run(main())
+
+
+class TestShmChan(unittest.TestCase):
+    def setUp(self):
+        self.chs = []
+
+    def tearDown(self):
+        for ch in self.chs:
+            ch.unlink()
+
+    def shm_chan(self, *args, **kwargs):
+        ch = c.shm_chan(*args, **kwargs)
+        self.chs.append(ch)
+        return ch
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            c.shm_chan(5)
+        with self.assertRaises(TypeError):
+            c.shm_chan(1.5)
+
+    def test_blocking_put_get(self):
+        ch = self.shm_chan()
+        self.assertIs(ch.b_put({'a': [1, 2]}), True)
+        self.assertEqual(ch.b_get(), {'a': [1, 2]})
+
+    def test_async_put_get(self):
+        async def main():
+            ch = self.shm_chan()
+            get_f = asyncio.ensure_future(ch.get())
+            await asyncio.sleep(0.05)
+            self.assertIs(await ch.put('success'), True)
+            self.assertEqual(await get_f, 'success')
+
+        asyncio.run(main())
+
+    def test_offer_and_poll(self):
+        ch = self.shm_chan(32)
+        self.assertIsNone(ch.poll())
+        self.assertIs(ch.offer(b'0123456789'), True)
+        self.assertIs(ch.offer(b'0123456789'), True)
+        self.assertIs(ch.offer(b'0123456789'), False)
+        self.assertEqual(ch.poll(), b'0123456789')
+        self.assertIs(ch.offer(b'abc'), True)
+        self.assertEqual(ch.poll(), b'0123456789')
+        self.assertEqual(ch.poll(), b'abc')
+        self.assertIsNone(ch.poll())
+
+    def test_bytes_skip_serializer(self):
+        class Serializer:
+            @staticmethod
+            def dumps(obj):
+                raise AssertionError('bytes were serialized')
+
+        ch = self.shm_chan(serializer=Serializer)
+        ch.b_put(b'raw')
+        self.assertEqual(ch.b_get(), b'raw')
+
+    def test_serializer(self):
+        class Serializer:
+            @staticmethod
+            def dumps(obj):
+                return json.dumps(obj).encode()
+
+            @staticmethod
+            def loads(data):
+                return json.loads(data)
+
+        ch = self.shm_chan(serializer=Serializer)
+        ch.b_put((1, 2))
+        self.assertEqual(ch.b_get(), [1, 2])
+
+    def test_value_too_large(self):
+        ch = self.shm_chan(16)
+        with self.assertRaises(ValueError):
+            ch.b_put(b'x' * 16)
+
+    def test_close(self):
+        async def main():
+            ch = self.shm_chan()
+            await ch.put('a')
+            ch.close()
+            self.assertIs(await ch.put('b'), False)
+            self.assertEqual(await ch.get(), 'a')
+            self.assertIsNone(await ch.get())
+
+        asyncio.run(main())
+
+    def test_close_exhausts_pending_gets(self):
+        async def main():
+            ch = self.shm_chan()
+            get_f = asyncio.ensure_future(ch.get())
+            await asyncio.sleep(0.05)
+            ch.close()
+            self.assertIsNone(await get_f)
+
+        asyncio.run(main())
+
+    def test_alt(self):
+        async def main():
+            ch = self.shm_chan()
+            alt_f = asyncio.ensure_future(c.alt(chan(), ch))
+            await asyncio.sleep(0.05)
+            await ch.put('success')
+            self.assertEqual(await alt_f, ('success', ch))
+
+        asyncio.run(main())
+
+    def test_other_process(self):
+        async def main():
+            # A small buffer so the producer has to wait and wrap around
+            ch = self.shm_chan(64)
+            vals = list(range(500)) + [b'bytes']
+            proc = multiprocessing.Process(target=b_put_all, args=[ch, vals])
+            proc.start()
+            self.assertEqual(await a_list(ch), vals)
+            proc.join()
+
+        asyncio.run(main())
+
+
+class TestRuntime(unittest.TestCase):
+    def test_invalid_n(self):
+        with self.assertRaises(ValueError):
+            c.runtime(0)
+
+    def test_round_robin(self):
+        async def coro():
+            return threading.current_thread().name
+
+        with c.runtime(3) as rt:
+            names = [rt.go(coro()).b_get() for _ in range(6)]
+        self.assertEqual(names[:3], names[3:])
+        self.assertEqual(len(set(names)), 3)
+
+    def test_key_affinity(self):
+        async def coro():
+            return c.get_loop()
+
+        with c.runtime(4) as rt:
+            loops = {rt.go(coro(), key='key').b_get() for _ in range(10)}
+        self.assertEqual(len(loops), 1)
+        self.assertIn(loops.pop(), rt.loops)
+
+    def test_goroutines_communicate_across_loops(self):
+        async def producer(ch):
+            for i in range(100):
+                await ch.put(i)
+            ch.close()
+
+        async def consumer(ch):
+            return await a_list(ch)
+
+        with c.runtime(2) as rt:
+            ch = chan()
+            rt.go(producer(ch))
+            self.assertEqual(rt.go(consumer(ch)).b_get(), list(range(100)))
+
+    def test_metrics(self):
+        async def coro(ch):
+            await ch.get()
+
+        with c.runtime(2) as rt:
+            ch = chan()
+            for _ in range(4):
+                rt.go(coro(ch))
+            time.sleep(0.05)
+            self.assertEqual(rt.metrics(),
+                             [{'spawned': 2, 'completed': 0, 'active': 2}] * 2)
+            ch.close()
+            time.sleep(0.05)
+            self.assertEqual(rt.metrics(),
+                             [{'spawned': 2, 'completed': 2, 'active': 0}] * 2)
+
+    def test_close(self):
+        async def coro():
+            await asyncio.sleep(10)
+
+        rt = c.runtime(2)
+        rt.go(coro())
+        rt.close()
+        self.assertTrue(all(loop.is_closed() for loop in rt.loops))
+        with self.assertRaises(RuntimeError):
+            rt.go(coro())
+        rt.close()
+
 
 class TestMultAsyncio(unittest.TestCase):
     def test_tap(self):
@@ -74,6 +378,17 @@ class TestMultAsyncio(unittest.TestCase):
 
         asyncio.run(main())
 
+    def test_tap_after_creation_receives_buffered_values(self):
+        async def main():
+            src, dest = chan(3), chan(3)
+            await c.onto_chan(src, [1, 2, 3]).get()
+            m = c.mult(src)
+            m.tap(dest)
+            self.assertEqual(await c.reduce(xf.append, [], dest).get(),
+                             [1, 2, 3])
+
+        asyncio.run(main())
+
     def test_untap(self):
         async def main():
             src, dest1, dest2 = chan(), chan(), chan()
@@ -157,6 +472,119 @@ class TestMultAsyncio(unittest.TestCase):
 
         asyncio.run(main())
 
+    def test_invalid_policy(self):
+        async def main():
+            src = chan()
+            m = c.mult(src)
+            with self.assertRaises(ValueError):
+                m.tap(chan(), policy='invalid policy')
+            src.close()
+
+        asyncio.run(main())
+
+    def test_drop_policy_does_not_block_other_taps(self):
+        async def main():
+            src, fast_dest, slow_dest = chan(), chan(), chan(1)
+            m = c.mult(src)
+            m.tap(fast_dest)
+            m.tap(slow_dest, policy='drop')
+            await src.put('item1')
+            self.assertEqual(await fast_dest.get(), 'item1')
+            await src.put('item2')
+            self.assertEqual(await fast_dest.get(), 'item2')
+            self.assertEqual(await slow_dest.get(), 'item1')
+            self.assertIsNone(slow_dest.poll())
+            src.close()
+
+        asyncio.run(main())
+
+    def test_sliding_policy_does_not_block_other_taps(self):
+        async def main():
+            src, fast_dest, slow_dest = chan(), chan(), chan(1)
+            m = c.mult(src)
+            m.tap(fast_dest)
+            m.tap(slow_dest, policy='sliding')
+            await src.put('item1')
+            self.assertEqual(await fast_dest.get(), 'item1')
+            await src.put('item2')
+            self.assertEqual(await fast_dest.get(), 'item2')
+            self.assertEqual(await slow_dest.get(), 'item2')
+            self.assertIsNone(slow_dest.poll())
+            src.close()
+
+        asyncio.run(main())
+
+    def test_sliding_policy_requires_buffered_tap(self):
+        async def main():
+            src = chan()
+            m = c.mult(src)
+            with self.assertRaises(ValueError):
+                m.tap(chan(), policy='sliding')
+            src.close()
+
+        asyncio.run(main())
+
+    def test_drop_policy_unbuffered_tap(self):
+        async def main():
+            src, dest = chan(), chan()
+            m = c.mult(src)
+            m.tap(dest, policy='drop')
+            await src.put('dropped')
+            await asyncio.sleep(0.05)
+            get_f = asyncio.ensure_future(dest.get())
+            await asyncio.sleep(0.05)
+            await src.put('received')
+            self.assertEqual(await get_f, 'received')
+            src.close()
+
+        asyncio.run(main())
+
+    def test_sliding_policy_does_not_steal_pending_puts(self):
+        async def main():
+            src, dest = chan(), chan(1)
+            m = c.mult(src)
+            m.tap(dest, policy='sliding')
+            await dest.put('old')
+            other_put = asyncio.ensure_future(dest.put('other'))
+            await asyncio.sleep(0)
+            await src.put('new')
+            await asyncio.sleep(0.05)
+            self.assertIs(await other_put, True)
+            self.assertEqual(await dest.get(), 'other')
+            self.assertIsNone(dest.poll())
+            src.close()
+
+        asyncio.run(main())
+
+    def test_drop_policy_does_not_steal_pending_puts(self):
+        async def main():
+            src, dest = chan(), chan()
+            m = c.mult(src)
+            m.tap(dest, policy='drop')
+            other_put = asyncio.ensure_future(dest.put('other'))
+            await asyncio.sleep(0)
+            await src.put('new')
+            await asyncio.sleep(0.05)
+            self.assertEqual(await dest.get(), 'other')
+            self.assertIs(await other_put, True)
+            self.assertIsNone(dest.poll())
+            src.close()
+
+        asyncio.run(main())
+
+    def test_closed_non_blocking_tap_is_removed(self):
+        async def main():
+            src, dest = chan(), chan(1)
+            m = c.mult(src)
+            m.tap(dest, policy='drop')
+            dest.close()
+            await src.put('item')
+            await asyncio.sleep(0.1)
+            self.assertEqual(len(m._taps), 0)
+            src.close()
+
+        asyncio.run(main())
+
 
 class TestMultThread(unittest.TestCase):
     def test_tap(self):
@@ -280,6 +708,145 @@ class TestMultThread(unittest.TestCase):
         asyncio.run(main())
 
 
+class TestBroadcast(unittest.TestCase):
+    def test_invalid_n(self):
+        with self.assertRaises(ValueError):
+            c.broadcast(0)
+        with self.assertRaises(TypeError):
+            c.broadcast(1.5)
+
+    def test_all_subs_receive_all_values(self):
+        async def main():
+            b = c.broadcast(2)
+            sub1, sub2 = b.subscribe(), b.subscribe()
+            self.assertIs(await b.put('a'), True)
+            self.assertIs(await b.put('b'), True)
+            b.close()
+            self.assertEqual([x async for x in sub1], ['a', 'b'])
+            self.assertEqual([x async for x in sub2], ['a', 'b'])
+
+        asyncio.run(main())
+
+    def test_values_are_released_without_subs(self):
+        class Value:
+            pass
+
+        for overwrite in (False, True):
+            b = c.broadcast(2, overwrite=overwrite)
+            b.subscribe().close()
+            val = Value()
+            val_ref = weakref.ref(val)
+            b.b_put(val)
+            del val
+            self.assertIsNone(val_ref())
+
+    def test_overwrite_values_are_released_after_last_unsubscribe(self):
+        class Value:
+            pass
+
+        b = c.broadcast(2, overwrite=True)
+        sub = b.subscribe()
+        val = Value()
+        val_ref = weakref.ref(val)
+        b.b_put(val)
+        del val
+        sub.close()
+        self.assertIsNone(val_ref())
+
+    def test_sub_only_receives_values_put_after_subscribing(self):
+        b = c.broadcast(2)
+        b.subscribe()
+        b.b_put('before')
+        sub = b.subscribe()
+        b.b_put('after')
+        b.close()
+        self.assertEqual(list(sub.to_iter()), ['after'])
+
+    def test_slowest_sub_blocks_puts(self):
+        b = c.broadcast(2)
+        fast_sub, slow_sub = b.subscribe(), b.subscribe()
+        self.assertIs(b.offer(1), True)
+        self.assertIs(b.offer(2), True)
+        self.assertEqual(fast_sub.poll(), 1)
+        self.assertEqual(fast_sub.poll(), 2)
+        self.assertIs(b.offer(3), False)
+        self.assertEqual(slow_sub.poll(), 1)
+        self.assertIs(b.offer(3), True)
+        self.assertEqual(slow_sub.poll(), 2)
+        self.assertEqual(slow_sub.poll(), 3)
+        self.assertEqual(fast_sub.poll(), 3)
+
+    def test_puts_do_not_block_without_subs(self):
+        b = c.broadcast(1)
+        self.assertIs(b.offer(1), True)
+        self.assertIs(b.offer(2), True)
+
+    def test_unsubscribe_releases_puts(self):
+        b = c.broadcast(1)
+        sub = b.subscribe()
+        self.assertIs(b.offer(1), True)
+        self.assertIs(b.offer(2), False)
+        sub.close()
+        self.assertIsNone(sub.poll())
+        self.assertIs(b.offer(2), True)
+
+    def test_overwrite_detects_lag(self):
+        b = c.broadcast(2, overwrite=True)
+        sub = b.subscribe()
+        for i in range(5):
+            self.assertIs(b.offer(i), True)
+        b.close()
+        self.assertEqual(list(sub.to_iter()), [3, 4])
+        self.assertEqual(sub.missed, 3)
+
+    def test_pending_get_completes_on_put(self):
+        async def main():
+            b = c.broadcast(1)
+            sub1, sub2 = b.subscribe(), b.subscribe()
+            get1, get2 = sub1.get(), sub2.get()
+            await b.put('success')
+            self.assertEqual(await get1, 'success')
+            self.assertEqual(await get2, 'success')
+
+        asyncio.run(main())
+
+    def test_pending_put_completes_after_get(self):
+        def thread(b, sub):
+            time.sleep(0.1)
+            return sub.b_get()
+
+        async def main():
+            b = c.broadcast(1)
+            sub = b.subscribe()
+            await b.put('first')
+            result_ch = c.thread(lambda: thread(b, sub))
+            self.assertIs(await b.put('second'), True)
+            self.assertEqual(await result_ch.get(), 'first')
+            self.assertEqual(await sub.get(), 'second')
+
+        asyncio.run(main())
+
+    def test_close_exhausts_pending_gets(self):
+        async def main():
+            b = c.broadcast(1)
+            sub = b.subscribe()
+            get = sub.get()
+            b.close()
+            self.assertIsNone(await get)
+            self.assertIs(await b.put('fail'), False)
+
+        asyncio.run(main())
+
+    def test_alt(self):
+        async def main():
+            b = c.broadcast(1)
+            sub = b.subscribe()
+            await b.put('success')
+            self.assertEqual(await c.alt(chan(), sub), ('success', sub))
+
+        asyncio.run(main())
+
+
 class TestPubAsyncio(unittest.TestCase):
     def test_sub(self):
         async def main():
@@ -447,6 +1014,214 @@ class TestPubAsyncio(unittest.TestCase):
         asyncio.run(main())
 
 
+class TestPubBatch(unittest.TestCase):
+    def test_invalid_batch_size(self):
+        with self.assertRaises(ValueError):
+            c.pub(chan(), xf.identity, batch_size=0)
+
+    def test_batches_preserve_topic_order(self):
+        async def main():
+            from_ch = chan(10)
+            a_ch, b_ch, pattern_ch = chan(10), chan(10), chan(10)
+            for x in ['a1', 'b1', 'a2', 'a3', 'b2', 'a4']:
+                await from_ch.put(x)
+            from_ch.close()
+            p = c.pub(from_ch, lambda x: x[0], batch_size=4)
+            p.sub('a', a_ch)
+            p.sub('b', b_ch)
+            p.psub('a', pattern_ch)
+            self.assertEqual(await a_list(a_ch), ['a1', 'a2', 'a3', 'a4'])
+            self.assertEqual(await a_list(b_ch), ['b1', 'b2'])
+            self.assertEqual(await a_list(pattern_ch),
+                             ['a1', 'a2', 'a3', 'a4'])
+
+        asyncio.run(main())
+
+    def test_consecutive_values_are_put_to_topic_mult_once(self):
+        async def main():
+            from_ch, a_ch, b_ch = chan(10), chan(10), chan(10)
+            for x in ['a1', 'a2', 'a3', 'b1', 'b2', 'a4']:
+                await from_ch.put(x)
+            from_ch.close()
+            p = c.pub(from_ch, lambda x: x[0], batch_size=6)
+            p.sub('a', a_ch)
+            p.sub('b', b_ch)
+
+            a_mult_ch = p._mults['a']._from_ch
+            a_mult_puts = []
+            a_mult_p_put = a_mult_ch._p_put
+
+            def p_put(handler, val):
+                a_mult_puts.append(val)
+                return a_mult_p_put(handler, val)
+
+            a_mult_ch._p_put = p_put
+            self.assertEqual(await a_list(a_ch), ['a1', 'a2', 'a3', 'a4'])
+            self.assertEqual(await a_list(b_ch), ['b1', 'b2'])
+            self.assertEqual(a_mult_puts, [['a1', 'a2', 'a3'], 'a4'])
+
+        asyncio.run(main())
+
+    def test_pattern_subscriber_receives_topics_in_source_order(self):
+        async def main():
+            from_ch, orders_ch = chan(10), chan(10)
+            for x in ['a1', 'b2', 'a3', 'b4']:
+                await from_ch.put(x)
+            from_ch.close()
+            p = c.pub(from_ch, lambda x: f'orders.{x[0]}', batch_size=10)
+            p.psub('orders.#', orders_ch)
+            self.assertEqual(await a_list(orders_ch),
+                             ['a1', 'b2', 'a3', 'b4'])
+
+        asyncio.run(main())
+
+    def test_does_not_wait_for_full_batch(self):
+        async def main():
+            from_ch, to_ch = chan(), chan()
+            p = c.pub(from_ch, xf.identity, batch_size=100)
+            p.sub('a', to_ch)
+            await from_ch.put('a')
+            self.assertEqual(await to_ch.get(), 'a')
+            from_ch.close()
+
+        asyncio.run(main())
+
+
+class TestPubPatterns(unittest.TestCase):
+    def test_wildcard_segment(self):
+        async def main():
+            from_ch, eu_ch = chan(), chan(5)
+            p = c.pub(from_ch, lambda x: x[0])
+            p.psub('orders.*.new', eu_ch)
+            await from_ch.put(('orders.eu.new', 1))
+            await from_ch.put(('orders.eu.old', 2))
+            await from_ch.put(('orders.us.new', 3))
+            await from_ch.put(('orders.eu.new.x', 4))
+            from_ch.close()
+            self.assertEqual(await a_list(eu_ch), [('orders.eu.new', 1),
+                                                   ('orders.us.new', 3)])
+
+        asyncio.run(main())
+
+    def test_prefix(self):
+        async def main():
+            from_ch, orders_ch = chan(), chan(5)
+            p = c.pub(from_ch, lambda x: x[0])
+            p.psub('orders.#', orders_ch)
+            await from_ch.put(('orders', 1))
+            await from_ch.put(('orders.eu', 2))
+            await from_ch.put(('orders.eu.fr', 3))
+            await from_ch.put(('trades.eu', 4))
+            from_ch.close()
+            self.assertEqual(await a_list(orders_ch), [('orders', 1),
+                                                       ('orders.eu', 2),
+                                                       ('orders.eu.fr', 3)])
+
+        asyncio.run(main())
+
+    def test_invalid_pattern(self):
+        async def main():
+            from_ch = chan()
+            p = c.pub(from_ch, xf.identity)
+            with self.assertRaises(ValueError):
+                p.psub('orders.#.fr', chan())
+            from_ch.close()
+
+        asyncio.run(main())
+
+    def test_delivered_once_per_ch(self):
+        async def main():
+            from_ch, to_ch = chan(), chan(5)
+            p = c.pub(from_ch, xf.identity)
+            p.sub('orders.eu', to_ch)
+            p.psub('orders.*', to_ch)
+            p.psub('orders.#', to_ch)
+            p.psub('*.eu', to_ch)
+            await from_ch.put('orders.eu')
+            from_ch.close()
+            self.assertEqual(await a_list(to_ch), ['orders.eu'])
+
+        asyncio.run(main())
+
+    def test_punsub(self):
+        async def main():
+            from_ch, to_ch = chan(), chan(5)
+            p = c.pub(from_ch, xf.identity)
+            p.psub('a.*', to_ch)
+            await from_ch.put('a.1')
+            p.punsub('a.*', to_ch)
+            await from_ch.put('a.2')
+            await asyncio.sleep(0.1)
+            self.assertEqual(to_ch.poll(), 'a.1')
+            self.assertIsNone(to_ch.poll())
+            from_ch.close()
+
+        asyncio.run(main())
+
+    def test_unsub_all_removes_patterns(self):
+        async def main():
+            from_ch, to_ch = chan(), chan(5)
+            p = c.pub(from_ch, xf.identity)
+            p.psub('a.*', to_ch)
+            p.unsub_all()
+            await from_ch.put('a.1')
+            await asyncio.sleep(0.1)
+            self.assertIsNone(to_ch.poll())
+            from_ch.close()
+
+        asyncio.run(main())
+
+    def test_only_correct_subs_get_closed(self):
+        async def main():
+            from_ch, close_ch, open_ch = chan(), chan(1), chan(1)
+            p = c.pub(from_ch, xf.identity)
+            p.psub('a.#', close_ch)
+            p.psub('b.#', open_ch, close=False)
+            from_ch.close()
+            await asyncio.sleep(0.1)
+            self.assertIs(await close_ch.put('fail'), False)
+            self.assertIs(await open_ch.put('success'), True)
+
+        asyncio.run(main())
+
+    def test_custom_sep(self):
+        async def main():
+            from_ch, to_ch = chan(), chan(5)
+            p = c.pub(from_ch, xf.identity, sep='/')
+            p.psub('a/*', to_ch)
+            await from_ch.put('a/b')
+            await from_ch.put('a.b')
+            from_ch.close()
+            self.assertEqual(await a_list(to_ch), ['a/b'])
+
+        asyncio.run(main())
+
+    def test_removing_patterns_prunes_index(self):
+        index = core._TopicIndex('.')
+        ch1, ch2 = chan(), chan()
+        for _ in range(3):
+            index.add('a.*.c', ch1, True)
+            index.add('a.#', ch2, True)
+            index.remove('a.*.c', ch1)
+            self.assertEqual(list(index._root.children), ['a'])
+            self.assertEqual(index._root.children['a'].children, {})
+            index.remove('a.#', ch2)
+            self.assertEqual(index._root.children, {})
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index._ch_patterns, {})
+
+    def test_remove_ch_only_removes_its_patterns(self):
+        index = core._TopicIndex('.')
+        ch1, ch2 = chan(), chan()
+        index.add('a.b', ch1, True)
+        index.add('x.#', ch1, True)
+        index.add('a.b', ch2, True)
+        index.remove_ch(ch1)
+        self.assertEqual(index.match('a.b'), (ch2,))
+        self.assertEqual(index.match('x.y'), ())
+        self.assertEqual(list(index._root.children), ['a'])
+
+
 class TestMixAsyncio(unittest.TestCase):
     def test_toggle_exceptions(self):
         async def main():
@@ -707,6 +1482,51 @@ class TestMixAsyncio(unittest.TestCase):
         asyncio.run(main())
 
 
+class TestMixFairness(unittest.TestCase):
+    def test_sources_are_served_fairly(self):
+        async def main():
+            from_ch1, from_ch2, to_ch = chan(3), chan(3), chan()
+            for i in range(3):
+                await from_ch1.put(f'ch1-{i}')
+                await from_ch2.put(f'ch2-{i}')
+            m = c.mix(to_ch)
+            m.admix(from_ch1)
+            m.admix(from_ch2)
+            first_four = [await to_ch.get() for _ in range(4)]
+            self.assertEqual(sorted(first_four),
+                             ['ch1-0', 'ch1-1', 'ch2-0', 'ch2-1'])
+
+        asyncio.run(main())
+
+    def test_many_sources(self):
+        async def main():
+            to_ch = chan()
+            m = c.mix(to_ch)
+            from_chs = [chan(1) for _ in range(300)]
+            for i, ch in enumerate(from_chs):
+                m.admix(ch)
+                await ch.put(i)
+            results = [await to_ch.get() for _ in range(300)]
+            self.assertEqual(sorted(results), list(range(300)))
+
+        asyncio.run(main())
+
+    def test_toggle_from_thread(self):
+        def thread(m, from_ch):
+            m.toggle({from_ch: {'mute': True}})
+
+        async def main():
+            from_ch, to_ch = chan(), chan(1)
+            m = c.mix(to_ch)
+            await c.thread(lambda: thread(m, from_ch)).get()
+            await asyncio.sleep(0.1)
+            await from_ch.put('muted')
+            await asyncio.sleep(0.1)
+            self.assertIsNone(to_ch.poll())
+
+        asyncio.run(main())
+
+
 class TestPipe(unittest.TestCase):
     def test_pipe_copy(self):
         async def main():
@@ -870,6 +1690,154 @@ class TestPipeline(unittest.TestCase):
         self._test_ex_handler('process')
 
 
+class TestFold(unittest.TestCase):
+    add = xf.multi_arity(lambda: 0, xf.identity, lambda x, y: x + y)
+
+    def test_thread(self):
+        xform = xf.comp(xf.map(lambda x: x * 2), xf.filter(lambda x: x % 3))
+        self.assertEqual(c.fold(4, self.add, xform, self.add, range(100)),
+                         xf.itransduce(xform, self.add, 0, range(100)))
+
+    def test_process(self):
+        xform = xf.comp(xf.map(lambda x: x * 2), xf.filter(lambda x: x % 3))
+        self.assertEqual(c.fold(2, self.add, xform, self.add, range(100),
+                                mode='process'),
+                         xf.itransduce(xform, self.add, 0, range(100)))
+
+    def test_runs_in_parallel(self):
+        def f(x):
+            time.sleep(0.2)
+            return x
+
+        start_time = time.time()
+        self.assertEqual(c.fold(5, self.add, xf.map(f), self.add, range(5)),
+                         10)
+        self.assertLess(time.time() - start_time, 0.5)
+
+    def test_combines_in_order(self):
+        concat = xf.multi_arity(list, xf.identity, lambda x, y: x + y)
+        result = c.fold(3, concat, xf.map(str), xf.append, iter(range(10)),
+                        chunksize=2)
+        self.assertEqual(result, [str(i) for i in range(10)])
+
+    def test_empty(self):
+        rf = xf.completing(self.add, lambda x: x - 1)
+        self.assertEqual(c.fold(4, self.add, xf.identity, rf, []), -1)
+
+    def test_completion_is_called_once(self):
+        rf = xf.completing(self.add, str)
+        self.assertEqual(c.fold(4, self.add, xf.map(lambda x: x + 1), rf,
+                                range(10)),
+                         '55')
+
+    def test_stateful_xform(self):
+        for xform in [xf.take(2), xf.take_while(lambda x: x < 5),
+                      xf.comp(xf.map(str), xf.partition_all(2)),
+                      lambda rf: rf]:
+            with self.subTest(xform=xform):
+                with self.assertRaises(ValueError):
+                    c.fold(4, self.add, xform, self.add, range(10))
+
+    def test_invalid_args(self):
+        with self.assertRaises(ValueError):
+            c.fold(0, self.add, xf.identity, self.add, range(10))
+        with self.assertRaises(ValueError):
+            c.fold(2, self.add, xf.identity, self.add, range(10),
+                   chunksize=0)
+        with self.assertRaises(ValueError):
+            c.fold(2, self.add, xf.identity, self.add, range(10),
+                   mode='pool')
+
+
+class TestPipelineByKey(unittest.TestCase):
+    def test_invalid_n(self):
+        with self.assertRaises(ValueError):
+            c.pipeline_by_key(0, chan(), xf.identity, chan(), xf.identity)
+
+    def test_per_key_order(self):
+        async def main():
+            vals = [(key, i) for i in range(20) for key in 'abcde']
+            to_ch = chan(len(vals))
+            finished_ch = c.pipeline_by_key(3, to_ch, xf.identity,
+                                            c.to_chan(vals),
+                                            lambda x: x[0])
+            self.assertIsNone(await finished_ch.get())
+            results = await a_list(to_ch)
+            self.assertEqual(sorted(results), sorted(vals))
+            for key in 'abcde':
+                self.assertEqual([x for x in results if x[0] == key],
+                                 [(key, i) for i in range(20)])
+
+        asyncio.run(main())
+
+    def test_stateful_xform_per_worker(self):
+        async def main():
+            to_ch = chan(10)
+            # Even numbers go to one worker and odd numbers to the other
+            c.pipeline_by_key(2, to_ch, xf.take(2), c.to_chan(range(10)),
+                              lambda x: x % 2)
+            self.assertEqual(sorted(await a_list(to_ch)), [0, 1, 2, 3])
+
+        asyncio.run(main())
+
+    def test_runs_in_parallel(self):
+        def f(x):
+            time.sleep(0.2)
+            return x
+
+        async def main():
+            to_ch = chan(4)
+            start_time = time.time()
+            finished_ch = c.pipeline_by_key(4, to_ch, xf.map(f),
+                                            c.to_chan(range(4)),
+                                            xf.identity)
+            self.assertIsNone(await finished_ch.get())
+            self.assertLess(time.time() - start_time, 0.35)
+            self.assertEqual(sorted(await a_list(to_ch)), [0, 1, 2, 3])
+
+        asyncio.run(main())
+
+    def test_to_ch_not_closed(self):
+        async def main():
+            to_ch = chan(5)
+            finished_ch = c.pipeline_by_key(2, to_ch, xf.map(str),
+                                            c.to_chan(range(5)),
+                                            xf.identity, close=False)
+            self.assertIsNone(await finished_ch.get())
+            self.assertEqual(sorted([to_ch.poll() for _ in range(5)]),
+                             ['0', '1', '2', '3', '4'])
+            self.assertIs(await to_ch.put('success'), True)
+
+        asyncio.run(main())
+
+    def test_stop_consuming_when_to_ch_closes(self):
+        async def main():
+            from_ch, to_ch = chan(), chan()
+            finished_ch = c.pipeline_by_key(2, to_ch, xf.identity, from_ch,
+                                            xf.identity)
+            await from_ch.put(0)
+            self.assertEqual(await to_ch.get(), 0)
+            to_ch.close()
+            await from_ch.put(1)
+            self.assertIsNone(await finished_ch.get())
+            await from_ch.put(2)
+            await from_ch.put(3)
+            await asyncio.sleep(0.1)
+            self.assertIs(from_ch.offer(4), False)
+
+        asyncio.run(main())
+
+    def test_ex_handler(self):
+        async def main():
+            to_ch = chan(5)
+            c.pipeline_by_key(2, to_ch, xf.map(lambda x: 10 // x),
+                              c.to_chan([1, 0, 2]), xf.identity,
+                              ex_handler=lambda _: -1)
+            self.assertEqual(sorted(await a_list(to_ch)), [-1, 5, 10])
+
+        asyncio.run(main())
+
+
 class TestPipelineAsync(unittest.TestCase):
     def test_pipeline_async(self):
         def thread(val, result_ch):
@@ -1059,6 +2027,47 @@ class TestMerge(unittest.TestCase):
 
         asyncio.run(main())
 
+    def test_merge_no_chs(self):
+        async def main():
+            self.assertIsNone(await c.merge([]).get())
+
+        asyncio.run(main())
+
+    def test_merge_many_chs(self):
+        async def main():
+            srcs = [c.to_chan(range(i * 10, i * 10 + 10)) for i in range(200)]
+            results = await a_list(c.merge(srcs))
+            self.assertEqual(sorted(results), list(range(2000)))
+            for i in range(200):
+                from_src = [x for x in results if i * 10 <= x < i * 10 + 10]
+                self.assertEqual(from_src, list(range(i * 10, i * 10 + 10)))
+
+        asyncio.run(main())
+
+    def test_merge_continues_consuming_after_to_ch_closes(self):
+        async def main():
+            src = chan(2)
+            m = c.merge([src])
+            m.close()
+            await src.put('a')
+            await src.put('b')
+            await asyncio.sleep(0.1)
+            self.assertIsNone(src.poll())
+            src.close()
+
+        asyncio.run(main())
+
+    def test_merge_from_thread(self):
+        def thread(src1, src2):
+            return c.merge([src1, src2])
+
+        async def main():
+            src1, src2 = c.to_chan([1, 2]), c.to_chan([3, 4])
+            m = await c.thread(lambda: thread(src1, src2)).get()
+            self.assertEqual(sorted(await a_list(m)), [1, 2, 3, 4])
+
+        asyncio.run(main())
+
 
 class TestMap(unittest.TestCase):
     def test_map_unbuffered(self):
@@ -1084,6 +2093,65 @@ class TestMap(unittest.TestCase):
 
         asyncio.run(main())
 
+    def test_map_invalid_batch_size(self):
+        with self.assertRaises(ValueError):
+            c.map(lambda x: x, [chan()], batch_size=0)
+
+    def test_map_batch_size(self):
+        async def main():
+            letter_ch, number_ch = chan(3), chan(3)
+            for letter, number in zip('abc', '123'):
+                await letter_ch.put(letter)
+                await number_ch.put(number)
+            letter_ch.close()
+            number_ch.close()
+            result_ch = c.map(lambda x, y: x + y,
+                              [letter_ch, number_ch],
+                              batch_size=2)
+            self.assertEqual(await a_list(result_ch), ['a1', 'b2', 'c3'])
+
+        asyncio.run(main())
+
+    def test_map_batch_size_zips_buffered_rounds_at_once(self):
+        def zipped_per_wakeup(batch_size):
+            async def main():
+                letter_ch, number_ch = chan(6), chan(6)
+                for letter, number in zip('abcdef', '123456'):
+                    await letter_ch.put(letter)
+                    await number_ch.put(number)
+                result_ch = c.map(lambda x, y: x + y,
+                                  [letter_ch, number_ch],
+                                  6,
+                                  batch_size=batch_size)
+                await asyncio.sleep(0)
+                results = []
+                while True:
+                    val = result_ch.poll()
+                    if val is None:
+                        return results
+                    results.append(val)
+
+            return asyncio.run(main())
+
+        self.assertEqual(zipped_per_wakeup(1), ['a1'])
+        self.assertEqual(zipped_per_wakeup(3), ['a1', 'b2', 'c3'])
+
+    def test_map_from_threads(self):
+        def thread(ch, vals):
+            for val in vals:
+                ch.b_put(val)
+            ch.close()
+
+        async def main():
+            chs = [chan() for _ in range(3)]
+            for i, ch in enumerate(chs):
+                c.thread(lambda ch=ch, i=i: thread(ch, range(i, i + 100)))
+            result_ch = c.map(lambda *args: args, chs)
+            self.assertEqual(await a_list(result_ch),
+                             [(i, i + 1, i + 2) for i in range(100)])
+
+        asyncio.run(main())
+
 
 class TestSplit(unittest.TestCase):
     def test_chans_close_with_closed_source(self):
@@ -1120,5 +2188,82 @@ class TestSplit(unittest.TestCase):
         asyncio.run(main())
 
 
+class TestRoute(unittest.TestCase):
+    def test_invalid_args(self):
+        with self.assertRaises(ValueError):
+            c.route(xf.identity, chan(), 0)
+        with self.assertRaises(ValueError):
+            c.route(xf.identity, chan(), 2, batch_size=0)
+
+    def test_hash_partition(self):
+        async def main():
+            chs = c.route(xf.identity, c.to_chan(range(9)), 3, lambda _: 9)
+            self.assertEqual(len(chs), 3)
+            self.assertEqual(await a_list(chs[0]), [0, 3, 6])
+            self.assertEqual(await a_list(chs[1]), [1, 4, 7])
+            self.assertEqual(await a_list(chs[2]), [2, 5, 8])
+
+        asyncio.run(main())
+
+    def test_equal_keys_go_to_same_ch(self):
+        async def main():
+            vals = [('a', i) for i in range(5)] + [('b', i) for i in range(5)]
+            chs = c.route(lambda x: x[0], c.to_chan(vals), 4, lambda _: 10)
+            results = [await a_list(ch) for ch in chs]
+            for key in 'ab':
+                key_results = [[x for x in result if x[0] == key]
+                               for result in results]
+                self.assertIn([(key, i) for i in range(5)], key_results)
+                self.assertEqual(sum(len(r) for r in key_results), 5)
+
+        asyncio.run(main())
+
+    def test_keys(self):
+        async def main():
+            chs = c.route(lambda x: x[0],
+                          c.to_chan(['a1', 'b1', 'c1', 'a2']),
+                          ['a', 'b'],
+                          {'a': 2, 'b': 1}.get)
+            self.assertEqual(list(chs), ['a', 'b'])
+            self.assertEqual(await a_list(chs['a']), ['a1', 'a2'])
+            self.assertEqual(await a_list(chs['b']), ['b1'])
+
+        asyncio.run(main())
+
+    def test_batch_size(self):
+        async def main():
+            from_ch = chan(10)
+            for x in range(10):
+                await from_ch.put(x)
+            from_ch.close()
+            even_ch, odd_ch = c.route(xf.identity, from_ch, 2, lambda _: 5,
+                                      batch_size=4)
+            self.assertEqual(await a_list(even_ch), [0, 2, 4, 6, 8])
+            self.assertEqual(await a_list(odd_ch), [1, 3, 5, 7, 9])
+
+        asyncio.run(main())
+
+    def test_stops_consuming_when_all_chs_close(self):
+        async def main():
+            from_ch = chan()
+            a_ch, b_ch = c.route(xf.identity, from_ch, 2)
+            a_ch.close()
+            b_ch.close()
+            await from_ch.put(0)
+            await from_ch.put(1)
+            await asyncio.sleep(0.05)
+            self.assertIs(from_ch.offer(2), False)
+
+        asyncio.run(main())
+
+    def test_closed_ch_does_not_stop_others(self):
+        async def main():
+            a_ch, b_ch = c.route(xf.identity, c.to_chan(range(6)), 2)
+            a_ch.close()
+            self.assertEqual(await a_list(b_ch), [1, 3, 5])
+
+        asyncio.run(main())
+
+
 if __name__ == '__main__':
     unittest.main()
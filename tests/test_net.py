@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+
+# Copyright 2019 Jake Magers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+import chanpy as c
+from chanpy import chan
+from chanpy import net
+
+
+async def a_list(ch):
+    return await c.to_list(ch).get()
+
+
+async def serve(ch, **kwargs):
+    server = await net.serve_chan(ch, ('127.0.0.1', 0), **kwargs)
+    return server, server.sockets[0].getsockname()[:2]
+
+
+class TestRemoteGet(unittest.TestCase):
+    def test_values(self):
+        async def main():
+            server, addr = await serve(c.to_chan(range(1000)))
+            remote_ch = await net.remote_chan(addr, 'get', 16)
+            self.assertEqual(await a_list(remote_ch), list(range(1000)))
+            server.close()
+
+        asyncio.run(main())
+
+    def test_bytes(self):
+        async def main():
+            server, addr = await serve(c.to_chan([b'a', 'b', b'c']))
+            remote_ch = await net.remote_chan(addr)
+            self.assertEqual(await a_list(remote_ch), [b'a', 'b', b'c'])
+            server.close()
+
+        asyncio.run(main())
+
+    def test_credits_limit_values_in_flight(self):
+        async def main():
+            ch = chan(100)
+            for i in range(100):
+                await ch.put(i)
+            server, addr = await serve(ch)
+            remote_ch = await net.remote_chan(addr, 'get', 5)
+            await asyncio.sleep(0.1)
+            # 5 values in remote_ch and 5 values in flight
+            self.assertEqual(len(remote_ch._buf), 5)
+            self.assertEqual(len(ch._buf), 90)
+            ch.close()
+            self.assertEqual(await a_list(remote_ch), list(range(100)))
+            server.close()
+
+        asyncio.run(main())
+
+    def test_closing_remote_ch_stops_consumption(self):
+        async def main():
+            ch = chan()
+            server, addr = await serve(ch)
+            remote_ch = await net.remote_chan(addr, 'get', 1)
+            self.assertIs(await ch.put('a'), True)
+            self.assertEqual(await remote_ch.get(), 'a')
+            remote_ch.close()
+            self.assertIs(await ch.put('b'), True)  # Taken then discarded
+            await asyncio.sleep(0.1)
+            self.assertIs(ch.offer('c'), False)
+            server.close()
+
+        asyncio.run(main())
+
+    def test_invalid_args(self):
+        async def main():
+            with self.assertRaises(ValueError):
+                await net.remote_chan(('127.0.0.1', 1), 'invalid')
+            with self.assertRaises(ValueError):
+                await net.remote_chan(('127.0.0.1', 1), 'get', None)
+
+        asyncio.run(main())
+
+
+class TestRemotePut(unittest.TestCase):
+    def test_values(self):
+        async def main():
+            ch = chan()
+            server, addr = await serve(ch, window=8)
+            remote_ch = await net.remote_chan(addr, 'put')
+            c.onto_chan(remote_ch, range(1000))
+            self.assertEqual([await ch.get() for _ in range(1000)],
+                             list(range(1000)))
+            server.close()
+
+        asyncio.run(main())
+
+    def test_window_limits_values_in_flight(self):
+        async def main():
+            ch = chan(1)
+            server, addr = await serve(ch, window=3)
+            remote_ch = await net.remote_chan(addr, 'put', 100)
+            for i in range(10):
+                await remote_ch.put(i)
+            await asyncio.sleep(0.1)
+            # 1 value in ch, 1 being put onto ch, 1 in flight
+            self.assertEqual(len(remote_ch._buf), 7)
+            self.assertEqual(await ch.get(), 0)
+            server.close()
+
+        asyncio.run(main())
+
+    def test_closed_ch_closes_remote_ch(self):
+        async def main():
+            ch = chan()
+            server, addr = await serve(ch)
+            remote_ch = await net.remote_chan(addr, 'put')
+            ch.close()
+            await remote_ch.put('a')
+            await asyncio.sleep(0.1)
+            self.assertIs(await remote_ch.put('b'), False)
+            server.close()
+
+        asyncio.run(main())
+
+    def test_multiple_clients(self):
+        async def main():
+            ch = chan()
+            server, addr = await serve(ch)
+            for vals in [range(0, 50), range(50, 100)]:
+                remote_ch = await net.remote_chan(addr, 'put')
+                c.onto_chan(remote_ch, vals)
+            self.assertEqual(sorted([await ch.get() for _ in range(100)]),
+                             list(range(100)))
+            server.close()
+
+        asyncio.run(main())
+
+
+class TestUnixSocket(unittest.TestCase):
+    @unittest.skipUnless(hasattr(asyncio, 'start_unix_server'),
+                         'requires Unix domain sockets')
+    def test_values(self):
+        async def main():
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                path = os.path.join(tmp_dir, 'chan.sock')
+                server = await net.serve_chan(c.to_chan(range(100)), path)
+                remote_ch = await net.remote_chan(path)
+                self.assertEqual(await a_list(remote_ch), list(range(100)))
+                server.close()
+
+        asyncio.run(main())
+
+
+class TestSerializer(unittest.TestCase):
+    def test_serializer(self):
+        class Serializer:
+            @staticmethod
+            def dumps(obj):
+                return json.dumps(obj).encode()
+
+            @staticmethod
+            def loads(data):
+                return json.loads(data)
+
+        async def main():
+            server, addr = await serve(c.to_chan([(1, 2), {'a': 3}]),
+                                       serializer=Serializer)
+            remote_ch = await net.remote_chan(addr, serializer=Serializer)
+            self.assertEqual(await a_list(remote_ch), [[1, 2], {'a': 3}])
+            server.close()
+
+        asyncio.run(main())
+
+
+
+class TestMalformedInput(unittest.TestCase):
+    async def assert_server_closes(self, data):
+        ch = chan(1)
+        server, addr = await serve(ch)
+        reader, writer = await asyncio.open_connection(*addr)
+        writer.write(data)
+        # Reads until the server closes the connection
+        await asyncio.wait_for(reader.read(), 1)
+        writer.close()
+        self.assertIs(ch.offer('a'), True)
+        server.close()
+
+    def test_hello_with_wrong_length(self):
+        asyncio.run(self.assert_server_closes(
+            net._FRAME.pack(2, net._HELLO) + b'\x00\x00'))
+
+    def test_hello_with_unknown_mode(self):
+        asyncio.run(self.assert_server_closes(
+            net._FRAME.pack(net._HELLO_BODY.size, net._HELLO) +
+            net._HELLO_BODY.pack(7, 0)))
+
+    def test_frame_too_large(self):
+        asyncio.run(self.assert_server_closes(
+            net._FRAME.pack(net._HELLO_BODY.size, net._HELLO) +
+            net._HELLO_BODY.pack(net._MODES['put'], 0) +
+            net._FRAME.pack(0xFFFFFFFF, net._DATA)))
+
+    def test_batches_are_split_into_frames(self):
+        async def main():
+            with mock.patch.object(net, '_MAX_FRAME_SIZE', 64):
+                server, addr = await serve(c.to_chan(range(100)))
+                remote_ch = await net.remote_chan(addr, 'get', 50)
+                self.assertEqual(await a_list(remote_ch), list(range(100)))
+                server.close()
+
+        asyncio.run(main())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,9 +14,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import collections
+import itertools
+import math
+import operator
+import threading
+import time
 import unittest
+from array import array
+from unittest import mock
+import chanpy as c
+from chanpy import chan
 from chanpy import transducers as xf
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 sum_rf = xf.multi_arity(lambda: 0, xf.identity, lambda x, y: x + y)
 
@@ -89,6 +105,36 @@ class TestPartitionAll(unittest.TestCase):
         self.assertEqual(list(xf.xiter(xform, range(1, 10))),
                          [(1, 2), (5, 6), (9,)])
 
+    def test_view_is_equivalent(self):
+        for n, step, take in itertools.product([1, 2, 3, 5], [1, 2, 3, 7],
+                                               [3, 100]):
+            with self.subTest(n=n, step=step, take=take):
+                expected = xf.into([], xf.comp(xf.partition_all(n, step),
+                                               xf.take(take)), range(12))
+                xform = xf.comp(xf.partition_all(n, step, view=True),
+                                xf.map(tuple), xf.take(take))
+                self.assertEqual(xf.into([], xform, range(12)), expected)
+
+    def test_view_is_sequence(self):
+        views = []
+        xform = xf.comp(xf.partition_all(3, 1, view=True),
+                        xf.map(views.append), xf.take(1))
+        xf.into([], xform, range(10, 20))
+        view = views[0]
+        self.assertEqual(len(view), 3)
+        self.assertEqual(list(view), [10, 11, 12])
+        self.assertEqual((view[0], view[-1]), (10, 12))
+        self.assertEqual(view[1:], (11, 12))
+        self.assertIn(11, view)
+        with self.assertRaises(IndexError):
+            view[3]
+
+    def test_view_is_valid_until_next_value(self):
+        xform = xf.partition_all(3, 2, view=True)
+        self.assertEqual([(len(v), v[0], v[-1])
+                          for v in xf.xiter(xform, range(8))],
+                         [(3, 0, 2), (3, 2, 4), (3, 4, 6), (2, 6, 7)])
+
 
 class TestPartition(unittest.TestCase):
     def test_no_pad(self):
@@ -158,6 +204,17 @@ class TestPartition(unittest.TestCase):
         self.assertEqual(list(xf.xiter(xform, [1, 2, 3, 4])),
                          [((1, 2), (3, 4),)])
 
+    def test_view(self):
+        xform = xf.comp(xf.partition(3, 2, view=True), xf.map(tuple))
+        self.assertEqual(list(xf.xiter(xform, range(6))),
+                         [(0, 1, 2), (2, 3, 4)])
+
+    def test_view_with_pad(self):
+        xform = xf.comp(xf.partition(3, 3, ['pad'], view=True),
+                        xf.map(tuple))
+        self.assertEqual(list(xf.xiter(xform, [1, 2, 3, 4])),
+                         [(1, 2, 3), (4, 'pad')])
+
 
 class TestTake(unittest.TestCase):
     def test_take_pos(self):
@@ -797,6 +854,561 @@ class TestRandomSample(unittest.TestCase):
         self.assertEqual(list(xf.xiter(xform, [1, 2, 3])), [(1, 2), (3,)])
 
 
+class TestComp(unittest.TestCase):
+    def test_no_xforms(self):
+        self.assertEqual(list(xf.xiter(xf.comp(), [1, 2])), [1, 2])
+
+    def test_fused_stages(self):
+        xform = xf.comp(xf.map(lambda x: x + 1),
+                        xf.filter(lambda x: x % 2 == 0),
+                        xf.keep(lambda x: x if x != 4 else None),
+                        xf.remove(lambda x: x == 8),
+                        xf.replace({6: 'six'}),
+                        xf.take_while(lambda x: x != 12))
+        self.assertEqual(list(xf.xiter(xform, range(20))),
+                         [2, 'six', 10])
+
+    def test_nested_comps_are_fused(self):
+        inc = xf.map(lambda x: x + 1)
+        xform = xf.comp(xf.comp(inc, inc), xf.comp(inc, inc))
+        self.assertEqual(list(xf.xiter(xform, [0, 1])), [4, 5])
+        self.assertEqual(len(xform._stages), 4)
+
+    def test_fused_with_stateful(self):
+        xform = xf.comp(xf.map(lambda x: x * 2),
+                        xf.filter(lambda x: x % 3 != 0),
+                        xf.partition_all(2),
+                        xf.map(sum),
+                        xf.take(2))
+        self.assertEqual(list(xf.xiter(xform, range(10))), [6, 18])
+
+    def test_reduced_from_rf(self):
+        xform = xf.comp(xf.map(lambda x: x * 2), xf.filter(lambda x: x > 2))
+        rf = xf.multi_arity(None, xf.identity,
+                            lambda result, val: xf.reduced(result + val))
+        self.assertEqual(xf.itransduce(xform, rf, 100, [1, 2, 3]), 104)
+
+    def test_complete(self):
+        xform = xf.comp(xf.take_last(2), xf.map(lambda x: x * 2),
+                        xf.filter(lambda x: x > 0))
+        self.assertEqual(list(xf.xiter(xform, [1, 2, 3])), [4, 6])
+
+    def test_arity_zero(self):
+        xform = xf.comp(xf.map(None), xf.filter(None))
+        self.assertEqual(xform(lambda: 'success')(), 'success')
+
+
+class TestMultiArity(unittest.TestCase):
+    def test_dispatch(self):
+        rf = xf.multi_arity(lambda: 'zero', lambda x: 'one',
+                            lambda x, y: 'two')
+        self.assertEqual(rf(), 'zero')
+        self.assertEqual(rf(1), 'one')
+        self.assertEqual(rf(1, 2), 'two')
+
+    def test_wrong_number_of_args(self):
+        rf = xf.multi_arity(None, xf.identity)
+        with self.assertRaises(TypeError):
+            rf()
+        with self.assertRaises(TypeError):
+            rf(1, 2)
+
+    def test_arity_attributes(self):
+        init, complete = (lambda: 0), xf.identity
+        step = operator.add
+        rf = xf.multi_arity(init, complete, step)
+        self.assertIs(rf.init, init)
+        self.assertIs(rf.complete, complete)
+        self.assertIs(rf.step, step)
+
+    def test_missing_arity_attributes(self):
+        rf = xf.multi_arity(lambda: 0)
+        self.assertIsNone(rf.complete)
+        self.assertIsNone(rf.step)
+
+
+class TestReducingFunctionObject(unittest.TestCase):
+    class Sum:
+        def __init__(self):
+            self.calls = []
+
+        def __call__(self, *args):
+            self.calls.append(len(args))
+            return {0: self.init, 1: self.complete, 2: self.step}[
+                len(args)](*args)
+
+        def init(self):
+            return 0
+
+        def complete(self, result):
+            return -result
+
+        def step(self, result, val):
+            return result + val
+
+    def test_arities_are_called_directly(self):
+        rf = self.Sum()
+        xform = xf.comp(xf.map(lambda x: x * 2), xf.drop(1))
+        self.assertEqual(xf.itransduce(xform, rf, 0, [1, 2, 3]), -10)
+        self.assertEqual(rf.calls, [1])
+
+    def test_ireduce(self):
+        rf = self.Sum()
+        self.assertEqual(xf.ireduce(rf, [1, 2, 3]), 6)
+        self.assertEqual(rf.calls, [0])
+
+    def test_plain_callable(self):
+        def rf(result=None, val=None):
+            if val is None:
+                return result
+            return result + val
+
+        xform = xf.comp(xf.map(lambda x: x * 2), xf.drop(1))
+        self.assertEqual(xf.itransduce(xform, rf, 0, [1, 2, 3]), 10)
+
+
+class TestChunked(unittest.TestCase):
+    xforms = [
+        xf.map(lambda x: x * 2),
+        xf.comp(xf.map(lambda x: x + 1), xf.filter(lambda x: x % 3 != 0),
+                xf.keep(lambda x: None if x % 7 == 0 else x)),
+        xf.comp(xf.remove(lambda x: x % 2 == 0), xf.partition_all(3),
+                xf.map(sum)),
+        xf.comp(xf.take_while(lambda x: x < 50), xf.map(lambda x: -x)),
+        xf.comp(xf.replace({2: 'two'}), xf.take(20)),
+        xf.comp(xf.drop(3), xf.map(lambda x: x * 3)),
+        xf.comp(),
+    ]
+
+    def test_itransduce_is_equivalent(self):
+        for xform in self.xforms:
+            expected = xf.itransduce(xform, xf.append, [], range(100))
+            for chunksize in [1, 7, 100, 1000]:
+                with self.subTest(xform=xform, chunksize=chunksize):
+                    result = xf.itransduce(xform, xf.append, [], range(100),
+                                           chunksize=chunksize)
+                    self.assertEqual(result, expected)
+
+    def test_xiter_is_equivalent(self):
+        for xform in self.xforms:
+            expected = list(xf.xiter(xform, range(100)))
+            for chunksize in [1, 7, 100, 1000]:
+                with self.subTest(xform=xform, chunksize=chunksize):
+                    result = xf.xiter(xform, iter(range(100)),
+                                      chunksize=chunksize)
+                    self.assertEqual(list(result), expected)
+
+    def test_into(self):
+        appendable = [0]
+        self.assertIs(xf.into(appendable, xf.map(lambda x: x + 1), [1, 2],
+                              chunksize=2),
+                      appendable)
+        self.assertEqual(appendable, [0, 2, 3])
+
+    def test_array(self):
+        xform = xf.comp(xf.filter(lambda x: x > 1), xf.map(lambda x: x * 2))
+        self.assertEqual(xf.into([], xform, array('d', [1, 2, 3]),
+                                 chunksize=2),
+                         [4.0, 6.0])
+
+    def test_chunks_are_slices_of_sequences(self):
+        chunks = []
+
+        class ChunkSpy:
+            def __call__(self, rf):
+                return rf
+
+            def _chunk_fn(self):
+                def chunk_fn(vals):
+                    chunks.append(vals)
+                    return vals, False
+                return chunk_fn
+
+        self.assertEqual(xf.into([], ChunkSpy(), (1, 2, 3), chunksize=2),
+                         [1, 2, 3])
+        # A final empty chunk marks the end of input
+        self.assertEqual(chunks, [(1, 2), (3,), []])
+
+    def test_take_while_stops_reading(self):
+        coll = iter(range(100))
+        xform = xf.take_while(lambda x: x < 5)
+        self.assertEqual(xf.into([], xform, coll, chunksize=10),
+                         [0, 1, 2, 3, 4])
+        self.assertEqual(next(coll), 10)
+
+    def test_xiter_infinite(self):
+        xform = xf.comp(xf.map(lambda x: x * 2), xf.take(3))
+        self.assertEqual(list(xf.xiter(xform, itertools.count(),
+                                       chunksize=4)),
+                         [0, 2, 4])
+
+    def test_complete(self):
+        xform = xf.comp(xf.map(lambda x: x * 2), xf.partition_all(2))
+        self.assertEqual(xf.into([], xform, [1, 2, 3], chunksize=2),
+                         [(2, 4), (6,)])
+
+    def test_invalid_chunksize(self):
+        for chunksize in [0, -1, 1.5]:
+            with self.subTest(chunksize=chunksize):
+                with self.assertRaises(ValueError):
+                    xf.into([], xf.map(None), [], chunksize=chunksize)
+                with self.assertRaises(ValueError):
+                    xf.xiter(xf.map(None), [], chunksize=chunksize)
+
+
+
+class TestPrefetch(unittest.TestCase):
+    def assert_reader_stops(self, threads_before):
+        for _ in range(100):
+            if threading.active_count() == threads_before:
+                return
+            time.sleep(0.01)
+        self.fail('prefetch thread did not stop')
+
+    def test_is_equivalent(self):
+        for xform in TestChunked.xforms:
+            expected = list(xf.xiter(xform, range(100)))
+            for prefetch, chunksize in itertools.product([1, 3, 1000],
+                                                         [None, 7]):
+                with self.subTest(xform=xform, prefetch=prefetch,
+                                  chunksize=chunksize):
+                    result = xf.xiter(xform, iter(range(100)),
+                                      chunksize=chunksize, prefetch=prefetch)
+                    self.assertEqual(list(result), expected)
+
+    def test_reads_ahead_at_most_prefetch_values(self):
+        reads = []
+
+        def source():
+            for i in itertools.count():
+                reads.append(i)
+                yield i
+
+        it = xf.xiter(xf.map(lambda x: x * 2), source(), prefetch=3)
+        self.assertEqual(next(it), 0)
+        time.sleep(0.1)
+        # 1 consumed, 3 buffered, and 1 waiting to be buffered
+        self.assertLessEqual(len(reads), 5)
+        it.close()
+
+    def test_reads_overlap_transformation(self):
+        is_read = threading.Event()
+
+        def source():
+            yield 1
+            yield 2
+            is_read.set()
+
+        def wait_for_read(x):
+            self.assertTrue(is_read.wait(1))
+            return x
+
+        xform = xf.map(wait_for_read)
+        self.assertEqual(list(xf.xiter(xform, source(), prefetch=2)), [1, 2])
+
+    def test_early_termination_stops_reader(self):
+        threads_before = threading.active_count()
+        xform = xf.comp(xf.map(lambda x: x * 2), xf.take(3))
+        self.assertEqual(list(xf.xiter(xform, itertools.count(), prefetch=1)),
+                         [0, 2, 4])
+        self.assert_reader_stops(threads_before)
+
+    def test_close_stops_reader(self):
+        threads_before = threading.active_count()
+        it = xf.xiter(xf.identity, itertools.count(), prefetch=2)
+        self.assertEqual(next(it), 0)
+        it.close()
+        self.assert_reader_stops(threads_before)
+
+    def test_source_exception_is_raised(self):
+        def source():
+            yield 1
+            raise ValueError('source failed')
+
+        it = xf.xiter(xf.identity, source(), prefetch=2)
+        self.assertEqual(next(it), 1)
+        with self.assertRaisesRegex(ValueError, 'source failed'):
+            next(it)
+
+    def test_complete(self):
+        xform = xf.partition_all(2)
+        self.assertEqual(list(xf.xiter(xform, [1, 2, 3], prefetch=1)),
+                         [(1, 2), (3,)])
+
+    def test_invalid_prefetch(self):
+        for prefetch in [0, -1, 1.5]:
+            with self.subTest(prefetch=prefetch):
+                with self.assertRaises(ValueError):
+                    xf.xiter(xf.identity, [], prefetch=prefetch)
+
+
+@unittest.skipIf(np is None, 'requires numpy')
+class TestVectorized(unittest.TestCase):
+    def assert_equivalent(self, vxform, xform, coll, arrays=True):
+        expected = xf.into([], xform, coll)
+        self.assertEqual(xf.into([], vxform, coll), expected)
+        for chunksize in [1, 3, 10, 1000]:
+            colls = [coll, iter(coll)] + ([np.array(coll)] if arrays else [])
+            for c in colls:
+                with self.subTest(chunksize=chunksize, coll=type(c)):
+                    result = xf.into([], vxform, c, chunksize=chunksize)
+                    self.assertEqual(result, expected)
+                    self.assertEqual([type(x) for x in result],
+                                     [type(x) for x in expected])
+
+    def test_vmap(self):
+        self.assert_equivalent(xf.vmap(lambda x: x * 2 + 1),
+                               xf.map(lambda x: x * 2 + 1),
+                               list(range(20)))
+
+    def test_vmap_ufunc(self):
+        self.assert_equivalent(xf.vmap(np.sqrt), xf.map(math.sqrt),
+                               [float(x) for x in range(20)])
+
+    def test_vfilter(self):
+        self.assert_equivalent(xf.vfilter(lambda x: x % 3 == 0),
+                               xf.filter(lambda x: x % 3 == 0),
+                               list(range(20)))
+
+    def test_vtake(self):
+        for n in [0, 1, 5, 19, 20, 25]:
+            with self.subTest(n=n):
+                self.assert_equivalent(xf.vtake(n), xf.take(n),
+                                       list(range(20)))
+
+    def test_vtake_stops_reading(self):
+        coll = iter(range(100))
+        self.assertEqual(xf.into([], xf.vtake(5), coll, chunksize=10),
+                         [0, 1, 2, 3, 4])
+        self.assertEqual(next(coll), 10)
+
+    def test_vdrop(self):
+        for n in [0, 1, 5, 20, 25]:
+            with self.subTest(n=n):
+                self.assert_equivalent(xf.vdrop(n), xf.drop(n),
+                                       list(range(20)))
+
+    def test_vpartition(self):
+        for n, step in [(1, None), (3, None), (3, 1), (3, 2), (2, 5),
+                        (25, None)]:
+            with self.subTest(n=n, step=step):
+                self.assert_equivalent(xf.vpartition(n, step),
+                                       xf.partition(n, step),
+                                       list(range(20)))
+
+    def test_vreductions(self):
+        self.assert_equivalent(xf.vreductions(np.add),
+                               xf.reductions(operator.add, 0),
+                               list(range(20)))
+
+    def test_vreductions_float(self):
+        coll = [0.1 * x for x in range(20)]
+        self.assert_equivalent(xf.vreductions(np.add, 0.5),
+                               xf.reductions(operator.add, 0.5),
+                               coll)
+
+    def test_vreductions_empty(self):
+        self.assert_equivalent(xf.vreductions(np.multiply),
+                               xf.reductions(operator.mul, 1),
+                               [])
+
+    def test_vreductions_requires_identity(self):
+        with self.assertRaises(ValueError):
+            xf.vreductions(np.maximum)
+        self.assert_equivalent(xf.vreductions(np.maximum, 0),
+                               xf.reductions(max, 0),
+                               [3, 1, 4, 1, 5, 9, 2, 6])
+
+    def test_mixed_types(self):
+        coll = [1, 2.5, True, 2, 3.0, False, 7, 4.5, 10, 2]
+        for vxform, xform in [
+                (xf.vmap(lambda x: x * 2), xf.map(lambda x: x * 2)),
+                (xf.vfilter(lambda x: x > 1), xf.filter(lambda x: x > 1)),
+                (xf.vtake(4), xf.take(4)),
+                (xf.vdrop(2), xf.drop(2)),
+                (xf.vpartition(3, 2), xf.partition(3, 2)),
+                (xf.vreductions(np.add),
+                 xf.reductions(lambda x, y: (np.add(x, y)).item(), 0))]:
+            with self.subTest(vxform=vxform):
+                self.assert_equivalent(vxform, xform, coll, arrays=False)
+
+    def test_vfilter_preserves_original_values(self):
+        coll = [1, 2.5, True, 2]
+        self.assertEqual(
+            [(x, type(x)) for x in xf.into([], xf.vfilter(lambda x: x > 0),
+                                           coll, chunksize=4)],
+            [(1, int), (2.5, float), (True, bool), (2, int)])
+
+    def test_composed(self):
+        vxform = xf.comp(xf.vdrop(2), xf.vmap(lambda x: x * 3),
+                         xf.vfilter(lambda x: x % 2 == 0),
+                         xf.vreductions(np.add), xf.vpartition(2, 1),
+                         xf.map(sum), xf.take(5))
+        xform = xf.comp(xf.drop(2), xf.map(lambda x: x * 3),
+                        xf.filter(lambda x: x % 2 == 0),
+                        xf.reductions(operator.add, 0), xf.partition(2, 1),
+                        xf.map(sum), xf.take(5))
+        self.assert_equivalent(vxform, xform, list(range(30)))
+
+    def test_after_stateless(self):
+        vxform = xf.comp(xf.map(lambda x: x + 1), xf.vmap(np.negative))
+        xform = xf.comp(xf.map(lambda x: x + 1), xf.map(lambda x: -x))
+        self.assert_equivalent(vxform, xform, list(range(10)))
+
+    def test_chan(self):
+        async def main():
+            ch = c.chan(5, xf.comp(xf.vmap(lambda x: x * 2),
+                                   xf.vfilter(lambda x: x > 2),
+                                   xf.vpartition(2)))
+            for i in range(5):
+                await ch.put(i)
+            ch.close()
+            self.assertEqual(await c.reduce(xf.append, [], ch).get(),
+                             [(4, 6)])
+
+        asyncio.run(main())
+
+    def test_requires_numpy(self):
+        with mock.patch.object(xf, '_np', None):
+            for make_xform in [lambda: xf.vmap(np.sqrt),
+                               lambda: xf.vfilter(np.isfinite),
+                               lambda: xf.vtake(1),
+                               lambda: xf.vdrop(1),
+                               lambda: xf.vpartition(2),
+                               lambda: xf.vreductions(np.add)]:
+                with self.assertRaises(ImportError):
+                    make_xform()
+
+
+class TestAxiter(unittest.TestCase):
+    @staticmethod
+    async def a_list(aiterable):
+        return [x async for x in aiterable]
+
+    def test_chan(self):
+        async def main():
+            ch = c.to_chan(range(10))
+            xform = xf.comp(xf.map(lambda x: x * 2),
+                            xf.filter(lambda x: x % 3 == 0))
+            self.assertEqual(await self.a_list(xf.axiter(xform, ch)),
+                             [0, 6, 12, 18])
+
+        asyncio.run(main())
+
+    def test_async_generator(self):
+        async def gen():
+            for i in range(5):
+                await asyncio.sleep(0)
+                yield i
+
+        async def main():
+            xform = xf.comp(xf.map(lambda x: x + 1), xf.partition_all(2))
+            self.assertEqual(await self.a_list(xf.axiter(xform, gen())),
+                             [(1, 2), (3, 4), (5,)])
+
+        asyncio.run(main())
+
+    def test_lazy(self):
+        async def main():
+            ch = chan()
+            results = xf.axiter(xf.map(str), ch)
+            ch.f_put(1)
+            self.assertEqual(await results.__anext__(), '1')
+            ch.f_put(2)
+            self.assertEqual(await results.__anext__(), '2')
+            ch.close()
+            with self.assertRaises(StopAsyncIteration):
+                await results.__anext__()
+
+        asyncio.run(main())
+
+    def test_batches_from_chan(self):
+        async def main():
+            ch = chan(10)
+            for i in range(10):
+                await ch.put(i)
+            ch.close()
+            gets = []
+            get = ch.get
+            ch.get = lambda: gets.append(None) or get()
+            results = await self.a_list(xf.axiter(xf.identity, ch,
+                                                  batch_size=4))
+            self.assertEqual(len(results), 10)
+            # Gets are only awaited for the first value of each batch
+            self.assertEqual(len(gets), 4)
+
+        asyncio.run(main())
+
+    def test_reduced(self):
+        async def main():
+            ch = chan(10)
+            for i in range(10):
+                await ch.put(i)
+            ch.close()
+            self.assertEqual(await self.a_list(xf.axiter(xf.take(2), ch,
+                                                         batch_size=3)),
+                             [0, 1])
+            self.assertEqual(await self.a_list(ch), list(range(2, 10)))
+
+        asyncio.run(main())
+
+    def test_reduced_leaves_remaining_values_in_chan(self):
+        async def main():
+            ch = chan(10)
+            for i in range(10):
+                await ch.put(i)
+            self.assertEqual(await self.a_list(xf.axiter(xf.take(1), ch)),
+                             [0])
+            ch.close()
+            self.assertEqual(await self.a_list(ch), list(range(1, 10)))
+
+        asyncio.run(main())
+
+    def test_partition_views_are_valid_when_yielded(self):
+        async def main():
+            ch = chan(10)
+            for i in range(1, 5):
+                await ch.put(i)
+            ch.close()
+            xform = xf.partition_all(2, 1, view=True)
+            self.assertEqual([tuple(v) async for v in xf.axiter(xform, ch)],
+                             [(1, 2), (2, 3), (3, 4), (4,)])
+
+        asyncio.run(main())
+
+    def test_reduced_infinite_generator(self):
+        async def gen():
+            for i in itertools.count():
+                yield i
+
+        async def main():
+            xform = xf.comp(xf.take_while(lambda x: x < 3),
+                            xf.partition_all(2))
+            self.assertEqual(await self.a_list(xf.axiter(xform, gen())),
+                             [(0, 1), (2,)])
+
+        asyncio.run(main())
+
+    def test_subscription(self):
+        async def main():
+            bcast = c.broadcast(5)
+            sub = bcast.subscribe()
+            for i in range(3):
+                await bcast.put(i)
+            bcast.close()
+            self.assertEqual(await self.a_list(xf.axiter(xf.map(str), sub)),
+                             ['0', '1', '2'])
+
+        asyncio.run(main())
+
+    def test_invalid_batch_size(self):
+        async def main():
+            with self.assertRaises(ValueError):
+                await xf.axiter(xf.identity, chan(), batch_size=0).__anext__()
+
+        asyncio.run(main())
+
+
 class TestCompleting(unittest.TestCase):
     def test_default_cf(self):
         rf = xf.completing(xf.multi_arity(lambda: 0, None, lambda x, y: x + y))
@@ -811,6 +1423,29 @@ class TestCompleting(unittest.TestCase):
         self.assertEqual(rf(1, 2), 3)
         self.assertEqual(rf(100), '100')
 
+    def test_arity_attributes(self):
+        step = operator.add
+        rf = xf.completing(xf.multi_arity(lambda: 0, None, step), str)
+        self.assertIs(rf.step, step)
+        self.assertIs(rf.complete, str)
+        self.assertEqual(rf.init(), 0)
+
+    def test_wraps_rf(self):
+        def add(x, y):
+            """Adds x and y."""
+            return x + y
+
+        rf = xf.completing(add)
+        self.assertEqual(rf.__name__, 'add')
+        self.assertEqual(rf.__doc__, 'Adds x and y.')
+        self.assertIs(rf.__wrapped__, add)
+
+    def test_other_arities_call_rf(self):
+        rf = xf.completing(lambda *args: sum(args), str)
+        self.assertEqual(rf(1, 2, 3), 6)
+        self.assertEqual(rf(1, 2, 3, 4), 10)
+        self.assertEqual(rf(5), '5')
+
 
 class TestIreduce(unittest.TestCase):
     def test_some_no_init(self):
@@ -878,6 +1513,80 @@ class TestInto(unittest.TestCase):
         self.assertIs(xf.into(appendable, xform, [3, 4]), appendable)
         self.assertEqual(appendable, [1, 2, 4, 5])
 
+    def test_into_identity(self):
+        appendable = [1]
+        self.assertIs(xf.into(appendable, xf.identity, iter([2, 3])),
+                      appendable)
+        self.assertEqual(appendable, [1, 2, 3])
+
+    def test_into_stateless(self):
+        coll = iter(range(10))
+        xform = xf.comp(xf.map(lambda x: x * 2), xf.remove(lambda x: x == 2),
+                        xf.take_while(lambda x: x < 8))
+        self.assertEqual(xf.into([], xform, coll), [0, 4, 6])
+        self.assertEqual(next(coll), 5)
+
+    def test_into_keeps_values_before_exception(self):
+        appendable = []
+        with self.assertRaises(ZeroDivisionError):
+            xf.into(appendable, xf.map(lambda x: 1 // x), [1, 1, 0, 1])
+        self.assertEqual(appendable, [1, 1])
+
+    def test_into_deque(self):
+        appendable = collections.deque([0])
+        self.assertIs(xf.into(appendable, xf.map(lambda x: x + 1), [1, 2]),
+                      appendable)
+        self.assertEqual(list(appendable), [0, 2, 3])
+
+    def test_into_list_subclass(self):
+        class Appendable(list):
+            def append(self, val):
+                super().append(val * 10)
+
+        appendable = Appendable()
+        xf.into(appendable, xf.identity, [1, 2])
+        xf.into(appendable, xf.map(lambda x: x + 1), [1, 2])
+        self.assertEqual(appendable, [10, 20, 20, 30])
+
+
+class TestAppend(unittest.TestCase):
+    def test_arities(self):
+        self.assertEqual(xf.append(), [])
+        self.assertEqual(xf.append([1]), [1])
+        self.assertEqual(xf.append([1], 2), [1, 2])
+
+    def test_arity_attributes(self):
+        self.assertEqual(xf.append.init(), [])
+        self.assertEqual(xf.append.complete([1]), [1])
+        self.assertEqual(xf.append.step([1], 2), [1, 2])
+
+
+class TestKnownReducers(unittest.TestCase):
+    def test_ireduce(self):
+        self.assertEqual(xf.ireduce(operator.add, 0, range(5)), 10)
+        self.assertEqual(xf.ireduce(operator.mul, 1, range(1, 5)), 24)
+        self.assertEqual(xf.ireduce(max, 0, [3, 9, 2]), 9)
+        self.assertEqual(xf.ireduce(min, 5, [3, 9, 2]), 2)
+
+    def test_itransduce(self):
+        xform = xf.comp(xf.map(lambda x: x * 2), xf.drop(1), xf.dedupe)
+        self.assertEqual(xf.itransduce(xform, xf.completing(operator.add), 0,
+                                       [1, 2, 2, 3]),
+                         10)
+
+    def test_reduced_from_xform(self):
+        xform = xf.comp(xf.drop(1), xf.take(2), xf.map(lambda x: x * 2))
+        self.assertEqual(xf.itransduce(xform, xf.completing(operator.add), 0,
+                                       range(10)),
+                         6)
+
+    def test_reduced_from_rf(self):
+        rf = xf.completing(lambda result, val: (xf.reduced(result)
+                                                if val > 2
+                                                else result + val))
+        xform = xf.comp(xf.map(lambda x: x + 1), xf.drop_while(lambda x: x < 1))
+        self.assertEqual(xf.itransduce(xform, rf, 0, range(10)), 3)
+
 
 if __name__ == '__main__':
     unittest.main()